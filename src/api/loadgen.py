@@ -0,0 +1,231 @@
+"""
+Load generator for api.server.
+
+Usage (from src/):
+    python -m api.loadgen --spawn --connections 16 --duration 10
+    python -m api.loadgen --url http://127.0.0.1:8080 --mix deposit=5,transfer=3,balance=2
+
+Creates --accounts accounts through the API, then runs --connections
+client threads for --duration seconds, each sending a random mix of
+operations over one keep-alive connection (a new connection per request
+with --no-keepalive). Reports requests/sec and per-operation p50/p99
+latency. With --spawn, a server is started on a free local port over a
+throwaway GDB_DATA_DIR and stopped afterwards.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PIN = "1234"
+DEFAULT_MIX = "deposit=4,withdraw=2,transfer=3,balance=1"
+
+
+class Client:
+    """
+    One HTTP connection; reconnects after an error or with keepalive off.
+    """
+
+    def __init__(self, host: str, port: int, keepalive: bool = True, timeout: float = 30):
+        self.host, self.port, self.keepalive, self.timeout = host, port, keepalive, timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def request(self, method: str, path: str, body: Optional[dict] = None) -> Tuple[int, dict]:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        headers = {"Content-Type": "application/json"}
+        if not self.keepalive:
+            headers["Connection"] = "close"
+        try:
+            self._conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = self._conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if not self.keepalive or response.will_close:
+            self.close()
+        return response.status, json.loads(data) if data else {}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _operation(name: str, accounts: List[int], rng: random.Random) -> Tuple[str, str, dict]:
+    account = rng.choice(accounts)
+    if name == "transfer":
+        to = rng.choice(accounts)
+        return "POST", "/transfers", {"from": account, "to": to, "amount": "1.00", "pin": PIN}
+    if name == "balance":
+        return "POST", f"/accounts/{account}/balance", {"pin": PIN}
+    if name == "get":
+        return "GET", f"/accounts/{account}", None
+    if name == "history":
+        return "GET", f"/accounts/{account}/history", None
+    return "POST", f"/accounts/{account}/{name}", {"amount": "10.00", "pin": PIN}
+
+
+OPERATIONS = ("deposit", "withdraw", "transfer", "balance", "get", "history")
+
+
+def _parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name}; choose from {list(OPERATIONS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def create_accounts(host: str, port: int, count: int) -> List[int]:
+    client = Client(host, port)
+    accounts = []
+    for i in range(count):
+        status, result = client.request("POST", "/accounts", {
+            "name": f"Load Test {i}", "age": 30, "type": "Savings", "deposit": "100000", "pin": PIN})
+        if status != 201:
+            raise RuntimeError(f"Creating an account failed with {status}: {result.get('message')}")
+        accounts.append(result["account"])
+    client.close()
+    return accounts
+
+
+def run_load(host: str, port: int, accounts: List[int], mix: Dict[str, int], connections: int,
+             duration: float, keepalive: bool = True, seed: int = 0) -> dict:
+    """
+    Run the load and return the report: totals and, per operation, request
+    count, failures (non-2xx), errors (no response) and latency percentiles.
+    """
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+    results = []
+    results_lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        client = Client(host, port, keepalive)
+        latencies = {name: [] for name in names}
+        failed = {name: 0 for name in names}
+        errors = {name: 0 for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, body = _operation(name, accounts, rng)
+            started = time.perf_counter_ns()
+            try:
+                status, _ = client.request(method, path, body)
+            except (OSError, http.client.HTTPException, ValueError):
+                errors[name] += 1
+                continue
+            latencies[name].append(time.perf_counter_ns() - started)
+            failed[name] += not 200 <= status < 300
+        client.close()
+        with results_lock:
+            results.append((latencies, failed, errors))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(connections)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    report = {"connections": connections, "keepalive": keepalive, "seconds": round(elapsed, 3), "operations": {}}
+    total = 0
+    for name in names:
+        samples = np.array([ns for latencies, _, _ in results for ns in latencies[name]], dtype=np.int64)
+        count = len(samples)
+        total += count
+        report["operations"][name] = {
+            "requests": count,
+            "failed": sum(failed[name] for _, failed, _ in results),
+            "errors": sum(errors[name] for _, _, errors in results),
+            "p50_ms": round(float(np.percentile(samples, 50)) / 1e6, 3) if count else None,
+            "p99_ms": round(float(np.percentile(samples, 99)) / 1e6, 3) if count else None,
+        }
+    report["requests"] = total
+    report["requests_per_sec"] = round(total / elapsed, 1) if elapsed else None
+    return report
+
+
+def spawn_server(workers: int, env: Dict[str, str]) -> Tuple[subprocess.Popen, str, int]:
+    """
+    Start api.server on a free port; returns the process, host and port.
+    """
+    proc = subprocess.Popen([sys.executable, "-m", "api.server", "--port", "0", "--workers", str(workers)],
+                            cwd=SRC_DIR, env=env, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("Serving on "):
+        proc.kill()
+        raise RuntimeError(f"Server failed to start (exit code {proc.wait()})")
+    url = urlsplit(line.split()[2])
+    return proc, url.hostname, url.port
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m api.loadgen", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--spawn", action="store_true", help="start a server over a temporary data directory")
+    parser.add_argument("--workers", type=int, default=32, help="server worker threads with --spawn")
+    parser.add_argument("--accounts", type=int, default=100, help="accounts to create before the run")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX),
+                        help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--no-keepalive", dest="keepalive", action="store_false",
+                        help="open a new connection for every request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    proc = data_dir = None
+    try:
+        if args.spawn:
+            data_dir = tempfile.mkdtemp(prefix="gdb-loadgen-")
+            env = dict(os.environ, GDB_DATA_DIR=data_dir)
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")]))
+            proc, host, port = spawn_server(args.workers, env)
+        else:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        accounts = create_accounts(host, port, args.accounts)
+        report = run_load(host, port, accounts, args.mix, args.connections, args.duration,
+                          args.keepalive, args.seed)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+        if data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"{report['requests']} requests in {report['seconds']}s over {args.connections} connections "
+          f"({'keep-alive' if args.keepalive else 'no keep-alive'}): {report['requests_per_sec']:,.1f} req/s")
+    for name, op in report["operations"].items():
+        if op["requests"]:
+            print(f"  {name:<10} {op['requests']:>8}  p50 {op['p50_ms']:8.3f} ms  p99 {op['p99_ms']:8.3f} ms"
+                  + (f"  ({op['failed']} failed)" if op["failed"] else "")
+                  + (f"  ({op['errors']} errors)" if op["errors"] else ""))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    errors = sum(op["errors"] for op in report["operations"].values())
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
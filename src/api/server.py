@@ -0,0 +1,229 @@
+"""
+HTTP/JSON API over BankingService, built on the standard library.
+
+Usage (from src/):
+    python -m api.server --port 8080 --workers 32
+    python -m api.loadgen --spawn --connections 16 --duration 10
+
+Endpoints (request and response bodies are JSON):
+    POST /accounts                    {"name", "age", "type", "deposit", "pin"}
+    GET  /accounts?name=NAME          accounts held by NAME
+    GET  /accounts/N                  account details (without the PIN)
+    POST /accounts/N/deposit          {"amount", "pin"}
+    POST /accounts/N/withdraw         {"amount", "pin"}
+    POST /accounts/N/balance          {"pin"}
+    GET  /accounts/N/history?start=&end=
+    POST /transfers                   {"from", "to", "amount", "pin"}
+    GET  /health
+    GET  /metrics                     Prometheus text (see utils.metrics)
+
+Every operation runs the batch-mode command of the same name
+(services.batch_runner) and answers with its result record: 200 (201 for
+a new account) when it succeeded, 422 with the message when the bank
+refused it, and 202 when it was applied but could not be confirmed
+durable yet.
+
+Connections are HTTP/1.1 keep-alive and are served by a fixed pool of
+worker threads sharing one BankingService; a connection holds its worker
+until it closes or stays idle for --keepalive seconds. The book lives in
+this process, so the pool is made of threads, not processes. Because
+concurrent writers share group commits, N requests in flight complete
+with roughly one journal write and sync between them rather than N.
+"""
+import sys
+import json
+import time
+import signal
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from services.banking_services import BankingService
+from services.batch_runner import dumps, run_command
+from utils import metrics
+
+DEFAULT_WORKERS = 16
+DEFAULT_KEEPALIVE = 5.0
+MAX_BODY = 1 << 20
+
+
+def _route(method: str, parts: list, query: dict, body: dict):
+    """
+    Map a request to (endpoint, batch command), or (endpoint, None) when the
+    endpoint is served by the handler itself. Returns (None, None) if no
+    route matches.
+    """
+    if parts == ["health"] and method == "GET":
+        return "health", None
+    if parts == ["metrics"] and method == "GET":
+        return "metrics", None
+    if parts == ["transfers"] and method == "POST":
+        return "transfer", {**body, "op": "transfer", "account": body.get("from")}
+    if parts == ["accounts"]:
+        if method == "POST":
+            return "create", {**body, "op": "create"}
+        if method == "GET" and "name" in query:
+            return "search", {"op": "search", "name": query["name"]}
+        return None, None
+    if len(parts) < 2 or parts[0] != "accounts" or not parts[1].isdigit():
+        return None, None
+    account = int(parts[1])
+    action = parts[2] if len(parts) == 3 else "get" if len(parts) == 2 else None
+    if method == "GET" and action in ("get", "history"):
+        return action, {"op": action, "account": account, "start": query.get("start"), "end": query.get("end")}
+    if method == "POST" and action in ("deposit", "withdraw", "balance"):
+        return action, {**body, "op": action, "account": account}
+    return None, None
+
+
+class BankRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "GlobalDigitalBank"
+    # Responses are small; send them without waiting for the previous ACK.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # An idle keep-alive connection gives its worker back after this long.
+        self.timeout = self.server.keepalive
+        super().setup()
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str):
+        started = time.perf_counter()
+        endpoint, status = "unknown", 500
+        try:
+            endpoint, status, payload, content_type = self._dispatch(method)
+        except Exception as e:
+            logging.error(f"{method} {self.path} failed: {e}")
+            payload, content_type = dumps({"ok": False, "message": "Internal error"}), "application/json"
+        body = payload.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.observe(endpoint, status, time.perf_counter() - started)
+
+    def _dispatch(self, method: str):
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        body, error = self._read_body()
+        if error:
+            return "invalid", error[0], dumps({"ok": False, "message": error[1]}), "application/json"
+        endpoint, command = _route(method, parts, query, body)
+        if endpoint is None:
+            return "unknown", 404, dumps({"ok": False, "message": "Not found"}), "application/json"
+        if endpoint == "health":
+            return endpoint, 200, dumps({"ok": True, "accounts": len(self.server.bank.accounts)}), "application/json"
+        if endpoint == "metrics":
+            return endpoint, 200, metrics.render_prometheus(), "text/plain; version=0.0.4"
+        result = run_command(self.server.bank, command)
+        if result["ok"] is None:
+            status = 202
+        else:
+            status = (201 if endpoint == "create" else 200) if result["ok"] else 422
+        return endpoint, status, dumps(result), "application/json"
+
+    def _read_body(self):
+        # Returns (body dict, None) or (None, (status, message)). Whenever
+        # the body is left unread the connection is closed, so its bytes
+        # are never parsed as the next request.
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.close_connection = True
+            return None, (400, "Invalid Content-Length")
+        if length < 0:
+            self.close_connection = True
+            return None, (400, "Invalid Content-Length")
+        if length > MAX_BODY:
+            self.close_connection = True
+            return None, (413, "Request body too large")
+        if not length:
+            return {}, None
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            return None, (400, f"Invalid JSON: {e}")
+        if not isinstance(body, dict):
+            return None, (400, "Body must be a JSON object")
+        return body, None
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+
+class BankHTTPServer(HTTPServer):
+    """
+    HTTPServer that hands each accepted connection to a fixed pool of
+    worker threads, all serving the same BankingService.
+    """
+    request_queue_size = 128
+
+    def __init__(self, address, bank: BankingService, workers: int = DEFAULT_WORKERS,
+                 keepalive: float = DEFAULT_KEEPALIVE):
+        super().__init__(address, BankRequestHandler)
+        self.bank = bank
+        self.keepalive = keepalive
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gdb-http")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def observe(self, endpoint: str, status: int, seconds: float) -> None:
+        metrics.counter("gdb_http_requests_total", "HTTP requests per endpoint and status",
+                        endpoint=endpoint, status=str(status)).inc()
+        if metrics.ENABLED:
+            metrics.histogram("gdb_http_seconds", "Latency of HTTP requests", endpoint=endpoint).observe(seconds)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m api.server", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="0 picks a free port")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="worker threads (concurrent connections)")
+    parser.add_argument("--keepalive", type=float, default=DEFAULT_KEEPALIVE,
+                        help="seconds an idle keep-alive connection is kept open")
+    args = parser.parse_args(argv)
+
+    bank = BankingService()
+    server = BankHTTPServer((args.host, args.port), bank, args.workers, args.keepalive)
+    # Stop the same way on SIGTERM as on Ctrl-C.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port} with {args.workers} workers", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        bank.store.sync()
+        bank.store.close()
+        logging.info("Server stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
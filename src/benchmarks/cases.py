@@ -0,0 +1,76 @@
+"""
+The benchmark cases. Each one is measured in its own process over a copy
+of a generated data directory (see benchmarks.run).
+"""
+import random
+from typing import Callable, Dict, NamedTuple
+
+from benchmarks.datagen import PIN, START_ACCOUNT_NO, account_name
+from services.banking_services import BankingService
+from utils.storage import open_store
+
+
+class Case(NamedTuple):
+    # setup(size) builds the state op(state, size, rng) runs against;
+    # op returns False (or an (ok, message) tuple) when it failed.
+    setup: Callable
+    op: Callable
+    # Whole-book cases (load, save) run --repeat times instead of --ops.
+    whole_book: bool = False
+    warmup: int = 10
+
+
+def _account(size: int, rng: random.Random) -> int:
+    return START_ACCOUNT_NO + rng.randrange(size)
+
+
+def _deposit(bank, size, rng):
+    return bank.deposit(_account(size, rng), "10.00", PIN)
+
+
+def _withdraw(bank, size, rng):
+    return bank.withdraw(_account(size, rng), "10.00", PIN)
+
+
+def _transfer(bank, size, rng):
+    from_acc, to_acc = _account(size, rng), _account(size, rng)
+    if from_acc == to_acc:
+        to_acc = START_ACCOUNT_NO + (to_acc - START_ACCOUNT_NO + 1) % size
+    return bank.transfer_funds(from_acc, to_acc, "1.00", PIN)
+
+
+def _search_by_name(bank, size, rng):
+    return bool(bank.search_by_name(account_name(_account(size, rng))))
+
+
+def _top_n(bank, size, rng):
+    return len(bank.top_n_accounts_by_balance(10)) == min(10, size)
+
+
+def _load_accounts(store, size, rng):
+    return len(store.load_accounts()) == size
+
+
+def _save_accounts(bank, size, rng):
+    return bank.store.save_accounts(bank.accounts)
+
+
+def _read_history(bank, size, rng):
+    bank.store.read_transaction_history(_account(size, rng))
+
+
+CASES: Dict[str, Case] = {
+    "deposit": Case(lambda size: BankingService(), _deposit),
+    "withdraw": Case(lambda size: BankingService(), _withdraw),
+    "transfer_funds": Case(lambda size: BankingService(), _transfer),
+    "search_by_name": Case(lambda size: BankingService(), _search_by_name),
+    "top_n_accounts_by_balance": Case(lambda size: BankingService(), _top_n),
+    "load_accounts": Case(lambda size: open_store(), _load_accounts, whole_book=True, warmup=0),
+    "save_accounts": Case(lambda size: BankingService(), _save_accounts, whole_book=True, warmup=0),
+    "read_transaction_history": Case(lambda size: BankingService(), _read_history),
+}
+
+
+def close(state) -> None:
+    store = getattr(state, "store", state)
+    store.close()
@@ -0,0 +1,64 @@
+"""
+Compare two benchmark result files written by benchmarks.run.
+
+Usage (from src/):
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.25]
+
+A case regresses when its throughput drops, or its p99 latency or peak RSS
+grows, by more than the threshold (a fraction; the default allows for the
+run-to-run noise of sub-millisecond operations). Exits with status 1 if
+any case regressed.
+"""
+import sys
+import json
+import argparse
+from typing import Dict, Optional, Tuple
+
+# Metric, and whether a higher value is better.
+METRICS = (("ops_per_sec", True), ("p99_ms", False), ("peak_rss_bytes", False))
+
+
+def _results(path: str) -> Tuple[dict, Dict[Tuple[str, int], dict]]:
+    with open(path) as f:
+        report = json.load(f)
+    return report, {(r["case"], r["size"]): r for r in report["results"]}
+
+
+def _change(base: Optional[float], new: Optional[float]) -> Optional[float]:
+    if not base or new is None:
+        return None
+    return (new - base) / base
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    base_report, base = _results(args.baseline)
+    new_report, new = _results(args.candidate)
+    print(f"{base_report.get('revision') or args.baseline} -> {new_report.get('revision') or args.candidate}")
+    regressions = 0
+    for key in sorted(base.keys() & new.keys(), key=lambda k: (k[1], k[0])):
+        changes = []
+        regressed = False
+        for metric, higher_is_better in METRICS:
+            change = _change(base[key].get(metric), new[key].get(metric))
+            if change is None:
+                continue
+            worse = -change if higher_is_better else change
+            if worse > args.threshold:
+                regressed = True
+            changes.append(f"{metric} {change:+.1%}")
+        regressions += regressed
+        print(f"{'REGRESSED' if regressed else 'ok':<10} {key[0]:<26} {key[1]:>10}  " + "  ".join(changes))
+    for key in sorted(base.keys() ^ new.keys()):
+        print(f"{'only in ' + ('baseline' if key in base else 'candidate'):<20} {key[0]} {key[1]}")
+    print(f"{regressions} regression(s) over {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Synthetic data for the benchmarks: an account book and a transaction log
+of any size, written into GDB_DATA_DIR through the same code paths the
+service uses (snapshot file, segmented log and its index).
+
+Usage (from src/):
+    GDB_DATA_DIR=/tmp/bank python -m benchmarks.datagen 100000 [log rows] [seed]
+"""
+import sys
+import random
+import logging
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from models.account import Account
+from utils import file_manager
+
+START_ACCOUNT_NO = 1001
+PIN = "1234"
+LOG_BATCH = 10000
+
+FIRST_NAMES = (
+    "Aarav", "Abena", "Adam", "Aiko", "Alejandro", "Amara", "Ana", "Anil", "Ayesha", "Ben",
+    "Chen", "Chloe", "Daniel", "Deepa", "Diego", "Elena", "Emeka", "Emma", "Fatima", "Felix",
+    "Grace", "Hana", "Hugo", "Ines", "Isaac", "Jana", "Javier", "Kai", "Kenji", "Lara",
+    "Leila", "Liam", "Lucia", "Malik", "Maria", "Mateo", "Mei", "Mohammed", "Nadia", "Nia",
+    "Noah", "Olga", "Omar", "Priya", "Rahul", "Rosa", "Sakura", "Samuel", "Sara", "Sofia",
+    "Tariq", "Tomas", "Uma", "Victor", "Wei", "Yara", "Yusuf", "Zara", "Zoe", "Ivan",
+    "Kofi", "Lin", "Marta", "Ravi",
+)
+LAST_NAMES = (
+    "Abara", "Adeyemi", "Ahmed", "Alvarez", "Andersen", "Bakker", "Banerjee", "Becker", "Bianchi", "Brown",
+    "Castro", "Chen", "Cohen", "Costa", "Das", "Diaz", "Dubois", "Eze", "Fernandes", "Fischer",
+    "Garcia", "Gupta", "Haddad", "Hansen", "Hernandez", "Hoffmann", "Huang", "Ibrahim", "Ito", "Jansen",
+    "Johnson", "Kaur", "Khan", "Kim", "Kowalski", "Kumar", "Larsen", "Lee", "Lopez", "Martin",
+    "Mensah", "Meyer", "Moreau", "Morris", "Nakamura", "Nguyen", "Novak", "Okafor", "Olsen", "Patel",
+    "Pereira", "Petrov", "Quinn", "Rahman", "Reddy", "Rossi", "Sato", "Schmidt", "Silva", "Singh",
+    "Smith", "Suzuki", "Tanaka", "Taylor", "Torres", "Wang", "Weber", "Williams", "Wilson", "Wong",
+    "Yamamoto", "Yilmaz", "Zhang", "Zhou", "Zimmermann", "Ali", "Baptiste", "Chowdhury", "Dlamini", "Evans",
+    "Fofana", "Gonzalez", "Hussain", "Ivanova", "Jovanovic", "Kruger", "Lindqvist", "Mahlangu", "Nowak", "Owusu",
+    "Park", "Qureshi", "Romero", "Santos", "Tran", "Usman", "Vargas", "Walker", "Xu", "Young",
+    "Adams", "Baker", "Clark", "Davis", "Edwards", "Foster", "Gray", "Hall", "Irwin", "James",
+    "King", "Lewis", "Moore", "Nelson", "Owen", "Price", "Reed", "Scott", "Turner", "Vaughn",
+    "Ward", "Xavier", "York", "Zeller", "Abbott", "Blake", "Cruz", "Dunn",
+)
+
+
+def account_name(number: int) -> str:
+    """
+    The holder name generate_accounts() gives account number.
+    """
+    i = number - START_ACCOUNT_NO
+    return f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+
+
+def generate_accounts(count: int, seed: int = 0) -> Iterator[Account]:
+    """
+    count active accounts numbered from START_ACCOUNT_NO, all with PIN, with
+    balances well above the minimum and a short history window.
+    """
+    rng = random.Random(seed)
+    today = datetime.now().date()
+    for i in range(count):
+        number = START_ACCOUNT_NO + i
+        account_type = "Savings" if rng.random() < 0.7 else "Current"
+        balance = rng.randint(5_000_00, 5_000_000_00) / 100
+        history = []
+        running = balance
+        for days_ago in sorted(rng.sample(range(1, 90), rng.randint(0, 3)), reverse=True):
+            amount = rng.randint(1_00, 2_000_00) / 100
+            running = round(running + amount, 2)
+            history.append({"type": "DEPOSIT", "amount": amount, "balance": running,
+                            "date": (today - timedelta(days=days_ago)).isoformat()})
+        if history:
+            balance = history[-1]["balance"]
+        yield Account(number, account_name(number), rng.randint(18, 90), account_type, balance=balance,
+                      pin=PIN, transaction_history=history)
+
+
+def generate_log(count: int, accounts: int, seed: int = 0) -> Iterator[str]:
+    """
+    count transaction log lines spread over accounts, with timestamps
+    increasing over the past year.
+    """
+    rng = random.Random(seed + 1)
+    start = datetime.now() - timedelta(days=365)
+    step = timedelta(days=365) / max(1, count)
+    operations = ("DEPOSIT", "WITHDRAW", "TRANSFER_IN", "TRANSFER_OUT")
+    for i in range(count):
+        timestamp = (start + step * i).strftime("%Y-%m-%d %H:%M:%S")
+        number = START_ACCOUNT_NO + rng.randrange(max(1, accounts))
+        yield (f"{timestamp} | {number} | {rng.choice(operations)} | {rng.randint(1_00, 50_000_00) / 100} | "
+               f"{rng.randint(5_000_00, 5_000_000_00) / 100}")
+
+
+def generate(accounts: int, log_rows: int, seed: int = 0) -> None:
+    """
+    Fill GDB_DATA_DIR (which should be empty) with accounts accounts and
+    log_rows transaction log lines.
+    """
+    file_manager.write_snapshot(generate_accounts(accounts, seed))
+    batch = []
+    for line in generate_log(log_rows, accounts, seed):
+        batch.append(line)
+        if len(batch) >= LOG_BATCH:
+            file_manager.append_transaction_lines(batch)
+            file_manager.sync()
+            batch = []
+    file_manager.append_transaction_lines(batch)
+    file_manager.sync()
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not 1 <= len(argv) <= 3:
+        print("Usage: python -m benchmarks.datagen <accounts> [log rows] [seed]")
+        return 2
+    accounts = int(argv[0])
+    log_rows = int(argv[1]) if len(argv) > 1 else accounts
+    seed = int(argv[2]) if len(argv) > 2 else 0
+    logging.getLogger().setLevel(logging.WARNING)
+    generate(accounts, log_rows, seed)
+    print(f"Generated {accounts} accounts and {log_rows} log rows in {file_manager.DATA_DIR}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
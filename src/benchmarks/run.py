@@ -0,0 +1,208 @@
+"""
+Benchmark BankingService hot paths against generated data sets.
+
+For every size, a data directory with that many accounts (and, by
+default, as many transaction log rows) is generated once by
+benchmarks.datagen. Each case then runs in a fresh process on its own copy
+of it, with GDB_DATA_DIR pointing at a temporary directory, so cases cannot
+see each other's writes or share caches. Per case and size the results
+record ops/sec, p50/p99 latency and the peak RSS of the case process.
+
+Usage (from src/):
+    python -m benchmarks.run --sizes 1000,10000,100000 --output results.json
+    python -m benchmarks.run --cases deposit,transfer_funds --env GDB_STORE=sqlite
+    python -m benchmarks.compare baseline.json results.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = "1000,10000,100000"
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(name: str, size: int, ops: int, repeat: int, seed: int = 0) -> dict:
+    """
+    Run one case in this process (GDB_DATA_DIR must already point at its
+    data) and return its result record.
+    """
+    from benchmarks.cases import CASES, close
+
+    case = CASES[name]
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    state = case.setup(size)
+    setup_seconds = time.perf_counter() - started
+    for _ in range(case.warmup):
+        case.op(state, size, rng)
+    count = repeat if case.whole_book else ops
+    latencies = np.empty(count, dtype=np.int64)
+    failed = 0
+    started = time.perf_counter()
+    for i in range(count):
+        op_started = time.perf_counter_ns()
+        result = case.op(state, size, rng)
+        latencies[i] = time.perf_counter_ns() - op_started
+        if result is False or (isinstance(result, tuple) and not result[0]):
+            failed += 1
+    elapsed = time.perf_counter() - started
+    close(state)
+    return {
+        "case": name,
+        "size": size,
+        "ops": count,
+        "failed": failed,
+        "seconds": round(elapsed, 6),
+        "ops_per_sec": round(count / elapsed, 3) if elapsed else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)) / 1e6, 6),
+        "p99_ms": round(float(np.percentile(latencies, 99)) / 1e6, 6),
+        "setup_seconds": round(setup_seconds, 6),
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def _child_env(data_dir: str, env: Dict[str, str]) -> Dict[str, str]:
+    child = dict(os.environ)
+    child.update(env)
+    child["GDB_DATA_DIR"] = data_dir
+    child["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")]))
+    return child
+
+
+def _run_child(args: List[str], data_dir: str, env: Dict[str, str]) -> str:
+    proc = subprocess.run([sys.executable, "-m"] + args, cwd=SRC_DIR, env=_child_env(data_dir, env),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.splitlines()[-20:])
+        raise RuntimeError(f"{' '.join(args)} failed with exit code {proc.returncode}:\n{tail}")
+    return proc.stdout
+
+
+def generate_data(data_dir: str, size: int, log_rows: int, seed: int, env: Dict[str, str]) -> None:
+    """
+    Generate a data set into data_dir, converted to the store GDB_STORE
+    selects for the cases.
+    """
+    _run_child(["benchmarks.datagen", str(size), str(log_rows), str(seed)], data_dir, env)
+    store = env.get("GDB_STORE", os.environ.get("GDB_STORE", "csv")).lower()
+    if store != "csv":
+        _run_child(["utils.migrate_store", "csv", store], data_dir, env)
+
+
+def run_case(name: str, size: int, data_dir: str, ops: int, repeat: int, seed: int,
+             env: Dict[str, str]) -> dict:
+    """
+    Run one case in a child process on a throwaway copy of data_dir.
+    """
+    work = tempfile.mkdtemp(prefix=f"gdb-bench-{name}-")
+    try:
+        case_dir = os.path.join(work, "data")
+        shutil.copytree(data_dir, case_dir)
+        out = _run_child(["benchmarks.run", "--child", name, "--sizes", str(size), "--ops", str(ops),
+                          "--repeat", str(repeat), "--seed", str(seed)], case_dir, env)
+        return json.loads(out.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _revision() -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def _parse_env(pairs: List[str]) -> Dict[str, str]:
+    env = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--env expects KEY=VALUE, got {pair}")
+        env[key] = value
+    return env
+
+
+def main(argv=None) -> int:
+    from benchmarks.cases import CASES
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated account counts")
+    parser.add_argument("--log-rows", type=float, default=1.0,
+                        help="transaction log rows per account (default 1)")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    parser.add_argument("--ops", type=int, default=2000, help="operations per per-account case")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each whole-book case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the cases, e.g. GDB_STORE=sqlite")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    if args.child:
+        # Inside a case process: keep the per-operation INFO logs out of the timings' output.
+        logging.getLogger().setLevel(logging.WARNING)
+        print(json.dumps(measure(args.child, sizes[0], args.ops, args.repeat, args.seed)))
+        return 0
+
+    names = [name for name in args.cases.split(",") if name]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases {unknown}; choose from {list(CASES)}")
+    env = _parse_env(args.env)
+    report = {
+        "revision": _revision(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "env": env,
+        "results": [],
+    }
+    root = tempfile.mkdtemp(prefix="gdb-bench-data-")
+    try:
+        for size in sizes:
+            log_rows = int(size * args.log_rows)
+            data_dir = os.path.join(root, str(size))
+            started = time.perf_counter()
+            generate_data(data_dir, size, log_rows, args.seed, env)
+            print(f"Generated {size} accounts, {log_rows} log rows in {time.perf_counter() - started:.1f}s")
+            for name in names:
+                result = run_case(name, size, data_dir, args.ops, args.repeat, args.seed, env)
+                result["log_rows"] = log_rows
+                report["results"].append(result)
+                print(f"  {name:<26} {result['ops_per_sec']:>12,.1f} ops/s  p50 {result['p50_ms']:9.3f} ms  "
+                      f"p99 {result['p99_ms']:9.3f} ms  rss {result['peak_rss_bytes'] / 2**20:8.1f} MiB"
+                      + (f"  ({result['failed']} failed)" if result["failed"] else ""))
+                sys.stdout.flush()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,28 @@
+import sys
+import argparse
+
 from services.banking_services import BankingService
+from services.batch_runner import BATCH_FORMATS, read_commands, run_batch
+
+def run_batch_mode(args) -> int:
+    """
+    Run the commands in args.batch (a JSONL or CSV file, or - for stdin)
+    and write one JSON result line per command. Exits non-zero if any
+    command failed.
+    """
+    fmt = args.format or ("csv" if args.batch.lower().endswith(".csv") else "jsonl")
+    source = sys.stdin if args.batch == "-" else open(args.batch, newline="")
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        bank = BankingService()
+        count, failed = run_batch(bank, read_commands(source, fmt), out, durable=args.durable)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{count} commands run, {failed} failed.", file=sys.stderr)
+    return 1 if failed else 0
 
 def main():
     bank = BankingService()
@@ -231,4 +255,14 @@ def main():
             print("Invalid Choice.\n Try Again!!")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GlobalDigital Bank. Interactive menu unless --batch is given.")
+    parser.add_argument("--batch", metavar="FILE", help="run the commands in FILE (- for stdin) non-interactively")
+    parser.add_argument("--format", choices=BATCH_FORMATS,
+                        help="command file format (default: csv for a .csv file, else jsonl)")
+    parser.add_argument("--output", metavar="FILE", help="write the JSONL results here instead of stdout")
+    parser.add_argument("--durable", action="store_true",
+                        help="sync every command to disk instead of once at the end")
+    args = parser.parse_args()
+    if args.batch:
+        sys.exit(run_batch_mode(args))
     main()
\ No newline at end of file
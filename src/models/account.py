@@ -1,4 +1,4 @@
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
 from enum import Enum
 from datetime import date
 
@@ -10,16 +10,86 @@ class AccountStatus(Enum):
     ACTIVE = "Active"
     INACTIVE = "Inactive"
 
+# Small-int codes for account type and status, in enum declaration order.
+TYPE_NAMES = tuple(t.value for t in AccountType)
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+STATUS_NAMES = tuple(s.value for s in AccountStatus)
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+ACTIVE = STATUS_CODES[AccountStatus.ACTIVE.value]
+
+_CENT = Decimal("0.01")
+_QUANTS = {}
+
+def _quant(places: int) -> Decimal:
+    q = _QUANTS.get(places)
+    if q is None:
+        q = _QUANTS[places] = Decimal(1).scaleb(-places)
+    return q
+
+def parse_amount(amount):
+    """
+    Parse an amount into (cents, places), where places is the number of
+    decimal places it was written with. Returns None if the amount is not a
+    finite number of whole cents.
+    """
+    try:
+        d = Decimal(amount if type(amount) is str else str(amount))
+    except (TypeError, ValueError, InvalidOperation):
+        return None
+    if not d.is_finite():
+        return None
+    exponent = d.as_tuple().exponent
+    if exponent >= -2:
+        return int(d.scaleb(2)), max(0, -exponent)
+    cents = d.scaleb(2)
+    if cents != cents.to_integral_value():
+        return None
+    return int(cents), -exponent
+
+def _parse_stored_amount(value):
+    # Stored balances are rounded to cents rather than rejected.
+    d = Decimal(str(value))
+    exponent = d.as_tuple().exponent
+    places = max(0, -exponent)
+    if places > 2 and d.scaleb(2) != d.scaleb(2).to_integral_value():
+        d = d.quantize(_CENT, rounding=ROUND_HALF_EVEN)
+        places = 2
+    return int(d.scaleb(2)), places
+
+def cents_to_decimal(cents: int, places: int = 2) -> Decimal:
+    """
+    Decimal value of an amount in cents, written with the given number of
+    decimal places (the same form Decimal arithmetic would have produced).
+    """
+    return Decimal(cents).scaleb(-2).quantize(_quant(places))
+
 class Account:
     """
     Represents a bank account with basic operations.
+
+    Balances and daily totals are held as integer cents, type and status as
+    small-int codes and the last transaction date as a date ordinal; the
+    public attributes expose them in their original Decimal/str form.
     """
+    __slots__ = (
+        "account_number", "name", "age", "pin", "_history",
+        "_type", "_status", "_balance", "_places", "_daily_total", "_last_date",
+    )
+
     MIN_BALANCE = {
         AccountType.SAVINGS.value: Decimal("500"),
         AccountType.CURRENT.value: Decimal("1000")
     }
     MAX_SINGLE_DEPOSIT = Decimal("100000.0")
     DAILY_LIMIT = Decimal("200000.0")  # Example daily limit
+    # Only the most recent history entries are kept on the account; the full
+    # history lives in the transaction log (see BankingService.transaction_history).
+    HISTORY_WINDOW = 10
+
+    # Hot-path limits in cents; MIN_BALANCE_CENTS is indexed by type code.
+    MIN_BALANCE_CENTS = ()
+    MAX_SINGLE_DEPOSIT_CENTS = int(MAX_SINGLE_DEPOSIT * 100)
+    DAILY_LIMIT_CENTS = int(DAILY_LIMIT * 100)
 
     def __init__(
         self,
@@ -37,230 +107,224 @@ class Account:
         self.account_number = int(account_number)
         self.name = name.strip()
         self.age = int(age)
-        self.account_type = account_type.title()
-        if self.account_type not in Account.MIN_BALANCE:
-            raise ValueError(f"Invalid account type: {self.account_type}")
-        self.balance = Decimal(str(balance))
-        self.status = status.title()
-        if self.status not in [s.value for s in AccountStatus]:
-            raise ValueError(f"Invalid status: {self.status}")
+        self.account_type = account_type
+        self.balance = balance
+        self.status = status
         self.pin = pin  # Consider hashing in production
 
         # New fields for extended features
-        self.transaction_history = transaction_history if transaction_history is not None else []
-        self.daily_total = Decimal(str(daily_total))
+        self.transaction_history = transaction_history or ()
+        self.daily_total = daily_total
         self.last_transaction_date = last_transaction_date
 
-    def deposit(self, amount) -> tuple[bool, str]:
+    @classmethod
+    def from_fields(cls, account_number: int, name: str, age: int, pin, history, type_code: int,
+                    status_code: int, balance_cents: int, places: int, daily_total_cents: int,
+                    last_date) -> "Account":
+        """
+        Rebuild an account from the values of fields(), skipping the parsing
+        and validation done by __init__.
+        """
+        acc = cls.__new__(cls)
+        acc.account_number = account_number
+        acc.name = name
+        acc.age = age
+        acc.pin = pin
+        acc._history = tuple(history)
+        acc._type = type_code
+        acc._status = status_code
+        acc._balance = balance_cents
+        acc._places = places
+        acc._daily_total = daily_total_cents
+        acc._last_date = last_date
+        return acc
+
+    def fields(self) -> tuple:
+        """
+        The compact stored state, in from_fields() argument order.
+        """
+        return (self.account_number, self.name, self.age, self.pin, self._history, self._type,
+                self._status, self._balance, self._places, self._daily_total, self._last_date)
+
+    # --- Compact fields exposed in their original form ---
+    @property
+    def account_type(self) -> str:
+        return TYPE_NAMES[self._type]
+
+    @account_type.setter
+    def account_type(self, value: str) -> None:
+        code = TYPE_CODES.get(value.title())
+        if code is None:
+            raise ValueError(f"Invalid account type: {value.title()}")
+        self._type = code
+
+    @property
+    def status(self) -> str:
+        return STATUS_NAMES[self._status]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        code = STATUS_CODES.get(value.title())
+        if code is None:
+            raise ValueError(f"Invalid status: {value.title()}")
+        self._status = code
+
+    @property
+    def transaction_history(self) -> tuple:
+        # A tuple costs far less per account than a bounded deque; it is
+        # replaced, never mutated, when an entry is added.
+        return self._history
+
+    @transaction_history.setter
+    def transaction_history(self, entries) -> None:
+        self._history = tuple(entries)[-Account.HISTORY_WINDOW:]
+
+    def _add_history(self, entry: dict) -> None:
+        self._history = (self._history + (entry,))[-Account.HISTORY_WINDOW:]
+
+    @property
+    def type_code(self) -> int:
+        return self._type
+
+    @property
+    def status_code(self) -> int:
+        return self._status
+
+    @property
+    def balance(self) -> Decimal:
+        return cents_to_decimal(self._balance, self._places)
+
+    @balance.setter
+    def balance(self, value) -> None:
+        self._balance, self._places = _parse_stored_amount(value)
+
+    @property
+    def balance_cents(self) -> int:
+        return self._balance
+
+    @property
+    def balance_places(self) -> int:
+        """
+        Number of decimal places the balance is written with.
+        """
+        return self._places
+
+    @property
+    def daily_total(self) -> Decimal:
+        return cents_to_decimal(self._daily_total)
+
+    @daily_total.setter
+    def daily_total(self, value) -> None:
+        self._daily_total = _parse_stored_amount(value)[0]
+
+    @property
+    def last_transaction_date(self):
+        value = self._last_date
+        if type(value) is int:
+            return date.fromordinal(value).isoformat()
+        return value
+
+    @last_transaction_date.setter
+    def last_transaction_date(self, value) -> None:
+        # ISO dates are kept as ordinals; anything else (None, "") as given.
         try:
-            amount = Decimal(str(amount))
-        except (TypeError, ValueError, InvalidOperation):
+            self._last_date = date.fromisoformat(value).toordinal()
+        except (TypeError, ValueError):
+            self._last_date = value
+
+    def _start_daily_window(self, today: date) -> None:
+        today_ord = today.toordinal()
+        if self._last_date != today_ord:
+            self._daily_total = 0
+            self._last_date = today_ord
+
+    def deposit(self, amount) -> tuple[bool, str]:
+        parsed = parse_amount(amount)
+        if parsed is None:
             return False, "Invalid Amount"
-        
-        if self.status != AccountStatus.ACTIVE.value:
+        cents, places = parsed
+
+        if self._status != ACTIVE:
             return False, "Account is inactive"
 
-        if amount <= 0:
+        if cents <= 0:
             return False, "Deposit must be positive"
-        if amount > Account.MAX_SINGLE_DEPOSIT:
+        if cents > Account.MAX_SINGLE_DEPOSIT_CENTS:
             return False, f"Deposit exceeds single-deposit limit {Account.MAX_SINGLE_DEPOSIT}"
 
         # Daily transaction limit check
-        today = str(date.today())
-        if self.last_transaction_date != today:
-            self.daily_total = Decimal("0.0")
-            self.last_transaction_date = today
-        if self.daily_total + amount > Account.DAILY_LIMIT:
+        today = date.today()
+        self._start_daily_window(today)
+        if self._daily_total + cents > Account.DAILY_LIMIT_CENTS:
             return False, f"Daily transaction limit of {Account.DAILY_LIMIT} exceeded"
-        self.daily_total += amount
+        self._daily_total += cents
 
-        self.balance += amount
-        self.transaction_history.append(
-            {"type": "DEPOSIT", "amount": float(amount), "balance": float(self.balance), "date": today}
+        self._balance += cents
+        if places > self._places:
+            self._places = places
+        self._add_history(
+            {"type": "DEPOSIT", "amount": cents / 100, "balance": self._balance / 100, "date": today.isoformat()}
         )
         return True, f"Deposit Successful.\nNew Balance: {self.balance}"
-    
+
     def withdraw(self, amount) -> tuple[bool, str]:
-        try:
-            amount = Decimal(str(amount))
-        except (TypeError, ValueError, InvalidOperation):
+        parsed = parse_amount(amount)
+        if parsed is None:
             return False, "Invalid Amount"
-        
-        if self.status != AccountStatus.ACTIVE.value:
+        cents, places = parsed
+
+        if self._status != ACTIVE:
             return False, "Account is inactive"
-        if amount <= 0:
+        if cents <= 0:
             return False, "Withdrawal must be positive"
-        
-        min_required = Account.MIN_BALANCE[self.account_type]
-        if self.balance - amount < min_required:
-            return False, f"Insufficient funds. Minimum required balance for {self.account_type}: {min_required}"
+
+        if self._balance - cents < Account.MIN_BALANCE_CENTS[self._type]:
+            account_type = TYPE_NAMES[self._type]
+            return False, f"Insufficient funds. Minimum required balance for {account_type}: {Account.MIN_BALANCE[account_type]}"
 
         # Daily transaction limit check
-        today = str(date.today())
-        if self.last_transaction_date != today:
-            self.daily_total = Decimal("0.0")
-            self.last_transaction_date = today
-        if self.daily_total + amount > Account.DAILY_LIMIT:
+        today = date.today()
+        self._start_daily_window(today)
+        if self._daily_total + cents > Account.DAILY_LIMIT_CENTS:
             return False, f"Daily transaction limit of {Account.DAILY_LIMIT} exceeded"
-        self.daily_total += amount
+        self._daily_total += cents
 
-        self.balance -= amount
-        self.transaction_history.append(
-            {"type": "WITHDRAW", "amount": float(amount), "balance": float(self.balance), "date": today}
+        self._balance -= cents
+        if places > self._places:
+            self._places = places
+        self._add_history(
+            {"type": "WITHDRAW", "amount": cents / 100, "balance": self._balance / 100, "date": today.isoformat()}
         )
         return True, f"Withdrawal successful.\nNew Balance: {self.balance}"
-    
+
+    def post_interest(self, cents: int) -> None:
+        """
+        Credit interest computed by the bank. Not a customer transaction, so
+        the deposit and daily limits do not apply.
+        """
+        self._balance += cents
+        if self._places < 2:
+            self._places = 2
+        self._add_history(
+            {"type": "INTEREST", "amount": cents / 100, "balance": self._balance / 100,
+             "date": date.today().isoformat()}
+        )
+
     def to_dict(self) -> dict:
         return {
             "account_number": self.account_number,
             "name": self.name,
             "age": self.age,
-            "balance": float(self.balance),
-            "account_type": self.account_type,
-            "status": self.status,
+            "balance": self._balance / 100,
+            "account_type": TYPE_NAMES[self._type],
+            "status": STATUS_NAMES[self._status],
             "pin": self.pin if self.pin else "",
-            "transaction_history": self.transaction_history,
-            "daily_total": float(self.daily_total),
+            "transaction_history": list(self.transaction_history),
+            "daily_total": self._daily_total / 100,
             "last_transaction_date": self.last_transaction_date,
         }
-    
-    def __str__(self) -> str:
-        return f"[{self.account_number}] {self.name} ({self.account_type}) - Balance: {self.balance} - {self.status}"
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
 
+    def __str__(self) -> str:
+        return f"[{self.account_number}] {self.name} ({TYPE_NAMES[self._type]}) - Balance: {self.balance} - {STATUS_NAMES[self._status]}"
 
-        
\ No newline at end of file
+Account.MIN_BALANCE_CENTS = tuple(int(Account.MIN_BALANCE[name] * 100) for name in TYPE_NAMES)
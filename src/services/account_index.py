@@ -0,0 +1,163 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+from models.account import Account
+
+
+def name_key(name: str) -> str:
+    return name.strip().casefold()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class AccountIndex:
+    """
+    Secondary indexes over the account book: casefolded name, status code
+    and type code, each mapping to the account numbers that have it.
+
+    Account numbers are kept in dicts used as sets and come back in book
+    order (the order accounts were first indexed), whatever was re-indexed
+    since, so a lookup costs O(k log k) for k results. Distinct names are
+    also kept sorted for prefix queries and indexed by trigram for
+    substring queries.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, Dict[int, None]] = {}
+        self._statuses: Dict[int, Dict[int, None]] = {}
+        self._types: Dict[int, Dict[int, None]] = {}
+        self._sorted_names: List[str] = []
+        self._trigrams: Dict[str, set] = {}
+        # account_number -> (name key, status code, type code) as indexed
+        self._keys: Dict[int, Tuple[str, int, int]] = {}
+        # account_number -> position in book order
+        self._positions: Dict[int, int] = {}
+        self._next_position = 0
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable[Account]) -> "AccountIndex":
+        index = cls()
+        for acc in accounts:
+            index.update(acc)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # --- Maintenance ---
+    def _add_name(self, key: str, account_number: int) -> None:
+        numbers = self._names.get(key)
+        if numbers is None:
+            numbers = self._names[key] = {}
+            insort(self._sorted_names, key)
+            for gram in _trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key)
+        numbers[account_number] = None
+
+    def _remove_name(self, key: str, account_number: int) -> None:
+        numbers = self._names[key]
+        del numbers[account_number]
+        if numbers:
+            return
+        del self._names[key]
+        del self._sorted_names[bisect_left(self._sorted_names, key)]
+        for gram in _trigrams(key):
+            names = self._trigrams[gram]
+            names.discard(key)
+            if not names:
+                del self._trigrams[gram]
+
+    def update(self, acc: Account) -> None:
+        """
+        Index a new account, or move an existing one to its current name,
+        status and type.
+        """
+        number = acc.account_number
+        new = (name_key(acc.name), acc.status_code, acc.type_code)
+        old = self._keys.get(number)
+        if old == new:
+            return
+        if old is None:
+            self._positions[number] = self._next_position
+            self._next_position += 1
+        else:
+            if old[0] != new[0]:
+                self._remove_name(old[0], number)
+            if old[1] != new[1]:
+                del self._statuses[old[1]][number]
+            if old[2] != new[2]:
+                del self._types[old[2]][number]
+        if old is None or old[0] != new[0]:
+            self._add_name(new[0], number)
+        if old is None or old[1] != new[1]:
+            self._statuses.setdefault(new[1], {})[number] = None
+        if old is None or old[2] != new[2]:
+            self._types.setdefault(new[2], {})[number] = None
+        self._keys[number] = new
+
+    def remove(self, account_number: int) -> None:
+        old = self._keys.pop(account_number, None)
+        if old is None:
+            return
+        del self._positions[account_number]
+        self._remove_name(old[0], account_number)
+        del self._statuses[old[1]][account_number]
+        del self._types[old[2]][account_number]
+
+    def clear(self) -> None:
+        self.__init__()
+
+    # --- Queries (all return account numbers) ---
+    def _book_order(self, numbers: Iterable[int]) -> List[int]:
+        # Re-indexed accounts sit at the end of their dicts; sort them back.
+        return sorted(numbers, key=self._positions.__getitem__)
+
+    def by_name(self, name: str) -> List[int]:
+        return self._book_order(self._names.get(name_key(name), ()))
+
+    def by_name_prefix(self, prefix: str) -> List[int]:
+        """
+        Accounts whose name starts with prefix, ordered by name, then book order.
+        """
+        prefix = name_key(prefix)
+        result = []
+        i = bisect_left(self._sorted_names, prefix)
+        while i < len(self._sorted_names) and self._sorted_names[i].startswith(prefix):
+            result.extend(self._book_order(self._names[self._sorted_names[i]]))
+            i += 1
+        return result
+
+    def by_name_substring(self, text: str) -> List[int]:
+        """
+        Accounts whose name contains text, ordered by name, then book order.
+        """
+        text = name_key(text)
+        grams = _trigrams(text)
+        if grams:
+            # Names holding every trigram of text are candidates; the final
+            # containment check removes false positives.
+            candidates = None
+            for gram in sorted(grams, key=lambda g: len(self._trigrams.get(g, ()))):
+                names = self._trigrams.get(gram)
+                if not names:
+                    return []
+                candidates = set(names) if candidates is None else candidates & names
+                if not candidates:
+                    return []
+        else:
+            candidates = self._names.keys()
+        result = []
+        for key in sorted(k for k in candidates if text in k):
+            result.extend(self._book_order(self._names[key]))
+        return result
+
+    def count_status(self, status_code: int) -> int:
+        return len(self._statuses.get(status_code, ()))
+
+    def with_status(self, status_code: int) -> List[int]:
+        return self._book_order(self._statuses.get(status_code, ()))
+
+    def with_type(self, type_code: int) -> List[int]:
+        return self._book_order(self._types.get(type_code, ()))
@@ -0,0 +1,243 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from models.account import Account
+
+
+class _SortedKeys:
+    """
+    Sorted collection of unique keys stored as a list of bounded sublists,
+    so add() and remove() move at most LOAD * 2 entries.
+    """
+
+    LOAD = 512
+
+    def __init__(self, keys: Iterable = ()):
+        keys = sorted(keys)
+        self._lists = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes = [lst[-1] for lst in self._lists]
+        self._len = len(keys)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key) -> None:
+        if not self._lists:
+            self._lists.append([key])
+            self._maxes.append(key)
+        else:
+            i = bisect_left(self._maxes, key)
+            if i == len(self._maxes):
+                i -= 1
+                self._lists[i].append(key)
+                self._maxes[i] = key
+            else:
+                insort(self._lists[i], key)
+            lst = self._lists[i]
+            if len(lst) > self.LOAD * 2:
+                self._lists[i:i + 1] = [lst[:self.LOAD], lst[self.LOAD:]]
+                self._maxes[i:i + 1] = [lst[self.LOAD - 1], lst[-1]]
+        self._len += 1
+
+    def remove(self, key) -> None:
+        i = bisect_left(self._maxes, key)
+        lst = self._lists[i]
+        del lst[bisect_left(lst, key)]
+        if lst:
+            self._maxes[i] = lst[-1]
+        else:
+            del self._lists[i]
+            del self._maxes[i]
+        self._len -= 1
+
+    def first(self, n: int) -> Iterator:
+        for lst in self._lists:
+            if n <= 0:
+                return
+            yield from lst[:n]
+            n -= len(lst)
+
+
+class AccountTable:
+    """
+    Columnar shadow copy of the account book for analytics queries.
+
+    One NumPy array per column (account number, balance in cents, age, type
+    code, status code), with rows in insertion order. BankingService calls
+    update() after every mutation, so bulk calculations can run as
+    vectorized operations instead of walking Account objects.
+
+    The dashboard aggregates are maintained alongside the columns: a
+    running balance total, accounts grouped by age and a leaderboard of
+    (-balance, row) keys, each updated in O(log n) per changed account.
+    """
+
+    COLUMNS = (
+        ("account_number", np.int64),
+        ("balance", np.int64),
+        ("age", np.int32),
+        ("type", np.int8),
+        ("status", np.int8),
+        ("places", np.int8),
+    )
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        self._columns = {name: np.zeros(max(1, capacity), dtype=dtype) for name, dtype in self.COLUMNS}
+        self._reset_aggregates()
+
+    def _reset_aggregates(self) -> None:
+        self._total = 0
+        self._leaderboard = _SortedKeys()
+        # Distinct ages in order, and the accounts of each in insertion order.
+        self._ages: List[int] = []
+        self._ages_by_value: Dict[int, Dict[int, None]] = {}
+        # Number of balances written with each count of decimal places.
+        self._places: Dict[int, int] = {}
+
+    def _add_age(self, age: int, account_number: int) -> None:
+        numbers = self._ages_by_value.get(age)
+        if numbers is None:
+            numbers = self._ages_by_value[age] = {}
+            insort(self._ages, age)
+        numbers[account_number] = None
+
+    def _remove_age(self, age: int, account_number: int) -> None:
+        numbers = self._ages_by_value[age]
+        del numbers[account_number]
+        if not numbers:
+            del self._ages_by_value[age]
+            del self._ages[bisect_left(self._ages, age)]
+
+    def _add_places(self, places: int) -> None:
+        self._places[places] = self._places.get(places, 0) + 1
+
+    def _remove_places(self, places: int) -> None:
+        self._places[places] -= 1
+        if not self._places[places]:
+            del self._places[places]
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable[Account]) -> "AccountTable":
+        """
+        Build a table from existing accounts in a single pass.
+        """
+        values = {name: [] for name, _ in cls.COLUMNS}
+        for acc in accounts:
+            values["account_number"].append(acc.account_number)
+            values["balance"].append(acc.balance_cents)
+            values["age"].append(acc.age)
+            values["type"].append(acc.type_code)
+            values["status"].append(acc.status_code)
+            values["places"].append(acc.balance_places)
+        size = len(values["account_number"])
+        table = cls(capacity=size)
+        for name, dtype in cls.COLUMNS:
+            table._columns[name][:size] = np.array(values[name], dtype=dtype)
+        table._size = size
+        table._rows = {number: row for row, number in enumerate(values["account_number"])}
+        table._total = sum(values["balance"])
+        table._leaderboard = _SortedKeys((-balance, row) for row, balance in enumerate(values["balance"]))
+        for number, age in zip(values["account_number"], values["age"]):
+            table._add_age(age, number)
+        for places in values["places"]:
+            table._add_places(places)
+        return table
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, account_number) -> bool:
+        return account_number in self._rows
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Read-only view of one column, limited to the rows in use.
+        """
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def _grow(self) -> None:
+        capacity = len(self._columns["account_number"]) * 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def update(self, acc: Account) -> None:
+        """
+        Insert or refresh the row of one account.
+        """
+        number = acc.account_number
+        balance = acc.balance_cents
+        row = self._rows.get(number)
+        if row is None:
+            if self._size == len(self._columns["account_number"]):
+                self._grow()
+            row = self._size
+            self._rows[number] = row
+            self._size += 1
+            self._columns["account_number"][row] = number
+            self._total += balance
+            self._leaderboard.add((-balance, row))
+            self._add_age(acc.age, number)
+            self._add_places(acc.balance_places)
+        else:
+            old_balance = int(self._columns["balance"][row])
+            if old_balance != balance:
+                self._total += balance - old_balance
+                self._leaderboard.remove((-old_balance, row))
+                self._leaderboard.add((-balance, row))
+            old_age = int(self._columns["age"][row])
+            if old_age != acc.age:
+                self._remove_age(old_age, number)
+                self._add_age(acc.age, number)
+            old_places = int(self._columns["places"][row])
+            if old_places != acc.balance_places:
+                self._remove_places(old_places)
+                self._add_places(acc.balance_places)
+        self._columns["balance"][row] = balance
+        self._columns["age"][row] = acc.age
+        self._columns["type"][row] = acc.type_code
+        self._columns["status"][row] = acc.status_code
+        self._columns["places"][row] = acc.balance_places
+
+    def clear(self) -> None:
+        self._size = 0
+        self._rows = {}
+        self._reset_aggregates()
+
+    # --- Queries (all return account numbers or plain numbers) ---
+    def total_balance_cents(self) -> int:
+        return self._total
+
+    def balance_places(self) -> int:
+        """
+        Most decimal places any balance is written with, i.e. those of a
+        Decimal sum of all balances.
+        """
+        return max(self._places, default=0)
+
+    def top_by_balance(self, n: int) -> List[int]:
+        """
+        Account numbers of the n highest balances, highest first; ties keep
+        insertion order.
+        """
+        numbers = self._columns["account_number"]
+        if n < 0:
+            n = max(0, self._size + n)
+        return [int(numbers[row]) for _, row in self._leaderboard.first(n)]
+
+    def youngest(self) -> Optional[int]:
+        if not self._ages:
+            return None
+        return next(iter(self._ages_by_value[self._ages[0]]))
+
+    def oldest(self) -> Optional[int]:
+        if not self._ages:
+            return None
+        return next(iter(self._ages_by_value[self._ages[-1]]))
@@ -0,0 +1,241 @@
+import os
+import time
+import logging
+import inspect
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from models.account import Account, STATUS_CODES, cents_to_decimal
+from services.account_index import name_key
+from services.banking_services import BankingService
+from utils import file_manager
+from utils.snapshot import SnapshotReader, is_snapshot
+
+
+class _MappedBook:
+    """
+    One published snapshot: the mapped reader plus column views and the
+    derived orderings, built on first use.
+    """
+
+    def __init__(self, reader: Optional[SnapshotReader], identity):
+        self.reader = reader
+        self.identity = identity
+        self._lock = threading.Lock()
+        self._by_number = None
+        self._by_balance = None
+        self._names = None
+        if reader is None:
+            empty = np.zeros(0, dtype=np.int64)
+            self.numbers = self.balances = self.ages = self.statuses = empty
+        else:
+            self.numbers = reader.column("account_number")
+            self.balances = reader.column("balance")
+            self.ages = reader.column("age")
+            self.statuses = reader.column("status")
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def index_of(self, account_number: int) -> Optional[int]:
+        with self._lock:
+            if self._by_number is None:
+                # Snapshots are usually already in account number order, in
+                # which case the mapped column is searched directly.
+                numbers = self.numbers
+                if len(numbers) < 2 or bool(np.all(numbers[1:] > numbers[:-1])):
+                    self._by_number = (numbers, None)
+                else:
+                    order = np.argsort(numbers, kind="stable")
+                    self._by_number = (numbers[order], order)
+        keys, order = self._by_number
+        i = int(np.searchsorted(keys, account_number))
+        if i < len(keys) and keys[i] == account_number:
+            return i if order is None else int(order[i])
+        return None
+
+    def balance_order(self) -> np.ndarray:
+        # Highest balance first; ties keep record (insertion) order.
+        with self._lock:
+            if self._by_balance is None:
+                self._by_balance = np.argsort(-self.balances, kind="stable")
+            return self._by_balance
+
+    def names(self) -> List[str]:
+        with self._lock:
+            if self._names is None:
+                self._names = [name_key(self.reader.name(i)) for i in range(len(self))]
+            return self._names
+
+    def account(self, index: int) -> Account:
+        return self.reader.account(index)
+
+
+class AccountView:
+    """
+    Read-only view of the account book over a memory-mapped binary snapshot
+    (accounts.snap, written by checkpoints with GDB_SNAPSHOT_FORMAT=binary),
+    for reporting processes that do not need a BankingService.
+
+    Opening a view parses nothing: balances, ages and statuses are NumPy
+    views into the mapping, so any number of processes share the snapshot
+    through the OS page cache, and Account objects are only built for the
+    accounts a query returns. Queries see the book as of the last
+    checkpoint; the journal tail is not applied.
+
+    The snapshot path is stat()ed at most every check_interval seconds; once
+    the writer has renamed a new snapshot over it, the next query maps the
+    new file. Queries already running keep the snapshot they started on.
+    Every snapshot is checked against its header checksum before it is
+    served; a new one that fails the check is skipped and the view keeps
+    the snapshot it has.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0):
+        self.path = path or file_manager.SNAPSHOT_FILE
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._book = None
+        self._checked = 0.0
+        # Identity of the last snapshot that failed verification, so it is
+        # not re-read (and reported) on every check.
+        self._rejected = None
+        self.refresh()
+
+    def _identity(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def refresh(self) -> bool:
+        """
+        Map the current snapshot if it changed since the last check.
+        Returns True if a new snapshot was mapped. Raises ValueError if the
+        first snapshot is not a valid binary snapshot.
+        """
+        with self._lock:
+            self._checked = time.monotonic()
+            identity = self._identity()
+            if self._book is not None and identity in (self._book.identity, self._rejected):
+                return False
+            reader = None
+            if identity is not None:
+                try:
+                    reader = self._open_verified()
+                except ValueError as e:
+                    if self._book is None:
+                        raise
+                    self._rejected = identity
+                    logging.error(f"{e}; still serving the previous snapshot.")
+                    return False
+            # The previous snapshot is not closed: queries still running on
+            # it keep it mapped until they finish and drop the reference.
+            self._book = _MappedBook(reader, identity)
+        return True
+
+    def _open_verified(self) -> SnapshotReader:
+        if not is_snapshot(self.path):
+            raise ValueError(f"{self.path} is not a binary account snapshot")
+        reader = SnapshotReader(self.path)
+        if not reader.verify():
+            reader.close()
+            raise ValueError(f"{self.path} failed checksum verification")
+        return reader
+
+    def _current(self) -> _MappedBook:
+        if time.monotonic() - self._checked >= self.check_interval:
+            self.refresh()
+        return self._book
+
+    def close(self) -> None:
+        with self._lock:
+            if self._book is not None and self._book.reader is not None:
+                self._book.reader.close()
+            self._book = None
+
+    def __enter__(self) -> "AccountView":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+    # --- Lookups ---
+    def get_account(self, account_number):
+        book = self._current()
+        index = book.index_of(int(account_number))
+        return None if index is None else book.account(index)
+
+    def search_by_account_number(self, account_number):
+        return self.get_account(account_number)
+
+    # Same checks as the service, on accounts read from the snapshot (not
+    # recorded in the service's metrics).
+    balance_inquiry = inspect.unwrap(BankingService.balance_inquiry)
+    verify_pin = inspect.unwrap(BankingService.verify_pin)
+    check_minimum_balance = inspect.unwrap(BankingService.check_minimum_balance)
+    check_daily_transaction_limit = inspect.unwrap(BankingService.check_daily_transaction_limit)
+    simple_interest = inspect.unwrap(BankingService.simple_interest)
+
+    def _search(self, match):
+        # Matches ordered by name, then record order (as AccountIndex does).
+        book = self._current()
+        names = book.names()
+        hits = sorted((name, i) for i, name in enumerate(names) if match(name))
+        return [book.account(i) for _, i in hits]
+
+    def search_by_name(self, name):
+        key = name_key(name)
+        book = self._current()
+        return [book.account(i) for i, name in enumerate(book.names()) if name == key]
+
+    def search_by_name_prefix(self, prefix):
+        prefix = name_key(prefix)
+        return self._search(lambda name: name.startswith(prefix))
+
+    def search_by_name_substring(self, text):
+        text = name_key(text)
+        return self._search(lambda name: text in name)
+
+    # --- Aggregates ---
+    def _with_status(self, status: str) -> List[Account]:
+        book = self._current()
+        return [book.account(int(i)) for i in np.flatnonzero(book.statuses == STATUS_CODES[status])]
+
+    def list_active_accounts(self):
+        return self._with_status("Active")
+
+    def list_closed_accounts(self):
+        return self._with_status("Inactive")
+
+    def count_active_accounts(self):
+        book = self._current()
+        return int(np.count_nonzero(book.statuses == STATUS_CODES["Active"]))
+
+    def top_n_accounts_by_balance(self, n):
+        book = self._current()
+        if n < 0:
+            n = max(0, len(book) + n)
+        return [book.account(int(i)) for i in book.balance_order()[:n]]
+
+    def average_balance(self):
+        book = self._current()
+        if not len(book):
+            return 0
+        places = int(book.reader.column("places").max())
+        total = cents_to_decimal(int(book.balances.sum()), places)
+        return total / len(book)
+
+    def youngest_account_holder(self):
+        book = self._current()
+        return book.account(int(np.argmin(book.ages))) if len(book) else None
+
+    def oldest_account_holder(self):
+        book = self._current()
+        return book.account(int(np.argmax(book.ages))) if len(book) else None
@@ -0,0 +1,181 @@
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Optional
+
+from services.banking_services import BankingService
+
+# Threads running BankingService calls, and how many calls may be queued or
+# running at once before callers have to wait for a slot.
+ASYNC_WORKERS = int(os.environ.get("GDB_ASYNC_WORKERS", "8"))
+ASYNC_MAX_PENDING = int(os.environ.get("GDB_ASYNC_MAX_PENDING", "256"))
+
+
+class AsyncBankingService:
+    """
+    asyncio front end for BankingService.
+
+    Each call runs the (thread-safe) synchronous service on a worker pool,
+    so file and database I/O never blocks the event loop, and concurrent
+    writers share group commits. At most max_pending calls are admitted at
+    a time; further callers wait for a slot, which pushes back on clients
+    instead of letting an unbounded backlog build up.
+    """
+
+    def __init__(self, service: Optional[BankingService] = None, workers: int = ASYNC_WORKERS,
+                 max_pending: int = ASYNC_MAX_PENDING):
+        self.service = service if service is not None else BankingService()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="gdb-async")
+        self._slots = asyncio.Semaphore(max(1, max_pending))
+        self.max_pending = max(1, max_pending)
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Calls admitted and not yet finished.
+        """
+        return self._pending
+
+    async def _call(self, method, *args, **kwargs):
+        async with self._slots:
+            self._pending += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, partial(method, *args, **kwargs))
+            finally:
+                self._pending -= 1
+
+    async def aclose(self) -> None:
+        """
+        Wait for running calls, then stop the worker pool and close the store.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        await loop.run_in_executor(None, self.service.store.close)
+
+    async def __aenter__(self) -> "AsyncBankingService":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    # --- Base Features ---
+    async def create_account(self, name, age, account_type, initial_deposit=0, pin=None):
+        return await self._call(self.service.create_account, name, age, account_type, initial_deposit, pin)
+
+    async def get_account(self, account_number):
+        return await self._call(self.service.get_account, account_number)
+
+    async def deposit(self, account_number, amount, pin=None):
+        return await self._call(self.service.deposit, account_number, amount, pin)
+
+    async def withdraw(self, account_number, amount, pin=None):
+        return await self._call(self.service.withdraw, account_number, amount, pin)
+
+    async def balance_inquiry(self, account_number, pin=None):
+        return await self._call(self.service.balance_inquiry, account_number, pin)
+
+    async def close_account(self, account_number, pin=None):
+        return await self._call(self.service.close_account, account_number, pin)
+
+    async def save_to_disk(self):
+        return await self._call(self.service.save_to_disk)
+
+    # --- Extended Features ---
+    async def search_by_name(self, name):
+        return await self._call(self.service.search_by_name, name)
+
+    async def search_by_name_prefix(self, prefix):
+        return await self._call(self.service.search_by_name_prefix, prefix)
+
+    async def search_by_name_substring(self, text):
+        return await self._call(self.service.search_by_name_substring, text)
+
+    async def search_by_account_number(self, account_number):
+        return await self._call(self.service.search_by_account_number, account_number)
+
+    async def list_active_accounts(self):
+        return await self._call(self.service.list_active_accounts)
+
+    async def list_closed_accounts(self):
+        return await self._call(self.service.list_closed_accounts)
+
+    async def reopen_closed_account(self, account_number):
+        return await self._call(self.service.reopen_closed_account, account_number)
+
+    async def rename_account_holder(self, account_number, new_name):
+        return await self._call(self.service.rename_account_holder, account_number, new_name)
+
+    async def delete_all_accounts(self):
+        return await self._call(self.service.delete_all_accounts)
+
+    async def count_active_accounts(self):
+        return await self._call(self.service.count_active_accounts)
+
+    async def write_transaction_log(self, account_number):
+        return await self._call(self.service.write_transaction_log, account_number)
+
+    async def transaction_history(self, account_number, start=None, end=None, page=None, page_size=50):
+        return await self._call(self.service.transaction_history, account_number, start, end, page, page_size)
+
+    async def iter_transaction_history(self, account_number, start=None, end=None, page_size=1000):
+        """
+        Async iterator over the account's full transaction history. Entries
+        are read page_size at a time on the worker pool, so a long history
+        is never loaded at once nor read on the event loop.
+        """
+        page_size = max(1, page_size)
+        entries = await self._call(self.service.iter_transaction_history, account_number, start, end)
+        while True:
+            page = await self._call(list, islice(entries, page_size))
+            for entry in page:
+                yield entry
+            if len(page) < page_size:
+                return
+
+    async def check_minimum_balance(self, account_number):
+        return await self._call(self.service.check_minimum_balance, account_number)
+
+    async def check_daily_transaction_limit(self, account_number):
+        return await self._call(self.service.check_daily_transaction_limit, account_number)
+
+    async def transfer_funds(self, from_acc_no, to_acc_no, amount, pin=None):
+        return await self._call(self.service.transfer_funds, from_acc_no, to_acc_no, amount, pin)
+
+    async def apply_batch(self, operations, atomic=False, check_pins=True):
+        return await self._call(self.service.apply_batch, operations, atomic, check_pins)
+
+    async def top_n_accounts_by_balance(self, n):
+        return await self._call(self.service.top_n_accounts_by_balance, n)
+
+    async def average_balance(self):
+        return await self._call(self.service.average_balance)
+
+    async def youngest_account_holder(self):
+        return await self._call(self.service.youngest_account_holder)
+
+    async def oldest_account_holder(self):
+        return await self._call(self.service.oldest_account_holder)
+
+    async def simple_interest(self, account_number, rate, years):
+        return await self._call(self.service.simple_interest, account_number, rate, years)
+
+    async def accrue_interest(self, days, method="simple", rates=None, post=True):
+        return await self._call(self.service.accrue_interest, days, method, rates, post)
+
+    async def export_accounts_to_file(self, progress=None, fmt="csv"):
+        return await self._call(self.service.export_accounts_to_file, progress, fmt)
+
+    async def import_accounts_from_file(self, progress=None, chunk_size=None, workers=None, duplicates=None,
+                                        errors=None, fmt="csv"):
+        return await self._call(self.service.import_accounts_from_file, progress, chunk_size, workers,
+                                duplicates, errors, fmt)
+
+    async def verify_pin(self, account_number, pin):
+        return await self._call(self.service.verify_pin, account_number, pin)
+
+    async def upgrade_account_type(self, account_number, new_type):
+        return await self._call(self.service.upgrade_account_type, account_number, new_type)
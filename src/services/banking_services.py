@@ -1,19 +1,98 @@
-from models.account import Account
-from utils.file_manager import load_accounts, save_accounts, log_transaction, export_accounts, import_accounts, write_transaction_log_file, read_transaction_history
-from decimal import Decimal
+import copy
+import time
+import logging
+import threading
+import uuid
+import numpy as np
+from models.account import Account, STATUS_CODES, cents_to_decimal
+from services.account_table import AccountTable
+from services.account_index import AccountIndex
+from services.interest_engine import InterestEngine
+from utils import file_manager, metrics
+from utils.storage import open_store
+from utils.locks import StripedLock
+from itertools import islice
 
+@metrics.instrument("service")
 class BankingService:
+    """
+    Banking operations over the account book. Safe to share between threads:
+    operations on an account hold its (striped) lock, transfers take both
+    locks in a fixed order, and the durability wait happens after the locks
+    are released so concurrent writers share group commits.
+    """
     START_ACCOUNT_NO = 1001
+    LOCK_STRIPES = 1024
+    # Result message (with ok None) when a change was applied but the store
+    # could not confirm it durable. It stays queued and is written by a
+    # later commit, so the outcome is unknown rather than failed.
+    PERSIST_UNCONFIRMED = "Applied, but not yet confirmed durable; it will be retried"
 
-    def __init__(self):
-        self.accounts = load_accounts()
+    def __init__(self, store=None):
+        self.store = store if store is not None else open_store()
+        self.accounts = self.store.load_accounts()
         if self.accounts:
             self.next_account_number = max(self.accounts.keys()) + 1
         else:
             self.next_account_number = BankingService.START_ACCOUNT_NO
+        self._locks = StripedLock(BankingService.LOCK_STRIPES)
+        self._allocator_lock = threading.Lock()
+        # Guards membership of self.accounts and the derived views.
+        self._views_lock = threading.RLock()
+        self._table = None
+        self._index = None
+
+    def _allocate_account_number(self):
+        with self._allocator_lock:
+            acc_no = self.next_account_number
+            self.next_account_number += 1
+            return acc_no
+
+    @property
+    def table(self):
+        """
+        Columnar copy of the accounts used by the analytics queries, built on
+        first use and kept current by _persist(). Use under _views_lock.
+        """
+        with self._views_lock:
+            if self._table is None:
+                self._table = AccountTable.from_accounts(self.accounts.values())
+            return self._table
+
+    @property
+    def index(self):
+        """
+        Name, status and type indexes, built on first use and kept current
+        by _persist(). Use under _views_lock.
+        """
+        with self._views_lock:
+            if self._index is None:
+                self._index = AccountIndex.from_accounts(self.accounts.values())
+            return self._index
+
+    def _track(self, acc):
+        # Bring the derived views that have been built up to date with acc.
+        with self._views_lock:
+            if self._table is not None:
+                self._table.update(acc)
+            if self._index is not None:
+                self._index.update(acc)
 
     def save_to_disk(self):
-        save_accounts(self.accounts)
+        self.store.save_accounts(self.accounts)
+
+    def _persist(self, acc, operation, amount=None, history=False):
+        """
+        Record a mutation of a single account in the store, together with
+        its transaction log entry, as one store transaction; history says
+        whether its recent history window changed. Callers wait for it with
+        store.sync() once they have released the account's lock, so no
+        other operation on its stripe waits for the disk as well.
+        """
+        with self.store.transaction():
+            self.store.log_transaction(acc.account_number, operation, amount, acc.balance)
+            self.store.save_account(acc, history)
+        self._track(acc)
 
     # --- Base Features ---
     def create_account(self, name, age, account_type, initial_deposit=0, pin=None):
@@ -27,43 +106,49 @@ class BankingService:
         min_req = Account.MIN_BALANCE[account_type]
         if float(initial_deposit) < min_req:
             return None, f"Initial deposit must be at least {min_req}"
-        acc_no = self.next_account_number
+        acc_no = self._allocate_account_number()
         acc = Account(acc_no, name, age, account_type, balance=float(initial_deposit), pin=pin)
-        self.accounts[acc_no] = acc
-        self.next_account_number += 1
-        log_transaction(acc_no, "CREATE", initial_deposit, acc.balance)
-        self.save_to_disk()
+        with self._locks.locked(acc_no):
+            with self._views_lock:
+                self.accounts[acc_no] = acc
+            self._persist(acc, "CREATE", initial_deposit, history=True)
+        if not self.store.sync():
+            return acc, BankingService.PERSIST_UNCONFIRMED
         return acc, "Account created successfully"
 
     def get_account(self, account_number):
         return self.accounts.get(int(account_number))
 
     def deposit(self, account_number, amount, pin=None):
-        acc = self.get_account(account_number)
-        if not acc:
-            return False, "Account not Found"
-        if not self.verify_pin(account_number, pin)[0]:
-            return False, "Invalid PIN"
-        if acc.status != "Active":
-            return False, "Account is not Active"
-        ok, msg = acc.deposit(amount)
-        if ok:
-            log_transaction(acc.account_number, "DEPOSIT", amount, acc.balance)
-            self.save_to_disk()
+        with self._locks.locked(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                return False, "Account not Found"
+            if not self.verify_pin(account_number, pin)[0]:
+                return False, "Invalid PIN"
+            if acc.status != "Active":
+                return False, "Account is not Active"
+            ok, msg = acc.deposit(amount)
+            if ok:
+                self._persist(acc, "DEPOSIT", amount, history=True)
+        if ok and not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
         return ok, msg
 
     def withdraw(self, account_number, amount, pin=None):
-        acc = self.get_account(account_number)
-        if not acc:
-            return False, "Account not Found"
-        if not self.verify_pin(account_number, pin)[0]:
-            return False, "Invalid PIN"
-        if acc.status != "Active":
-            return False, "Account is not Active"
-        ok, msg = acc.withdraw(amount)
-        if ok:
-            log_transaction(acc.account_number, "WITHDRAW", amount, acc.balance)
-            self.save_to_disk()
+        with self._locks.locked(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                return False, "Account not Found"
+            if not self.verify_pin(account_number, pin)[0]:
+                return False, "Invalid PIN"
+            if acc.status != "Active":
+                return False, "Account is not Active"
+            ok, msg = acc.withdraw(amount)
+            if ok:
+                self._persist(acc, "WITHDRAW", amount, history=True)
+        if ok and not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
         return ok, msg
 
     def balance_inquiry(self, account_number, pin=None):
@@ -75,72 +160,115 @@ class BankingService:
         return acc, f"Balance: {acc.balance:.2f}"
 
     def close_account(self, account_number, pin=None):
-        acc = self.get_account(account_number)
-        if not acc:
-            return False, "Account not Found"
-        if not self.verify_pin(account_number, pin)[0]:
-            return False, "Invalid PIN"
-        acc.status = "Inactive"
-        log_transaction(acc.account_number, "CLOSE", None, acc.balance)
-        self.save_to_disk()
+        with self._locks.locked(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                return False, "Account not Found"
+            if not self.verify_pin(account_number, pin)[0]:
+                return False, "Invalid PIN"
+            acc.status = "Inactive"
+            self._persist(acc, "CLOSE")
+        if not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
         return True, "Account closed successfully"
 
     # --- Extended Features ---
     def search_by_name(self, name):
-        name = name.strip().lower()
-        return [acc for acc in self.accounts.values() if acc.name.lower() == name]
+        with self._views_lock:
+            numbers = self.index.by_name(name)
+        return [self.accounts[k] for k in numbers]
+
+    def search_by_name_prefix(self, prefix):
+        with self._views_lock:
+            numbers = self.index.by_name_prefix(prefix)
+        return [self.accounts[k] for k in numbers]
+
+    def search_by_name_substring(self, text):
+        with self._views_lock:
+            numbers = self.index.by_name_substring(text)
+        return [self.accounts[k] for k in numbers]
 
     def search_by_account_number(self, account_number):
         return self.accounts.get(int(account_number))
 
     def list_active_accounts(self):
-        return [acc for acc in self.accounts.values() if acc.status == "Active"]
+        with self._views_lock:
+            numbers = self.index.with_status(STATUS_CODES["Active"])
+        return [self.accounts[k] for k in numbers]
 
     def list_closed_accounts(self):
-        return [acc for acc in self.accounts.values() if acc.status == "Inactive"]
+        with self._views_lock:
+            numbers = self.index.with_status(STATUS_CODES["Inactive"])
+        return [self.accounts[k] for k in numbers]
 
     def reopen_closed_account(self, account_number):
-        acc = self.get_account(account_number)
-        if not acc:
-            return False, "Account not Found"
-        if acc.status == "Active":
-            return False, "Account is already active"
-        acc.status = "Active"
-        log_transaction(acc.account_number, "REOPEN", None, acc.balance)
-        self.save_to_disk()
+        with self._locks.locked(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                return False, "Account not Found"
+            if acc.status == "Active":
+                return False, "Account is already active"
+            acc.status = "Active"
+            self._persist(acc, "REOPEN")
+        if not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
         return True, "Account reopened successfully"
 
     def rename_account_holder(self, account_number, new_name):
-        acc = self.get_account(account_number)
-        if not acc:
-            return False, "Account not Found"
-        if acc.status != "Active":
-            return False, "Account is not Active"
-        acc.name = new_name.strip()
-        log_transaction(acc.account_number, "RENAME", None, acc.balance)
-        self.save_to_disk()
+        with self._locks.locked(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                return False, "Account not Found"
+            if acc.status != "Active":
+                return False, "Account is not Active"
+            acc.name = new_name.strip()
+            self._persist(acc, "RENAME")
+        if not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
         return True, "Account holder renamed successfully"
 
     def delete_all_accounts(self):
-        self.accounts.clear()
+        with self._views_lock:
+            self.accounts.clear()
+            if self._table is not None:
+                self._table.clear()
+            if self._index is not None:
+                self._index.clear()
         self.save_to_disk()
         return True, "All accounts deleted"
 
     def count_active_accounts(self):
-        return len([acc for acc in self.accounts.values() if acc.status == "Active"])
+        with self._views_lock:
+            return self.index.count_status(STATUS_CODES["Active"])
 
     def write_transaction_log(self, account_number):
         acc = self.get_account(account_number)
         if not acc:
             return False, "Account not Found"
-        write_transaction_log_file(acc.account_number)
+        self.store.write_transaction_log_file(acc.account_number)
         return True, "Transaction log written."
 
-    def transaction_history(self, account_number):
+    def transaction_history(self, account_number, start=None, end=None, page=None, page_size=50):
+        """
+        Return the account's transaction log entries, oldest first. With page
+        set, only that page (0-based) of page_size entries is returned.
+        """
         acc = self.get_account(account_number)
         if not acc:
             return []
-        return read_transaction_history(acc.account_number)
+        if page is None:
+            return self.store.read_transaction_history(acc.account_number, start, end)
+        entries = self.store.iter_transaction_history(acc.account_number, start, end)
+        return list(islice(entries, page * page_size, (page + 1) * page_size))
+
+    def iter_transaction_history(self, account_number, start=None, end=None):
+        """
+        Stream the account's full transaction history without loading it at once.
+        """
+        acc = self.get_account(account_number)
+        if not acc:
+            return iter(())
+        return self.store.iter_transaction_history(acc.account_number, start, end)
 
     def check_minimum_balance(self, account_number):
         acc = self.get_account(account_number)
@@ -160,41 +288,176 @@ class BankingService:
         return True, "Within daily transaction limit."
 
     def transfer_funds(self, from_acc_no, to_acc_no, amount, pin=None):
-        from_acc = self.get_account(from_acc_no)
-        to_acc = self.get_account(to_acc_no)
-        if not from_acc or not to_acc:
-            return False, "One or both accounts not found"
-        if not self.verify_pin(from_acc_no, pin)[0]:
-            return False, "Invalid PIN"
-        if from_acc.status != "Active" or to_acc.status != "Active":
-            return False, "Both accounts must be active"
+        # StripedLock orders the two locks, so opposite transfers cannot deadlock.
+        with self._locks.locked(from_acc_no, to_acc_no):
+            from_acc = self.get_account(from_acc_no)
+            to_acc = self.get_account(to_acc_no)
+            if not from_acc or not to_acc:
+                return False, "One or both accounts not found"
+            if not self.verify_pin(from_acc_no, pin)[0]:
+                return False, "Invalid PIN"
+            if from_acc.status != "Active" or to_acc.status != "Active":
+                return False, "Both accounts must be active"
+            ok, msg = self._transfer_in_memory(from_acc, to_acc, amount)
+            if not ok:
+                return False, msg
+            self.store.save_transfer(uuid.uuid4().hex, from_acc, to_acc, amount)
+            # After save_transfer(): building a view may query the store,
+            # which must not happen inside its transaction.
+            self._track(from_acc)
+            self._track(to_acc)
+        if not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
+        return True, "Transfer successful"
+
+    @staticmethod
+    def _restore(acc, snapshot):
+        for slot in Account.__slots__:
+            setattr(acc, slot, getattr(snapshot, slot))
+
+    def _transfer_in_memory(self, from_acc, to_acc, amount):
+        """
+        Apply both legs of a transfer to the in-memory accounts, or neither:
+        if the deposit leg fails (e.g. on the daily limit) the withdrawal is
+        undone.
+        """
+        snapshots = [(from_acc, copy.copy(from_acc)), (to_acc, copy.copy(to_acc))]
         ok, msg = from_acc.withdraw(amount)
         if not ok:
             return False, msg
-        to_acc.deposit(amount)
-        log_transaction(from_acc.account_number, "TRANSFER_OUT", amount, from_acc.balance)
-        log_transaction(to_acc.account_number, "TRANSFER_IN", amount, to_acc.balance)
-        self.save_to_disk()
+        ok, msg = to_acc.deposit(amount)
+        if not ok:
+            for acc, snapshot in snapshots:
+                self._restore(acc, snapshot)
+            return False, msg
         return True, "Transfer successful"
 
+    def _apply_batch_operation(self, op, check_pins, lookup):
+        """
+        Apply one batch operation in memory. Returns (ok, message, entries),
+        entries being the (account, operation, amount, balance after) log
+        entries it produced. A failed operation leaves no change behind.
+        """
+        kind = op.get("op")
+        amount = op.get("amount")
+        acc = lookup(op.get("account"))
+        if kind in ("deposit", "withdraw"):
+            if not acc:
+                return False, "Account not Found", ()
+            if check_pins and (not op.get("pin") or str(acc.pin) != str(op.get("pin"))):
+                return False, "Invalid PIN", ()
+            if acc.status != "Active":
+                return False, "Account is not Active", ()
+            ok, msg = acc.deposit(amount) if kind == "deposit" else acc.withdraw(amount)
+            if not ok:
+                return False, msg, ()
+            return True, msg, [(acc, kind.upper(), amount, acc.balance)]
+        if kind == "transfer":
+            to_acc = lookup(op.get("to"))
+            if not acc or not to_acc:
+                return False, "One or both accounts not found", ()
+            if check_pins and (not op.get("pin") or str(acc.pin) != str(op.get("pin"))):
+                return False, "Invalid PIN", ()
+            if acc.status != "Active" or to_acc.status != "Active":
+                return False, "Both accounts must be active", ()
+            ok, msg = self._transfer_in_memory(acc, to_acc, amount)
+            if not ok:
+                return False, msg, ()
+            return True, "Transfer successful", [(acc, "TRANSFER_OUT", amount, acc.balance),
+                                                 (to_acc, "TRANSFER_IN", amount, to_acc.balance)]
+        return False, f"Unknown operation: {kind}", ()
+
+    def apply_batch(self, operations, atomic=False, check_pins=True):
+        """
+        Apply many deposits, withdrawals and transfers in one pass, e.g. for
+        payroll or settlement runs. Each operation is a dict:
+            {"op": "deposit" | "withdraw", "account": n, "amount": x, "pin": p}
+            {"op": "transfer", "account": from, "to": to, "amount": x, "pin": p}
+        Operations are validated against the same Account rules as single
+        calls and applied in order; "pin" is only required with check_pins.
+
+        With atomic set the batch is all-or-nothing: if any operation fails,
+        no operation is applied. Otherwise each operation succeeds or fails
+        on its own. Returns one (ok, message) tuple per operation. Touched
+        accounts are persisted once each, with a single durability wait.
+        """
+        operations = list(operations)
+        numbers = set()
+        for op in operations:
+            for key in ("account", "to"):
+                try:
+                    numbers.add(int(op[key]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+        results = []
+        entries = []
+        # Each account is resolved once per batch, so a lazy map evicting it
+        # mid-batch cannot hand out a second, stale copy.
+        resolved = {}
+
+        def lookup(account_number):
+            try:
+                account_number = int(account_number)
+            except (TypeError, ValueError):
+                return None
+            if account_number not in resolved:
+                resolved[account_number] = self.accounts.get(account_number)
+            return resolved[account_number]
+
+        with self._locks.locked(*numbers):
+            snapshots = {}
+            if atomic:
+                for number in numbers:
+                    acc = lookup(number)
+                    if acc:
+                        snapshots[number] = (acc, copy.copy(acc))
+            for op in operations:
+                ok, msg, op_entries = self._apply_batch_operation(op, check_pins, lookup)
+                results.append((ok, msg))
+                if not ok and atomic:
+                    for acc, snapshot in snapshots.values():
+                        self._restore(acc, snapshot)
+                    failed = len(results) - 1
+                    return [result if i == failed else (False, "Batch rolled back")
+                            for i, result in enumerate(results + [None] * (len(operations) - len(results)))]
+                entries.extend(op_entries)
+            if not entries:
+                return results
+            touched = {acc.account_number: acc for acc, _, _, _ in entries}
+            with self.store.transaction():
+                for acc, operation, amount, balance in entries:
+                    self.store.log_transaction(acc.account_number, operation, amount, balance)
+                for acc in touched.values():
+                    self.store.save_account(acc, history=True)
+            for acc in touched.values():
+                self._track(acc)
+        if not self.store.sync():
+            return [(None, BankingService.PERSIST_UNCONFIRMED) if ok else (ok, msg) for ok, msg in results]
+        return results
+
     def top_n_accounts_by_balance(self, n):
-        return sorted(self.accounts.values(), key=lambda acc: acc.balance, reverse=True)[:n]
+        with self._views_lock:
+            numbers = self.table.top_by_balance(n)
+        return [self.accounts[k] for k in numbers]
 
     def average_balance(self):
-        if not self.accounts:
-            return 0
-        total = sum(acc.balance for acc in self.accounts.values())
-        return total / len(self.accounts)
+        with self._views_lock:
+            if not self.accounts:
+                return 0
+            # Written like the Decimal sum of the balances, so the result
+            # has the same form as averaging the accounts one by one.
+            total = cents_to_decimal(self.table.total_balance_cents(), self.table.balance_places())
+            return total / len(self.table)
 
     def youngest_account_holder(self):
-        if not self.accounts:
-            return None
-        return min(self.accounts.values(), key=lambda acc: acc.age)
+        with self._views_lock:
+            account_number = self.table.youngest()
+        return None if account_number is None else self.accounts[account_number]
 
     def oldest_account_holder(self):
-        if not self.accounts:
-            return None
-        return max(self.accounts.values(), key=lambda acc: acc.age)
+        with self._views_lock:
+            account_number = self.table.oldest()
+        return None if account_number is None else self.accounts[account_number]
 
     def simple_interest(self, account_number, rate, years):
         from decimal import Decimal, InvalidOperation
@@ -210,17 +473,155 @@ class BankingService:
         interest = (principal * rate * years) / Decimal("100")
         return float(interest), f"Simple Interest for {years} years at {rate}%: {float(interest)}"
 
-    def export_accounts_to_file(self):
-        export_accounts(self.accounts)
+    def accrue_interest(self, days, method="simple", rates=None, post=True):
+        """
+        Compute interest for every account over days in one vectorized pass
+        (see InterestEngine; rates maps AccountType to an annual percentage)
+        and, with post set, credit it as bulk postings of
+        file_manager.POSTING_CHUNK_SIZE accounts each, in account number
+        order. Every posting is atomic on its own; every account lock is
+        held for the whole run.
+
+        The run's parameters and the last account it posted are stored with
+        each posting (see AccountStore.posting_run) until it finishes. After
+        a crash the same call resumes the run, crediting only the accounts
+        it had not reached; a run with other parameters is refused until
+        then. Returns (ok, message), the message reporting totals and
+        throughput.
+        """
+        try:
+            engine = InterestEngine(rates)
+        except ValueError as e:
+            return False, str(e)
+        with self._locks.locked_all():
+            started = time.perf_counter()
+            with self._views_lock:
+                table = self.table
+                try:
+                    interest = engine.compute(table.column("balance"), table.column("type"),
+                                              table.column("status"), days, method)
+                except ValueError as e:
+                    return False, str(e)
+                rows = np.flatnonzero(interest)
+                numbers = table.column("account_number")[rows]
+            amounts = interest[rows]
+            run = None
+            if post:
+                params = {"operation": "INTEREST", "days": int(days), "method": method,
+                          "rates": engine.rate_table()}
+                run = self.store.posting_run()
+                if run is not None and {k: run.get(k) for k in params} != params:
+                    return False, (f"An interrupted interest run ({run.get('days')} days, {run.get('method')}) "
+                                   "has to be finished first; run it again with the same parameters.")
+                order = np.argsort(numbers, kind="stable")
+                numbers, amounts = numbers[order], amounts[order]
+                if run is None:
+                    run = {"id": uuid.uuid4().hex, **params, "through": None}
+                    self.store.update_posting_run(run)
+                elif run["through"] is not None:
+                    # Accounts up to "through" were credited before the crash.
+                    pending = numbers > run["through"]
+                    numbers, amounts = numbers[pending], amounts[pending]
+            computed = time.perf_counter() - started
+            total = cents_to_decimal(int(amounts.sum()))
+            rate = len(interest) / computed if computed else float("inf")
+            summary = (f"{len(numbers)} of {len(interest)} accounts, total {total}. "
+                       f"Computed in {computed:.3f}s ({rate:,.0f} accounts/s)")
+            if not post:
+                return True, f"Interest due on {summary}."
+            chunk_size = max(1, file_manager.POSTING_CHUNK_SIZE)
+            for start in range(0, len(numbers), chunk_size):
+                # Only this chunk's accounts are referenced here, and the
+                # store may checkpoint after each posting, so a lazy map
+                # can evict them again before the next chunk.
+                entries = []
+                chunk = numbers[start:start + chunk_size].tolist()
+                for number, cents in zip(chunk, amounts[start:start + chunk_size].tolist()):
+                    acc = self.accounts[number]
+                    acc.post_interest(cents)
+                    entries.append((acc, cents_to_decimal(cents)))
+                run = {**run, "through": chunk[-1]}
+                self.store.save_posting(f"{run['id']}-{chunk[0]}", "INTEREST", entries, run)
+                for acc, _ in entries:
+                    self._track(acc)
+        if not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
+        self.store.finish_posting_run()
+        posted = time.perf_counter() - started - computed
+        logging.info(f"Interest run {run['id']} ({method}, {days} days): {summary}, posted in {posted:.3f}s.")
+        return True, f"Interest posted to {summary}, posted in {posted:.3f}s."
+
+    def export_accounts_to_file(self, progress=None, fmt="csv"):
+        if fmt not in file_manager.SNAPSHOT_FORMATS:
+            return False, f"Invalid export format. Choose from {list(file_manager.SNAPSHOT_FORMATS)}"
+        self.store.export_accounts(self.accounts, progress, fmt)
         return True, "Accounts exported successfully."
 
-    def import_accounts_from_file(self):
-        new_accounts = import_accounts()
-        for acc in new_accounts:
-            if acc.account_number not in self.accounts:
-                self.accounts[acc.account_number] = acc
-        self.save_to_disk()
-        return True, "Accounts imported successfully."
+    def import_accounts_from_file(self, progress=None, chunk_size=None, workers=None, duplicates=None,
+                                  errors=None, fmt="csv"):
+        """
+        Merge the interchange file (accounts_export.csv, or
+        accounts_export.snap with fmt="binary") into the book chunk by
+        chunk, in file order. Each chunk is durable before the next is read, so an
+        interrupted import resumes after the last committed chunk.
+
+        workers > 1 parses the file in a process pool (see
+        file_manager.IMPORT_WORKERS). duplicates says what a row whose
+        account number is already taken does: "keep" the existing account,
+        "replace" it, or count as an "error". progress, if given, is called
+        as progress(rows_read, bytes_read, total_bytes) after each chunk, and
+        errors as errors(chunk_number, [(row, message), ...]) for each chunk
+        with rejected rows.
+        """
+        duplicates = duplicates or file_manager.IMPORT_DUPLICATES
+        if duplicates not in file_manager.DUPLICATE_POLICIES:
+            return False, f"Invalid duplicate policy. Choose from {list(file_manager.DUPLICATE_POLICIES)}"
+        if fmt not in file_manager.SNAPSHOT_FORMATS:
+            return False, f"Invalid import format. Choose from {list(file_manager.SNAPSHOT_FORMATS)}"
+        added = replaced = kept = invalid = 0
+        with self.store.bulk_load():
+            for chunk in self.store.iter_import_chunks(chunk_size, workers, fmt):
+                rejected = list(chunk.errors)
+                merged = []
+                for acc, row in zip(chunk.accounts, chunk.row_numbers):
+                    number = acc.account_number
+                    with self._locks.locked(number), self._views_lock:
+                        if number in self.accounts:
+                            if duplicates == "keep":
+                                kept += 1
+                                continue
+                            if duplicates == "error":
+                                rejected.append((row, f"Duplicate account number {number}"))
+                                continue
+                            replaced += 1
+                        else:
+                            added += 1
+                        self.accounts[number] = acc
+                    merged.append(acc)
+                with self._allocator_lock:
+                    for acc in merged:
+                        self.next_account_number = max(self.next_account_number, acc.account_number + 1)
+                with self.store.transaction():
+                    for acc in merged:
+                        self.store.save_account(acc, history=True)
+                for acc in merged:
+                    self._track(acc)
+                if not self.store.sync():
+                    # Not recorded as committed, so the next import retries this chunk.
+                    return None, BankingService.PERSIST_UNCONFIRMED
+                self.store.commit_import_chunk(chunk)
+                invalid += len(rejected)
+                if rejected:
+                    rejected.sort()
+                    for row, error in rejected:
+                        logging.warning(f"Skipped import row {row}: {error}")
+                    if errors:
+                        errors(chunk.number, rejected)
+                if progress:
+                    progress(chunk.rows, chunk.end_offset, chunk.total_bytes)
+        self.store.finish_import()
+        return True, (f"Accounts imported successfully. {added} added, {replaced} replaced, "
+                      f"{kept} already present, {invalid} rows rejected.")
 
     def verify_pin(self, account_number, pin):
         acc = self.get_account(account_number)
@@ -231,14 +632,16 @@ class BankingService:
         return True, "PIN verified"
 
     def upgrade_account_type(self, account_number, new_type):
-        acc = self.get_account(account_number)
-        if not acc:
-            return False, "Account not Found"
-        new_type = new_type.title()
-        if new_type not in Account.MIN_BALANCE:
-            return False, "Invalid account type"
-        acc.account_type = new_type
-        log_transaction(acc.account_number, "UPGRADE_TYPE", None, acc.balance)
-        self.save_to_disk()
+        with self._locks.locked(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                return False, "Account not Found"
+            new_type = new_type.title()
+            if new_type not in Account.MIN_BALANCE:
+                return False, "Invalid account type"
+            acc.account_type = new_type
+            self._persist(acc, "UPGRADE_TYPE")
+        if not self.store.sync():
+            return None, BankingService.PERSIST_UNCONFIRMED
         return True, f"Account type upgraded to {new_type}"
     
\ No newline at end of file
@@ -0,0 +1,171 @@
+import csv
+import json
+import time
+import logging
+from contextlib import nullcontext
+from decimal import Decimal
+from typing import IO, Iterator, Tuple
+
+from services.banking_services import BankingService
+
+BATCH_FORMATS = ("jsonl", "csv")
+
+
+def read_commands(stream: IO[str], fmt: str = "jsonl") -> Iterator[Tuple[int, object]]:
+    """
+    Yield (line number, command) for each command in stream. A command is a
+    dict such as {"op": "deposit", "account": 1001, "amount": "50", "pin":
+    "1234"}; in CSV the header names the fields and empty cells are left
+    out. A line that cannot be parsed is yielded as the error message (a
+    str) instead, so the run can report it and go on.
+    """
+    if fmt not in BATCH_FORMATS:
+        raise ValueError(f"Invalid batch format. Choose from {list(BATCH_FORMATS)}")
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if k and v not in (None, "")}
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            command = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        yield number, command if isinstance(command, dict) else "Command must be a JSON object"
+
+
+def _account_summary(acc) -> dict:
+    d = acc.to_dict()
+    del d["pin"]
+    return d
+
+
+def _name(c) -> str:
+    name = c["name"]
+    if not isinstance(name, str):
+        raise TypeError("name must be a string")
+    return name
+
+
+def _create(bank, c):
+    acc, msg = bank.create_account(_name(c), c["age"], c["type"], c.get("deposit", 0), c.get("pin"))
+    ok = None if msg == BankingService.PERSIST_UNCONFIRMED else acc is not None
+    return ok, msg, {"account": acc.account_number} if acc else {}
+
+
+def _deposit(bank, c):
+    ok, msg = bank.deposit(c["account"], c["amount"], c.get("pin"))
+    return ok, msg, {}
+
+
+def _withdraw(bank, c):
+    ok, msg = bank.withdraw(c["account"], c["amount"], c.get("pin"))
+    return ok, msg, {}
+
+
+def _transfer(bank, c):
+    ok, msg = bank.transfer_funds(c["account"], c["to"], c["amount"], c.get("pin"))
+    return ok, msg, {}
+
+
+def _balance(bank, c):
+    acc, msg = bank.balance_inquiry(c["account"], c.get("pin"))
+    return bool(acc), msg, {"balance": acc.balance} if acc else {}
+
+
+def _get(bank, c):
+    acc = bank.get_account(c["account"])
+    if not acc:
+        return False, "Account not Found", {}
+    return True, "Account found", {"details": _account_summary(acc)}
+
+
+def _history(bank, c):
+    entries = bank.transaction_history(c["account"], c.get("start"), c.get("end"))
+    return True, f"{len(entries)} transactions", {"entries": entries}
+
+
+def _search(bank, c):
+    numbers = [acc.account_number for acc in bank.search_by_name(_name(c))]
+    return True, f"{len(numbers)} accounts found", {"accounts": numbers}
+
+
+# op -> handler(bank, command) returning (ok, message, extra result fields);
+# ok is None when the change was applied but not confirmed durable.
+COMMANDS = {
+    "create": _create,
+    "deposit": _deposit,
+    "withdraw": _withdraw,
+    "transfer": _transfer,
+    "balance": _balance,
+    "get": _get,
+    "history": _history,
+    "search": _search,
+}
+
+
+def run_command(bank: BankingService, command: dict) -> dict:
+    """
+    Execute one command and return its result record. Its "ok" is None
+    (null) when the outcome is unknown (see BankingService.PERSIST_UNCONFIRMED).
+    """
+    op = command.get("op")
+    handler = COMMANDS.get(op)
+    if handler is None:
+        return {"op": op, "ok": False, "message": f"Unknown operation: {op}"}
+    try:
+        ok, msg, extra = handler(bank, command)
+    except KeyError as e:
+        return {"op": op, "ok": False, "message": f"Missing field: {e.args[0]}"}
+    except (TypeError, ValueError) as e:
+        return {"op": op, "ok": False, "message": f"Invalid input: {e}"}
+    except Exception as e:
+        # Whatever else a command raises fails that command, not the run.
+        logging.error(f"Batch command {op} failed: {e!r}")
+        return {"op": op, "ok": False, "message": f"Command failed: {e}"}
+    return {"op": op, "ok": None if ok is None else bool(ok), "message": msg, **extra}
+
+
+def run_batch(bank: BankingService, commands, out: IO[str], durable: bool = False) -> Tuple[int, int]:
+    """
+    Execute (line, command) pairs from read_commands() in order against
+    bank and write one JSON result line per command to out. The run is made
+    durable once, at the end (see AccountStore.deferred_durability); with
+    durable set, every command is synced before the next one runs, as in
+    interactive use. Returns (commands, failed); commands whose outcome is
+    unknown are not counted as failed.
+    """
+    count = failed = 0
+    started = time.perf_counter()
+    try:
+        with (nullcontext() if durable else bank.store.deferred_durability()):
+            for line, command in commands:
+                if isinstance(command, str):
+                    result = {"op": None, "ok": False, "message": command}
+                else:
+                    result = run_command(bank, command)
+                count += 1
+                failed += result["ok"] is False
+                out.write(dumps({"line": line, **result}) + "\n")
+    finally:
+        out.flush()
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0
+    logging.info(f"Batch run: {count} commands, {failed} failed, in {elapsed:.2f}s ({rate:,.0f} commands/s).")
+    return count, failed
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(result: dict) -> str:
+    """
+    Serialize a result record as JSON, amounts (Decimals) as strings.
+    """
+    return json.dumps(result, default=_json_default)
@@ -0,0 +1,97 @@
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Optional
+
+import numpy as np
+
+from models.account import ACTIVE, AccountType, TYPE_CODES, TYPE_NAMES
+
+# Annual rates are held as integers in units of 1/RATE_SCALE percent, so
+# every step below is exact integer arithmetic on cents.
+RATE_SCALE = 10000
+DAYS_PER_YEAR = 365
+MAX_RATE = Decimal("100")
+MAX_DAYS = 3650
+
+DEFAULT_RATES = {
+    AccountType.SAVINGS: Decimal("4.0"),
+    AccountType.CURRENT: Decimal("0.5"),
+}
+
+
+def _rate_units(rate) -> int:
+    try:
+        d = Decimal(str(rate))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid interest rate: {rate}")
+    units = d * RATE_SCALE
+    if not d.is_finite() or d < 0 or d > MAX_RATE or units != units.to_integral_value():
+        raise ValueError(f"Invalid interest rate: {rate}")
+    return int(units)
+
+
+def mul_div_round(values: np.ndarray, factors: np.ndarray, divisor: int) -> np.ndarray:
+    """
+    values * factors / divisor rounded half to even, computed exactly in
+    int64: values is split into quotient and remainder by divisor first, so
+    no intermediate exceeds remainder * factor.
+    """
+    quotient, remainder = np.divmod(values, divisor)
+    extra, rest = np.divmod(remainder * factors, divisor)
+    result = quotient * factors + extra
+    twice = rest * 2
+    result += (twice > divisor) | ((twice == divisor) & (result % 2 == 1))
+    return result
+
+
+class InterestEngine:
+    """
+    Interest for a whole account book in one vectorized pass.
+
+    Works on the AccountTable columns (balance in cents, type and status
+    codes). Only active accounts with a positive balance earn interest, at
+    the annual rate of their type (percent, from rates keyed by
+    AccountType). "simple" interest is balance * rate * days / 365;
+    "daily" compounds once per day, each day's interest rounded to the cent
+    before it earns interest itself. All rounding is half to even.
+    """
+
+    METHODS = ("simple", "daily")
+
+    def __init__(self, rates: Optional[Dict[AccountType, Decimal]] = None, days_per_year: int = DAYS_PER_YEAR):
+        rates = DEFAULT_RATES if rates is None else rates
+        self.days_per_year = days_per_year
+        self._rates = np.zeros(len(TYPE_NAMES), dtype=np.int64)
+        for account_type, rate in rates.items():
+            name = account_type.value if isinstance(account_type, AccountType) else str(account_type).title()
+            if name not in TYPE_CODES:
+                raise ValueError(f"Invalid Account type: {account_type}")
+            self._rates[TYPE_CODES[name]] = _rate_units(rate)
+
+    def rate_table(self) -> Dict[str, int]:
+        """
+        Annual rate of each account type in units of 1/RATE_SCALE percent.
+        """
+        return {name: int(self._rates[code]) for name, code in TYPE_CODES.items()}
+
+    def compute(self, balances: np.ndarray, types: np.ndarray, statuses: np.ndarray, days: int,
+                method: str = "simple") -> np.ndarray:
+        """
+        Interest in cents for each row, 0 for rows that earn none.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Invalid interest method. Choose from {list(self.METHODS)}")
+        days = int(days)
+        if not 0 < days <= MAX_DAYS:
+            raise ValueError(f"Days must be between 1 and {MAX_DAYS}")
+        balances = balances.astype(np.int64)
+        rates = self._rates[types]
+        earning = (statuses == ACTIVE) & (balances > 0) & (rates > 0)
+        divisor = 100 * RATE_SCALE * self.days_per_year
+        if method == "simple":
+            interest = mul_div_round(balances, rates * days, divisor)
+        else:
+            grown = balances.copy()
+            for _ in range(days):
+                grown += mul_div_round(grown, rates, divisor)
+            interest = grown - balances
+        return np.where(earning, interest, 0)
@@ -1,10 +1,25 @@
+import io
 import csv
 import json
 from models.account import Account
+from utils import metrics
+from utils.transaction_log import SegmentedTransactionLog
+from utils.lazy_accounts import LazyAccountMap
+from utils.snapshot import HEADER, RECORD, SnapshotReader, SnapshotWriter, is_snapshot
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 import os
+import time
+import zlib
+import atexit
+import shutil
 import logging
-from typing import Dict, List, Optional
+import threading
+from collections import deque
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -15,188 +30,1500 @@ DATA_DIR = os.environ.get("GDB_DATA_DIR", os.path.join(BASE_DIR, "data"))
 ACCOUNT_FILE = os.path.join(DATA_DIR, "accounts.csv")
 TRANSACTIONS_FILE = os.path.join(DATA_DIR, "transactions.log")
 EXPORT_FILE = os.path.join(DATA_DIR, "accounts_export.csv")
+JOURNAL_FILE = os.path.join(DATA_DIR, "accounts.journal")
+SNAPSHOT_FILE = os.path.join(DATA_DIR, "accounts.snap")
+EXPORT_SNAPSHOT_FILE = os.path.join(DATA_DIR, "accounts_export.snap")
+SEGMENT_DIR = os.path.join(DATA_DIR, "transactions")
+
+# TRANSACTIONS_FILE is the active log segment. It is rotated into SEGMENT_DIR
+# once it reaches GDB_SEGMENT_BYTES, or at day change with GDB_SEGMENT_DAILY=1.
+# GDB_SEGMENT_COMPRESS=1 gzips closed segments during background compaction.
+SEGMENT_BYTES = int(os.environ.get("GDB_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+SEGMENT_DAILY = os.environ.get("GDB_SEGMENT_DAILY", "0") == "1"
+SEGMENT_COMPRESS = os.environ.get("GDB_SEGMENT_COMPRESS", "0") == "1"
+
+# Write-ahead journal: mutations append one record to JOURNAL_FILE and
+# accounts.csv is only rewritten as a checkpoint every CHECKPOINT_INTERVAL records.
+JOURNAL_ENABLED = os.environ.get("GDB_JOURNAL", "1") != "0"
+CHECKPOINT_INTERVAL = int(os.environ.get("GDB_CHECKPOINT_INTERVAL", "1000"))
+# Bulk postings (interest runs) are recorded GDB_POSTING_CHUNK_SIZE accounts
+# at a time, so checkpoints can run between chunks and a lazily loaded book
+# is never held in memory whole.
+POSTING_CHUNK_SIZE = int(os.environ.get("GDB_POSTING_CHUNK_SIZE", "1000"))
+# A chunked run keeps its parameters and the last account it posted in
+# POSTING_RUN_FILE until it finishes, so an interrupted run is resumed
+# rather than posted twice.
+POSTING_RUN_FILE = os.path.join(DATA_DIR, "posting_run.json")
+
+# Account snapshot format: "csv" (accounts.csv) or "binary" (accounts.snap,
+# see utils.snapshot). A data directory holding the other format is read as
+# is and converted by the next checkpoint.
+SNAPSHOT_FORMATS = ("csv", "binary")
+SNAPSHOT_FORMAT = os.environ.get("GDB_SNAPSHOT_FORMAT", "csv")
+
+# Lazy loading: with GDB_LAZY_LOAD=1 startup only indexes account_number -> row
+# offset; accounts are parsed on first access and kept in an LRU cache of
+# GDB_CACHE_SIZE entries. Modified accounts stay cached until the next checkpoint.
+LAZY_LOAD = os.environ.get("GDB_LAZY_LOAD", "0") == "1"
+CACHE_SIZE = int(os.environ.get("GDB_CACHE_SIZE", "10000"))
+
+# Group commit: log and journal appends are buffered and written out together.
+# GDB_DURABILITY is one of "none" (return without waiting), "flush" (wait for
+# the batch to reach the OS) or "fsync" (wait for it to reach the disk).
+DURABILITY_MODES = ("none", "flush", "fsync")
+FLUSH_INTERVAL = float(os.environ.get("GDB_FLUSH_INTERVAL", "0"))
+BATCH_SIZE = int(os.environ.get("GDB_BATCH_SIZE", "256"))
+DURABILITY = os.environ.get("GDB_DURABILITY", "flush")
+
+# Import and export stream the interchange file GDB_IMPORT_CHUNK_SIZE rows at
+# a time. An import records each committed chunk in IMPORT_PROGRESS_FILE, so
+# an interrupted import of the same file resumes after the last one.
+IMPORT_CHUNK_SIZE = int(os.environ.get("GDB_IMPORT_CHUNK_SIZE", "10000"))
+IMPORT_PROGRESS_FILE = EXPORT_FILE + ".progress"
+
+# Parallel import: with GDB_IMPORT_WORKERS > 1 the file is split into byte
+# ranges of about GDB_IMPORT_CHUNK_BYTES, aligned on record boundaries, and
+# parsed in a process pool. GDB_IMPORT_DUPLICATES decides what happens to a
+# row whose account number is already taken: "keep" the existing account,
+# "replace" it, or reject the row as an "error".
+IMPORT_WORKERS = int(os.environ.get("GDB_IMPORT_WORKERS", "1"))
+IMPORT_CHUNK_BYTES = int(os.environ.get("GDB_IMPORT_CHUNK_BYTES", str(4 * 1024 * 1024)))
+DUPLICATE_POLICIES = ("keep", "replace", "error")
+IMPORT_DUPLICATES = os.environ.get("GDB_IMPORT_DUPLICATES", "keep")
 
 CSV_HEADER = [
     "account_number", "name", "age", "balance", "account_type", "status", "pin",
     "transaction_history", "daily_total", "last_transaction_date"
 ]
 
+class GroupCommitter:
+    """
+    Buffers appends to one or more files and writes them out in batches.
+
+    Writers call append() and then wait_durable(). The first waiter becomes
+    the leader: it optionally lingers for flush_interval seconds (or until
+    batch_size records are pending), writes every pending record with one
+    write/flush/fsync per file, and wakes the other waiters whose records
+    went out in the same batch.
+    """
+
+    def __init__(self, flush_interval: float = 0.0, batch_size: int = 256, durability: str = "flush"):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Invalid durability mode: {durability}")
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.durability = durability
+        self._cond = threading.Condition()
+        self._pending = []
+        self._appended = 0
+        self._durable = 0
+        self._flushing = False
+        self._handles = {}
+        self._write_hooks = {}
+        self._offsets = {}
+        # (seq, path, lines) to queue once record seq is durable.
+        self._deferred = []
+
+    def add_write_hook(self, path: str, hook) -> None:
+        """
+        Call hook(entries) after each batch written to path, where entries is
+        a list of (byte_offset, line) for the lines just appended. If the hook
+        returns True the file has been moved away and is reopened on the
+        next write.
+        """
+        self._write_hooks[path] = hook
+
+    def append(self, path: str, line: str) -> int:
+        """
+        Queue a line for path. Returns the record's sequence number.
+        """
+        with self._cond:
+            self._pending.append((path, line))
+            self._appended += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+            return self._appended
+
+    def append_after(self, seq: int, path: str, lines: List[str]) -> None:
+        """
+        Queue lines for path once record seq is durable: now if it already
+        is, otherwise with the batch that makes it so.
+        """
+        with self._cond:
+            if self._durable >= seq:
+                self._queue_locked(path, lines)
+            else:
+                self._deferred.append((seq, path, lines))
+
+    def _queue_locked(self, path: str, lines: List[str]) -> None:
+        for line in lines:
+            self._pending.append((path, line))
+            self._appended += 1
+
+    def wait_durable(self, seq: Optional[int] = None, force: bool = False) -> bool:
+        """
+        Block until record seq (default: everything appended so far) has been
+        written according to the durability mode. In "none" mode this only
+        writes when a full batch is pending, unless force is set.
+        Returns False if the batch could not be written.
+        """
+        with self._cond:
+            if seq is None:
+                seq = self._appended
+            if self.durability == "none" and not force and len(self._pending) < self.batch_size:
+                return True
+            while self._durable < seq:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                if not self._flush_locked(linger=not force):
+                    return False
+            return True
+
+    def _flush_locked(self, linger: bool) -> bool:
+        self._flushing = True
+        try:
+            if linger and self.flush_interval > 0:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            batch, self._pending = self._pending, []
+            target = self._appended
+            self._cond.release()
+            try:
+                self._write(batch)
+            except Exception as e:
+                logging.error(f"Failed to commit batch: {e}")
+                self._cond.acquire()
+                # _write() cut every file back to where the batch started,
+                # so the retry writes each line exactly once.
+                self._pending[:0] = batch
+                return False
+            self._cond.acquire()
+            self._durable = target
+            if self._deferred:
+                ready = [d for d in self._deferred if d[0] <= target]
+                self._deferred = [d for d in self._deferred if d[0] > target]
+                for _, path, lines in ready:
+                    self._queue_locked(path, lines)
+            return True
+        finally:
+            self._flushing = False
+            self._cond.notify_all()
+
+    def _write(self, batch: list) -> None:
+        touched = {}
+        hooked = {}
+        written = {}
+        # Size of each file before this batch, to cut it back to if the
+        # batch cannot be written in full.
+        starts = {}
+        try:
+            for path, line in batch:
+                handle = self._handles.get(path)
+                if handle is None:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    handle = self._handles[path] = open(path, "a")
+                if path not in starts:
+                    # Earlier batches may still be buffered in "none" mode.
+                    handle.flush()
+                    starts[path] = os.fstat(handle.fileno()).st_size
+                    if path in self._write_hooks:
+                        self._offsets[path] = starts[path]
+                handle.write(line)
+                touched[path] = handle
+                size = len(line.encode())
+                written[path] = written.get(path, 0) + size
+                if path in self._write_hooks:
+                    offset = self._offsets[path]
+                    hooked.setdefault(path, []).append((offset, line))
+                    self._offsets[path] = offset + size
+            if self.durability != "none":
+                for handle in touched.values():
+                    handle.flush()
+                    if self.durability == "fsync":
+                        os.fsync(handle.fileno())
+        except Exception:
+            self._truncate(starts)
+            raise
+        for path, size in written.items():
+            metrics.bytes_written(path, size)
+        for path, entries in hooked.items():
+            try:
+                moved = self._write_hooks[path](entries)
+            except Exception as e:
+                # The lines are written; only the hook's bookkeeping is behind.
+                logging.error(f"Write hook for {path} failed: {e}")
+                continue
+            if moved:
+                self._handles.pop(path).close()
+
+    def _truncate(self, starts: Dict[str, int]) -> None:
+        # Drop whatever part of a failed batch reached each file, closing
+        # the handle first so no buffered remainder is written later.
+        for path, start in starts.items():
+            handle = self._handles.pop(path, None)
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+            try:
+                os.truncate(path, start)
+            except OSError as e:
+                logging.error(f"Failed to roll back partial batch in {path}: {e}")
+
+    def flush(self) -> bool:
+        """
+        Write everything pending regardless of durability mode.
+        """
+        ok = self.wait_durable(force=True)
+        if ok and self._pending:
+            # Deferred lines released by that batch went into the next one.
+            ok = self.wait_durable(force=True)
+        with self._cond:
+            for handle in self._handles.values():
+                handle.flush()
+        return ok
+
+    def close_path(self, path: str) -> None:
+        """
+        Flush pending records and close the handle for path, so the file can
+        be truncated or replaced.
+        """
+        self.flush()
+        with self._cond:
+            handle = self._handles.pop(path, None)
+            if handle is not None:
+                handle.close()
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+_committer = GroupCommitter(FLUSH_INTERVAL, BATCH_SIZE, DURABILITY)
+atexit.register(_committer.close)
+
+# Segmented transaction log; the active segment's per-account offset index
+# is maintained as batches are written.
+_tx_log = SegmentedTransactionLog(TRANSACTIONS_FILE, SEGMENT_DIR, SEGMENT_BYTES, SEGMENT_DAILY, SEGMENT_COMPRESS)
+_committer.add_write_hook(TRANSACTIONS_FILE, _tx_log.on_append)
+atexit.register(_tx_log.close)
+
+def configure_group_commit(flush_interval: Optional[float] = None, batch_size: Optional[int] = None,
+                           durability: Optional[str] = None) -> None:
+    """
+    Change the group-commit knobs at runtime. Pending records are flushed first.
+    """
+    if durability is not None and durability not in DURABILITY_MODES:
+        raise ValueError(f"Invalid durability mode: {durability}")
+    _committer.flush()
+    if flush_interval is not None:
+        _committer.flush_interval = flush_interval
+    if batch_size is not None:
+        _committer.batch_size = max(1, batch_size)
+    if durability is not None:
+        _committer.durability = durability
+
+def group_commit_durability() -> str:
+    """
+    The durability mode group commits currently use.
+    """
+    return _committer.durability
+
+@metrics.timed("io")
+def sync() -> bool:
+    """
+    Wait until every queued log and journal record is durable.
+    """
+    return _committer.wait_durable()
+
+# Number of journal records appended since the last checkpoint.
+_journal_records = 0
+_journal_lock = threading.Lock()
+
+def _account_to_row(acc: Account) -> list:
+    d = acc.to_dict()
+    return [
+        d["account_number"],
+        d["name"],
+        d["age"],
+        d["balance"],
+        d["account_type"],
+        d["status"],
+        d["pin"],
+        json.dumps(d.get("transaction_history", [])),
+        d.get("daily_total", 0.0),
+        d.get("last_transaction_date", "")
+    ]
+
+def _row_to_account(row: dict) -> Account:
+    transaction_history = []
+    if row.get("transaction_history"):
+        try:
+            transaction_history = json.loads(row["transaction_history"])
+        except Exception:
+            transaction_history = []
+    return Account(
+        account_number=row["account_number"],
+        name=row["name"],
+        age=row["age"],
+        account_type=row["account_type"],
+        balance=row["balance"],
+        status=row["status"],
+        pin=row["pin"] if row["pin"] else None,
+        transaction_history=transaction_history,
+        daily_total=row.get("daily_total", 0.0),
+        last_transaction_date=row.get("last_transaction_date", None)
+    )
+
+# Snapshots (accounts.csv) start with a fixed-width header holding the byte
+# length and CRC32 of the rest of the file; the header line is patched in
+# once the body has been streamed out. Files without it (written by older
+# versions) are accepted unverified.
+SNAPSHOT_MAGIC = "#gdb-snapshot"
+
+def _snapshot_header(length: int, crc: int) -> bytes:
+    return f"{SNAPSHOT_MAGIC} v1 length={length:016d} crc32={crc:08x}\n".encode()
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class _AtomicFile:
+    """
+    A binary file written into path.tmp and renamed over path on commit(),
+    so readers and crashes only ever see the old or the new file. With
+    keep_previous the replaced file is kept as path.prev to fall back on.
+    """
+
+    def __init__(self, path: str, keep_previous: bool = False):
+        self.path = path
+        self.tmp = path + ".tmp"
+        self.keep_previous = keep_previous
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._out = open(self.tmp, "wb")
+
+    def write(self, data: bytes) -> None:
+        self._out.write(data)
+
+    def tell(self) -> int:
+        return self._out.tell()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._out.seek(offset, whence)
+
+    def _finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """
+        Finish the temporary file (flush, fsync) without installing it.
+        """
+        if self._out.closed:
+            return
+        self._finish()
+        self._out.flush()
+        if DURABILITY != "none":
+            os.fsync(self._out.fileno())
+        self._out.close()
+
+    def commit(self) -> None:
+        self.close()
+        if self.keep_previous and os.path.exists(self.path):
+            # Keep the current file as .prev without a moment where path
+            # is missing: link it aside, then rename the new one over it.
+            prev = self.path + ".prev"
+            if os.path.exists(prev):
+                os.remove(prev)
+            try:
+                os.link(self.path, prev)
+            except OSError:
+                shutil.copyfile(self.path, prev)
+        size = os.path.getsize(self.tmp)
+        os.replace(self.tmp, self.path)
+        if DURABILITY != "none":
+            _fsync_dir(self.path)
+        metrics.bytes_written(self.path, size)
+
+    def abort(self) -> None:
+        self._out.close()
+        try:
+            os.remove(self.tmp)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+class _AtomicCsvWriter(_AtomicFile):
+    """
+    Atomic CSV file. With checksum the file gets a snapshot header and the
+    replaced file is kept as path.prev.
+    """
+
+    def __init__(self, path: str, checksum: bool = False):
+        super().__init__(path, keep_previous=checksum)
+        self.checksum = checksum
+        self._crc = 0
+        self._length = 0
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+        if checksum:
+            self._out.write(_snapshot_header(0, 0))
+
+    def _write(self, data: bytes) -> None:
+        self._crc = zlib.crc32(data, self._crc)
+        self._length += len(data)
+        self._out.write(data)
+
+    def _drain(self) -> None:
+        data = self._buf.getvalue()
+        if data:
+            self._write(data.encode())
+            self._buf.seek(0)
+            self._buf.truncate()
+
+    def tell(self) -> int:
+        """
+        Offset in the final file where the next record starts.
+        """
+        self._drain()
+        return self._out.tell()
+
+    def writerow(self, row) -> None:
+        self._writer.writerow(row)
+        if self._buf.tell() >= 64 * 1024:
+            self._drain()
+
+    def write_raw(self, record: bytes) -> None:
+        self._drain()
+        self._write(record)
+
+    def _finish(self) -> None:
+        self._drain()
+        if self.checksum:
+            self._out.seek(0)
+            self._out.write(_snapshot_header(self._length, self._crc))
+
+def _skip_snapshot_header(f) -> None:
+    """
+    Position f after the snapshot header line, if the file has one.
+    """
+    magic = SNAPSHOT_MAGIC.encode() if "b" in f.mode else SNAPSHOT_MAGIC
+    pos = f.tell()
+    if not f.readline().startswith(magic):
+        f.seek(pos)
+
+@metrics.timed("io")
+def verify_snapshot(path: str) -> Optional[bool]:
+    """
+    Check a snapshot (CSV or binary) against its header. Returns True or
+    False, or None when the file has no header (or does not exist) and
+    cannot be checked.
+    """
+    if is_snapshot(path):
+        try:
+            with closing(SnapshotReader(path)) as reader:
+                return reader.verify()
+        except ValueError:
+            return False
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        header = f.readline()
+        if not header.startswith(SNAPSHOT_MAGIC.encode()):
+            return None
+        try:
+            fields = dict(part.split("=", 1) for part in header.decode().split()[2:])
+            length, expected = int(fields["length"]), int(fields["crc32"], 16)
+        except (KeyError, ValueError, UnicodeDecodeError):
+            return False
+        crc, size = 0, 0
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+        return size == length and crc == expected
+
+def _snapshot_path() -> str:
+    """
+    The account file to load: the one in SNAPSHOT_FORMAT, or the other
+    format's file while a data directory is being converted.
+    """
+    preferred, other = ACCOUNT_FILE, SNAPSHOT_FILE
+    if SNAPSHOT_FORMAT == "binary":
+        preferred, other = other, preferred
+    if os.path.exists(preferred) or not os.path.exists(other):
+        return preferred
+    return other
+
+def _recover_snapshot(path: str) -> None:
+    """
+    Verify the account file before loading it. A damaged file is moved
+    aside as .corrupt and replaced by the previous snapshot, with the
+    journal tail replayed on top as usual.
+    """
+    if verify_snapshot(path) is not False:
+        return
+    name = os.path.basename(path)
+    prev = path + ".prev"
+    if not os.path.exists(prev) or verify_snapshot(prev) is False:
+        logging.error(f"{name} failed verification and no good previous snapshot exists.")
+        return
+    os.replace(path, path + ".corrupt")
+    shutil.copyfile(prev, path)
+    logging.error(f"{name} failed verification; restored the previous snapshot. "
+                  "Changes checkpointed since then are lost.")
+
+@metrics.timed("io")
 def save_accounts(accounts: Dict[int, Account]) -> bool:
     """
-    Save all accounts to the main CSV file. Returns True on success.
-    """
-    try:
-        os.makedirs(os.path.dirname(ACCOUNT_FILE), exist_ok=True)
-        with open(ACCOUNT_FILE, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(CSV_HEADER)
-            for acc in accounts.values():
-                d = acc.to_dict()
-                writer.writerow([
-                    d["account_number"],
-                    d["name"],
-                    d["age"],
-                    d["balance"],
-                    d["account_type"],
-                    d["status"],
-                    d["pin"],
-                    json.dumps(d.get("transaction_history", [])),
-                    d.get("daily_total", 0.0),
-                    d.get("last_transaction_date", "")
-                ])
-        logging.info("Accounts saved successfully.")
+    Save all accounts to the snapshot file in SNAPSHOT_FORMAT. Returns True
+    on success. This is the journal checkpoint: on success the journal is
+    truncated.
+    """
+    global _journal_records
+    try:
+        if SNAPSHOT_FORMAT == "binary":
+            _save_accounts_binary(accounts)
+        elif _owns(accounts):
+            _save_accounts_lazy(accounts)
+        else:
+            with _AtomicCsvWriter(ACCOUNT_FILE, checksum=True) as writer:
+                writer.writerow(CSV_HEADER)
+                for acc in _all_accounts(accounts):
+                    writer.writerow(_account_to_row(acc))
+        # The other format's file (if the directory was just converted) is
+        # now stale and must not be loaded again.
+        stale = ACCOUNT_FILE if SNAPSHOT_FORMAT == "binary" else SNAPSHOT_FILE
+        if os.path.exists(stale):
+            os.remove(stale)
+        _committer.close_path(JOURNAL_FILE)
+        if os.path.exists(JOURNAL_FILE):
+            open(JOURNAL_FILE, "w").close()
+        _journal_records = 0
+        if metrics.log_sampled():
+            logging.info("Accounts saved successfully.")
         return True
     except Exception as e:
         logging.error(f"Failed to save accounts: {e}")
         return False
 
+@metrics.timed("io")
 def load_accounts() -> Dict[int, Account]:
     """
-    Load all accounts from the main CSV file. Returns a dictionary of accounts.
+    Load all accounts from the snapshot file and replay the journal tail
+    on top of it. Returns a dictionary of accounts, or a LazyAccountMap
+    when lazy loading is enabled.
     """
+    path = _snapshot_path()
+    _recover_snapshot(path)
+    if LAZY_LOAD:
+        return load_accounts_lazy(path)
     accounts = {}
     try:
-        with open(ACCOUNT_FILE, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                transaction_history = []
-                if row.get("transaction_history"):
-                    try:
-                        transaction_history = json.loads(row["transaction_history"])
-                    except Exception:
-                        transaction_history = []
-                acc = Account(
-                    account_number=row["account_number"],
-                    name=row["name"],
-                    age=row["age"],
-                    account_type=row["account_type"],
-                    balance=row["balance"],
-                    status=row["status"],
-                    pin=row["pin"] if row["pin"] else None,
-                    transaction_history=transaction_history,
-                    daily_total=row.get("daily_total", 0.0),
-                    last_transaction_date=row.get("last_transaction_date", None)
-                )
-                accounts[acc.account_number] = acc
+        if is_snapshot(path):
+            with closing(SnapshotReader(path)) as reader:
+                for acc in reader:
+                    accounts[acc.account_number] = acc
+        else:
+            with open(path, "r") as f:
+                _skip_snapshot_header(f)
+                reader = csv.DictReader(f)
+                for row in reader:
+                    acc = _row_to_account(row)
+                    accounts[acc.account_number] = acc
+        metrics.rows_loaded("accounts", len(accounts))
         logging.info("Accounts loaded successfully.")
     except FileNotFoundError:
         logging.warning("Account file not found. Starting with empty accounts.")
     except Exception as e:
         logging.error(f"Failed to load accounts: {e}")
+    replay_journal(accounts)
+    return accounts
+
+def _has_accounts(path: str) -> bool:
+    # Reads no further than the first record. A file that cannot be read
+    # counts as holding accounts.
+    if is_snapshot(path):
+        try:
+            with closing(SnapshotReader(path)) as reader:
+                return len(reader) > 0
+        except ValueError:
+            return True
+    try:
+        with open(path, "r") as f:
+            _skip_snapshot_header(f)
+            return next(csv.DictReader(f), None) is not None
+    except FileNotFoundError:
+        return False
+    except (OSError, csv.Error, UnicodeDecodeError):
+        return True
+
+@metrics.timed("io")
+def is_empty() -> bool:
+    """
+    True if the data directory holds no accounts, no journal records and no
+    transaction log entries. Looks at the files only: nothing is loaded or
+    replayed.
+    """
+    if _has_accounts(ACCOUNT_FILE) or _has_accounts(SNAPSHOT_FILE):
+        return False
+    for path in (JOURNAL_FILE, TRANSACTIONS_FILE):
+        try:
+            if os.path.getsize(path):
+                return False
+        except FileNotFoundError:
+            pass
+    return not _tx_log.segments()
+
+def _iter_csv_records(f) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (byte_offset, raw_record) for each CSV record of a binary file,
+    joining physical lines while a quoted field is still open.
+    """
+    offset = f.tell()
+    start, pending = offset, b""
+    for raw in f:
+        if not pending:
+            start = offset
+        pending += raw
+        offset += len(raw)
+        if pending.count(b'"') % 2:
+            continue
+        yield start, pending
+        pending = b""
+
+class _CsvRowReader:
+    """
+    Random access to the records of the account CSV by byte offset.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header = list(CSV_HEADER)
+        self._handle = None
+        self._lock = threading.Lock()
+
+    def index(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (account_number, offset) for every record without parsing it.
+        """
+        self.close()
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            logging.warning("Account file not found. Starting with empty accounts.")
+            return
+        with f:
+            _skip_snapshot_header(f)
+            header = f.readline()
+            if not header:
+                return
+            self.header = next(csv.reader([header.decode()]))
+            for offset, raw in _iter_csv_records(f):
+                if raw.strip():
+                    yield int(raw[:raw.index(b",")]), offset
+
+    def read(self, offset: int) -> bytes:
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self.path, "rb")
+            self._handle.seek(offset)
+            return next(_iter_csv_records(self._handle))[1]
+
+    def fetch(self, offset: int) -> Account:
+        values = next(csv.reader([self.read(offset).decode()]))
+        return _row_to_account(dict(zip(self.header, values)))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+class _SnapshotRowReader:
+    """
+    Random access to the records of the binary snapshot by record index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def index(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (account_number, record index) for every record.
+        """
+        self.close()
+        with self._lock:
+            try:
+                self._reader = SnapshotReader(self.path)
+            except FileNotFoundError:
+                logging.warning("Account file not found. Starting with empty accounts.")
+                return iter(())
+            numbers = self._reader.column("account_number").tolist()
+        return zip(numbers, range(len(numbers)))
+
+    def fetch(self, index: int) -> Account:
+        with self._lock:
+            if self._reader is None:
+                self._reader = SnapshotReader(self.path)
+            return self._reader.account(index)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+_row_reader = _CsvRowReader(ACCOUNT_FILE)
+_snapshot_reader = _SnapshotRowReader(SNAPSHOT_FILE)
+# The reader behind the lazy account map, switched when a checkpoint
+# changes the snapshot format.
+_active_reader = _row_reader
+
+def _fetch_account(locator: int) -> Account:
+    metrics.rows_loaded("accounts", 1)
+    return _active_reader.fetch(locator)
+
+@metrics.timed("io")
+def load_accounts_lazy(path: Optional[str] = None, capacity: Optional[int] = None) -> LazyAccountMap:
+    """
+    Build an account_number -> locator index over the snapshot file and
+    return a LazyAccountMap over it. Accounts changed by the journal tail
+    are materialized and kept cached until the next checkpoint.
+    """
+    global _active_reader
+    path = path or _snapshot_path()
+    _active_reader = _snapshot_reader if is_snapshot(path) else _row_reader
+    accounts = LazyAccountMap(_active_reader.index(), _fetch_account, capacity or CACHE_SIZE)
+    logging.info(f"Indexed {len(accounts)} accounts for lazy loading.")
+    replay_journal(accounts)
     return accounts
 
+def _swap_lazy_snapshot(accounts: LazyAccountMap, out: _AtomicFile, reader, entries) -> None:
+    global _active_reader
+    with accounts.lock:
+        # No fetch may run between the file swap and the new locators.
+        _row_reader.close()
+        _snapshot_reader.close()
+        out.commit()
+        _row_reader.header = list(CSV_HEADER)
+        _active_reader = reader
+        accounts.rebind(entries)
+        accounts.mark_clean()
+
+def _save_accounts_lazy(accounts: LazyAccountMap) -> None:
+    # Cached accounts are serialized; the rest are copied as raw records
+    # from the current file, so a checkpoint never parses untouched rows.
+    same_layout = _active_reader is _row_reader and _row_reader.header == CSV_HEADER
+    entries = []
+    writer = _AtomicCsvWriter(ACCOUNT_FILE, checksum=True)
+    try:
+        writer.writerow(CSV_HEADER)
+        for account_number in accounts:
+            acc = accounts.cached(account_number)
+            entries.append((account_number, writer.tell()))
+            if acc is None and same_layout:
+                writer.write_raw(_row_reader.read(accounts.locator(account_number)))
+                continue
+            if acc is None:
+                acc = _active_reader.fetch(accounts.locator(account_number))
+            writer.writerow(_account_to_row(acc))
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    _swap_lazy_snapshot(accounts, writer, _row_reader, entries)
+
+def _owns(accounts: Dict[int, Account]) -> bool:
+    # A lazy map built by load_accounts_lazy(): its locators point into our
+    # snapshot, so checkpoints may copy its uncached accounts from there.
+    return isinstance(accounts, LazyAccountMap) and accounts.fetches_with(_fetch_account)
+
+def _all_accounts(accounts: Dict[int, Account]) -> Iterator[Account]:
+    if isinstance(accounts, LazyAccountMap):
+        # Another store's map: fetched one by one through its own store.
+        return iter(accounts.values())
+    # A snapshot, as other threads may add accounts meanwhile.
+    return iter(list(accounts.values()))
+
+def _save_accounts_binary(accounts: Dict[int, Account]) -> None:
+    lazy = _owns(accounts)
+    entries = []
+    out = _AtomicFile(SNAPSHOT_FILE, keep_previous=True)
+    try:
+        writer = SnapshotWriter(out)
+        if lazy:
+            for account_number in accounts:
+                acc = accounts.cached(account_number)
+                if acc is None:
+                    acc = _active_reader.fetch(accounts.locator(account_number))
+                entries.append((account_number, writer.count))
+                writer.add(acc)
+        else:
+            for acc in _all_accounts(accounts):
+                writer.add(acc)
+        writer.finish()
+        out.close()
+    except BaseException:
+        out.abort()
+        raise
+    if lazy:
+        _swap_lazy_snapshot(accounts, out, _snapshot_reader, entries)
+    else:
+        out.commit()
+
+def journal_records() -> int:
+    """
+    Number of journal records appended since the last checkpoint, a bulk
+    posting counting once per account it touched.
+    """
+    return _journal_records
+
+@metrics.timed("io")
+def journal_account(acc: Account, history: bool = False) -> int:
+    """
+    Queue one record with the current state of an account for the journal.
+    The account's recent history window is included only if history is set.
+    The record is durable once sync() returns. Returns the number of records
+    appended since the last checkpoint.
+    """
+    global _journal_records
+    d = acc.to_dict()
+    window = d.pop("transaction_history")
+    record = {"op": "put", "account": d}
+    if history:
+        record["history"] = window
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with _journal_lock:
+        _committer.append(JOURNAL_FILE, line)
+        _journal_records += 1
+        return _journal_records
+
+def _journal_entries(op: str, txid: str, accounts: List[Account], lines: List[str], weight: int = 1,
+                     run: Optional[dict] = None) -> int:
+    # One record holding the states of several accounts and their log
+    # lines; the lines are only queued once the record is durable.
+    global _journal_records
+    states, windows = [], []
+    for acc in accounts:
+        d = acc.to_dict()
+        windows.append(d.pop("transaction_history"))
+        states.append(d)
+    record = {"op": op, "txid": txid, "accounts": states, "history": windows, "log": lines}
+    if run is not None:
+        record["run"] = run
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with _journal_lock:
+        seq = _committer.append(JOURNAL_FILE, line)
+        _journal_records += weight
+        records = _journal_records
+    if not _committer.wait_durable(seq):
+        # The record stays queued; its lines follow once a retry writes it,
+        # and never before (replay_journal() would re-append them otherwise).
+        logging.warning(f"Journal record {txid} is not durable yet; its log entries are deferred.")
+    _committer.append_after(seq, TRANSACTIONS_FILE, [entry + "\n" for entry in lines])
+    return records
+
+@metrics.timed("io")
+def journal_transfer(txid: str, from_acc: Account, to_acc: Account, amount) -> int:
+    """
+    Journal a completed transfer as one record holding both account states
+    and both transaction log entries, then queue the log entries (tagged
+    with txid as a sixth field). The record is the commit point: the log
+    entries are only queued once it is durable, and replay_journal()
+    re-appends any that were lost. Returns the number of records appended
+    since the last checkpoint.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    lines = [
+        f"{timestamp} | {from_acc.account_number} | TRANSFER_OUT | {amount} | {from_acc.balance} | {txid}",
+        f"{timestamp} | {to_acc.account_number} | TRANSFER_IN | {amount} | {to_acc.balance} | {txid}",
+    ]
+    return _journal_entries("transfer", txid, [from_acc, to_acc], lines)
+
+@metrics.timed("io")
+def journal_posting(txid: str, operation: str, entries: List[Tuple[Account, object]],
+                    run: Optional[dict] = None) -> int:
+    """
+    Journal a bulk posting (such as an interest run) of (account, amount)
+    entries as a single record, like journal_transfer(): the record is the
+    commit point and the log entries, tagged with txid, are queued once it
+    is durable. run, the state of the chunked run the posting belongs to
+    (see save_posting_run), is kept in the record so replay_journal() can
+    restore it. The record counts once per account towards the checkpoint
+    interval. Returns that count since the last checkpoint.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    lines = [f"{timestamp} | {acc.account_number} | {operation} | {amount} | {acc.balance} | {txid}"
+             for acc, amount in entries]
+    return _journal_entries("post", txid, [acc for acc, _ in entries], lines, weight=len(entries), run=run)
+
+@metrics.timed("io")
+def replay_journal(accounts: Dict[int, Account]) -> int:
+    """
+    Apply journal records written since the last checkpoint to accounts.
+    A torn final record (crash mid-append) is ignored. Returns the number
+    of records replayed.
+    """
+    global _journal_records
+    replayed = 0
+    weight = 0
+    transfers = []
+    runs = {}
+    try:
+        with open(JOURNAL_FILE, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logging.warning("Ignoring torn journal record.")
+                    break
+                if record["op"] in ("transfer", "post"):
+                    for d, window in zip(record["accounts"], record["history"]):
+                        _apply_journal_record(accounts, {"op": "put", "account": d, "history": window})
+                    transfers.append(record)
+                    if "run" in record:
+                        runs[record["run"]["id"]] = record["run"]
+                    # Postings count once per account, as when written.
+                    weight += len(record["accounts"]) if record["op"] == "post" else 1
+                else:
+                    _apply_journal_record(accounts, record)
+                    weight += 1
+                replayed += 1
+        _recover_transfer_entries(transfers)
+        _recover_posting_run(runs)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.error(f"Failed to replay journal: {e}")
+    if replayed:
+        metrics.rows_loaded("journal", replayed)
+        logging.info(f"Replayed {replayed} journal records.")
+    _journal_records = weight
+    return replayed
+
+def _recover_transfer_entries(transfers: List[dict]) -> None:
+    # A crash after a transfer record became durable may have lost its
+    # transaction log entries; append those that are missing.
+    missing = []
+    for record in transfers:
+        for entry in record["log"]:
+            account_number = int(entry.split(" | ", 2)[1])
+            if entry not in iter_transaction_history(account_number, start=entry[:19]):
+                missing.append(entry)
+    if missing:
+        append_transaction_lines(missing)
+        sync()
+        logging.warning(f"Recovered {len(missing)} transaction log entries of interrupted transfers and postings.")
+
+def _recover_posting_run(runs: Dict[str, dict]) -> None:
+    # A crash after a posting record became durable may have lost the
+    # progress update that followed it; the record carries the same state.
+    state = posting_run()
+    if state is not None and runs.get(state["id"], state) != state:
+        save_posting_run(runs[state["id"]])
+        logging.warning(f"Recovered the progress of interrupted posting run {state['id']}.")
+
+def _apply_journal_record(accounts: Dict[int, Account], record: dict) -> None:
+    if record["op"] != "put":
+        return
+    d = record["account"]
+    acc_no = int(d["account_number"])
+    acc = accounts.get(acc_no)
+    if acc is None:
+        acc = _row_to_account({**d, "transaction_history": ""})
+        accounts[acc_no] = acc
+    else:
+        acc.name = d["name"]
+        acc.age = int(d["age"])
+        acc.account_type = d["account_type"]
+        acc.balance = Decimal(str(d["balance"]))
+        acc.status = d["status"]
+        acc.pin = d["pin"] if d["pin"] else None
+        acc.daily_total = Decimal(str(d["daily_total"]))
+        acc.last_transaction_date = d["last_transaction_date"]
+    if "history" in record:
+        # Replacing the whole window keeps replay idempotent if a checkpoint
+        # already contains some of these entries.
+        acc.transaction_history = record["history"]
+    if isinstance(accounts, LazyAccountMap):
+        # Not in the checkpoint yet: keep it cached until the next one.
+        accounts.mark_dirty(acc)
+
+@metrics.timed("io")
 def log_transaction(account_number: int, operation: str, amount: Optional[float], balance_after: float) -> None:
     """
-    Append a transaction entry to the transactions log file.
+    Queue a transaction entry for the transactions log file. The entry is
+    durable once sync() returns.
     """
     try:
-        os.makedirs(os.path.dirname(TRANSACTIONS_FILE), exist_ok=True)
-        with open(TRANSACTIONS_FILE, "a") as f:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"{timestamp} | {account_number} | {operation} | {amount} | {balance_after}\n")
-        logging.info(f"Transaction logged for account {account_number}.")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        _committer.append(TRANSACTIONS_FILE, f"{timestamp} | {account_number} | {operation} | {amount} | {balance_after}\n")
+        if metrics.log_sampled():
+            logging.info(f"Transaction logged for account {account_number}.")
     except Exception as e:
         logging.error(f"Failed to log transaction: {e}")
 
-def export_accounts(accounts: Dict[int, Account]) -> bool:
+@metrics.timed("io")
+def append_transaction_lines(lines) -> None:
+    """
+    Queue pre-formatted transaction log lines (for example during a storage
+    migration). They are durable once sync() returns.
+    """
+    for line in lines:
+        _committer.append(TRANSACTIONS_FILE, line if line.endswith("\n") else line + "\n")
+
+def iter_transaction_log():
+    """
+    Yield every transaction log line across all segments, oldest first.
+    """
+    _committer.flush()
+    return _tx_log.iter_all()
+
+def _write_account_file(path: str, accounts: Iterator[Account], fmt: str,
+                        progress: Optional[Callable[[int, int], None]] = None, total: int = 0,
+                        checksum: bool = False) -> int:
+    """
+    Atomically write accounts to path as CSV or a binary snapshot. Returns
+    the number written. checksum adds the snapshot header to a CSV file
+    (binary snapshots always carry their own).
+    """
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Invalid account file format: {fmt}")
+    written = 0
+    with (_AtomicFile(path) if fmt == "binary" else _AtomicCsvWriter(path, checksum)) as out:
+        if fmt == "binary":
+            writer = SnapshotWriter(out)
+            write = writer.add
+        else:
+            out.writerow(CSV_HEADER)
+            write = lambda acc: out.writerow(_account_to_row(acc))
+        for acc in accounts:
+            write(acc)
+            written += 1
+            if progress and written % IMPORT_CHUNK_SIZE == 0:
+                progress(written, total)
+        if fmt == "binary":
+            writer.finish()
+    if progress:
+        progress(written, total)
+    return written
+
+@metrics.timed("io")
+def write_snapshot(accounts: Iterator[Account]) -> int:
     """
-    Export all accounts to a CSV file (accounts_export.csv) in the data directory.
+    Stream accounts into a new snapshot file in SNAPSHOT_FORMAT without
+    holding the whole book in memory, for tools that generate or rewrite
+    data directories. The journal is left alone, so use it only on a
+    directory without a journal tail. Returns the number written.
+    """
+    path = SNAPSHOT_FILE if SNAPSHOT_FORMAT == "binary" else ACCOUNT_FILE
+    return _write_account_file(path, accounts, SNAPSHOT_FORMAT, checksum=True)
+
+def export_path(fmt: str = "csv") -> str:
+    """
+    The interchange file for fmt: accounts_export.csv or accounts_export.snap.
+    """
+    return EXPORT_SNAPSHOT_FILE if fmt == "binary" else EXPORT_FILE
+
+@metrics.timed("io")
+def export_accounts(accounts: Dict[int, Account],
+                    progress: Optional[Callable[[int, int], None]] = None, fmt: str = "csv") -> bool:
+    """
+    Export all accounts to the interchange file in the data directory:
+    accounts_export.csv, or accounts_export.snap with fmt="binary".
+    Accounts are streamed out one at a time; progress, if given, is called
+    as progress(rows_written, total_rows) every IMPORT_CHUNK_SIZE rows.
     Returns True on success.
     """
     try:
-        os.makedirs(os.path.dirname(EXPORT_FILE), exist_ok=True)
-        with open(EXPORT_FILE, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(CSV_HEADER)
-            for acc in accounts.values():
-                d = acc.to_dict()
-                writer.writerow([
-                    d["account_number"],
-                    d["name"],
-                    d["age"],
-                    d["balance"],
-                    d["account_type"],
-                    d["status"],
-                    d["pin"],
-                    json.dumps(d.get("transaction_history", [])),
-                    d.get("daily_total", 0.0),
-                    d.get("last_transaction_date", "")
-                ])
-        logging.info("Accounts exported successfully.")
+        # Only the keys are snapshotted; a lazy map materializes each
+        # account through its bounded cache as it is written.
+        numbers = list(accounts)
+        current = (accounts.get(n) for n in numbers)
+        written = _write_account_file(export_path(fmt), (acc for acc in current if acc is not None),
+                                      fmt, progress, len(numbers))
+        logging.info(f"Exported {written} accounts.")
         return True
     except Exception as e:
         logging.error(f"Failed to export accounts: {e}")
         return False
 
-def import_accounts() -> List[Account]:
+@metrics.timed("io")
+def convert_accounts_file(source: str, target: str, fmt: str = "csv") -> int:
     """
-    Import accounts from accounts_export.csv and return a list of Account objects.
+    Convert an account file, CSV or binary snapshot (told apart by content),
+    into fmt at target. Rows that fail to parse are logged and skipped.
+    Returns the number of accounts written.
+    """
+    def accounts() -> Iterator[Account]:
+        for chunk in iter_import_chunks(source, resume=False, workers=1):
+            for row, error in chunk.errors:
+                logging.warning(f"Skipped row {row}: {error}")
+            yield from chunk.accounts
+    return _write_account_file(target, accounts(), fmt)
+
+class ImportChunk(NamedTuple):
+    """
+    One chunk of the interchange file: the valid accounts it holds with the
+    record number of each, the rejected rows as (record number, error)
+    pairs, and where the next chunk starts.
+    """
+    number: int
+    accounts: List[Account]
+    row_numbers: List[int]
+    errors: List[Tuple[int, str]]
+    rows: int
+    end_offset: int
+    total_bytes: int
+    path: str
+
+def _import_source(path: str) -> dict:
+    st = os.stat(path)
+    return {"path": os.path.abspath(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+@metrics.timed("io")
+def import_progress(path: str = EXPORT_FILE) -> Optional[dict]:
+    """
+    Resume point of an interrupted import of path ({"chunks", "rows",
+    "offset"}), or None when there is nothing to resume.
     """
-    accounts = []
     try:
-        with open(EXPORT_FILE, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                transaction_history = []
-                if row.get("transaction_history"):
-                    try:
-                        transaction_history = json.loads(row["transaction_history"])
-                    except Exception:
-                        transaction_history = []
-                acc = Account(
-                    account_number=row["account_number"],
-                    name=row["name"],
-                    age=row["age"],
-                    account_type=row["account_type"],
-                    balance=row["balance"],
-                    status=row["status"],
-                    pin=row["pin"] if row["pin"] else None,
-                    transaction_history=transaction_history,
-                    daily_total=row.get("daily_total", 0.0),
-                    last_transaction_date=row.get("last_transaction_date", None)
-                )
-                accounts.append(acc)
-        logging.info("Accounts imported successfully.")
+        with open(IMPORT_PROGRESS_FILE, "r") as f:
+            state = json.load(f)
+        if state.get("source") == _import_source(path):
+            return state
+    except (OSError, ValueError):
+        pass
+    return None
+
+@metrics.timed("io")
+def save_import_progress(chunk: ImportChunk) -> None:
+    """
+    Record that every chunk of its file up to and including chunk has been
+    committed.
+    """
+    state = {"source": _import_source(chunk.path), "chunks": chunk.number + 1,
+             "rows": chunk.rows, "offset": chunk.end_offset}
+    tmp = IMPORT_PROGRESS_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        if DURABILITY != "none":
+            os.fsync(f.fileno())
+    os.replace(tmp, IMPORT_PROGRESS_FILE)
+
+@metrics.timed("io")
+def clear_import_progress() -> None:
+    try:
+        os.remove(IMPORT_PROGRESS_FILE)
+    except FileNotFoundError:
+        pass
+
+@metrics.timed("io")
+def posting_run() -> Optional[dict]:
+    """
+    State of the unfinished chunked posting run, or None when there is none.
+    """
+    try:
+        with open(POSTING_RUN_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+@metrics.timed("io")
+def save_posting_run(run: dict) -> None:
+    """
+    Record the state of a chunked posting run: its id, its parameters and
+    the last account number it has posted ("through").
+    """
+    tmp = POSTING_RUN_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(run, f)
+        f.flush()
+        if DURABILITY != "none":
+            os.fsync(f.fileno())
+    os.replace(tmp, POSTING_RUN_FILE)
+
+@metrics.timed("io")
+def clear_posting_run() -> None:
+    try:
+        os.remove(POSTING_RUN_FILE)
+    except FileNotFoundError:
+        pass
+
+def _import_error(e: Exception) -> str:
+    # Decimal's conversion errors carry no readable message.
+    return "Invalid number" if isinstance(e, InvalidOperation) else str(e)
+
+def _parse_record(header: List[str], raw: bytes) -> Account:
+    values = next(csv.reader([raw.decode()]))
+    return _row_to_account(dict(zip(header, values)))
+
+def _parse_import_range(path: str, header: List[str], start: int, end: int):
+    """
+    Parse the records starting in [start, end) of path. Runs in a worker
+    process; record numbers are relative to the range.
+    """
+    accounts, row_numbers, errors = [], [], []
+    rows = 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        for offset, raw in _iter_csv_records(f):
+            if offset >= end:
+                break
+            if not raw.strip():
+                continue
+            rows += 1
+            try:
+                accounts.append(_parse_record(header, raw))
+                row_numbers.append(rows)
+            except Exception as e:
+                errors.append((rows, _import_error(e)))
+    return accounts, row_numbers, errors, rows
+
+def _split_csv_ranges(f, start: int, size: int, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """
+    Cut [start, size) into ranges of about chunk_bytes that each begin at a
+    record boundary. A newline only ends a record when the quotes seen
+    since start are balanced, so quoted multi-line fields stay whole.
+    """
+    bounds = [start]
+    pos, quotes = start, 0
+    f.seek(start)
+    for target in range(start + chunk_bytes, size, chunk_bytes):
+        if target <= pos:
+            continue
+        while pos < target:
+            block = f.read(min(1024 * 1024, target - pos))
+            quotes += block.count(b'"')
+            pos += len(block)
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            quotes += line.count(b'"')
+            pos += len(line)
+            if quotes % 2 == 0:
+                break
+        if pos >= size:
+            break
+        bounds.append(pos)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+def _iter_import_chunks_parallel(path: str, header: List[str], start: int, total: int, number: int,
+                                 rows: int, workers: int, chunk_bytes: int) -> Iterator[ImportChunk]:
+    with open(path, "rb") as f:
+        ranges = _split_csv_ranges(f, start, total, chunk_bytes)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A bounded window of ranges in flight, consumed in file order, so
+        # memory stays flat and the merge order never depends on timing.
+        ranges = iter(ranges)
+        pending = deque((end, pool.submit(_parse_import_range, path, header, begin, end))
+                        for begin, end in islice(ranges, workers * 2))
+        while pending:
+            end, future = pending.popleft()
+            accounts, row_numbers, errors, count = future.result()
+            for begin, next_end in islice(ranges, 1):
+                pending.append((next_end, pool.submit(_parse_import_range, path, header, begin, next_end)))
+            yield ImportChunk(number, accounts, [rows + n for n in row_numbers],
+                              [(rows + n, error) for n, error in errors], rows + count, end, total, path)
+            number += 1
+            rows += count
+
+def _iter_snapshot_chunks(path: str, chunk_size: int, resume: bool) -> Iterator[ImportChunk]:
+    # A snapshot that fails its checksum is rejected as a whole.
+    with closing(SnapshotReader(path)) as reader:
+        if not reader.verify():
+            logging.error(f"{os.path.basename(path)} failed verification. No accounts imported.")
+            return
+        total = os.path.getsize(path)
+        number, start = 0, 0
+        state = import_progress(path) if resume else None
+        if state:
+            number, start = state["chunks"], state["rows"]
+            logging.info(f"Resuming import after chunk {number} ({start} rows).")
+        for first in range(start, len(reader), chunk_size):
+            end = min(first + chunk_size, len(reader))
+            accounts, row_numbers, errors = [], [], []
+            for index in range(first, end):
+                try:
+                    accounts.append(reader.account(index))
+                    row_numbers.append(index + 1)
+                except Exception as e:
+                    errors.append((index + 1, _import_error(e)))
+            yield ImportChunk(number, accounts, row_numbers, errors, end,
+                              HEADER.size + end * RECORD.size, total, path)
+            number += 1
+
+def iter_import_chunks(path: str = EXPORT_FILE, chunk_size: Optional[int] = None,
+                       resume: bool = True, workers: Optional[int] = None) -> Iterator[ImportChunk]:
+    """
+    Stream the interchange file as validated chunks of chunk_size rows.
+    Rows that fail to parse are reported in the chunk's errors instead of
+    aborting the import. With resume, chunks an interrupted import already
+    committed (see save_import_progress) are skipped without being read.
+    With workers > 1 chunks are byte ranges parsed in a process pool; they
+    are still yielded in file order. A binary snapshot is read directly.
+    """
+    for chunk in _iter_import_chunks(path, chunk_size, resume, workers):
+        metrics.rows_loaded("import", len(chunk.accounts))
+        yield chunk
+
+def _iter_import_chunks(path: str, chunk_size: Optional[int], resume: bool,
+                        workers: Optional[int]) -> Iterator[ImportChunk]:
+    chunk_size = max(1, chunk_size or IMPORT_CHUNK_SIZE)
+    workers = IMPORT_WORKERS if workers is None else workers
+    if is_snapshot(path):
+        yield from _iter_snapshot_chunks(path, chunk_size, resume)
+        return
+    try:
+        f = open(path, "rb")
     except FileNotFoundError:
         logging.warning("Export file not found. No accounts imported.")
-    except Exception as e:
-        logging.error(f"Failed to import accounts: {e}")
+        return
+    with f:
+        total = os.fstat(f.fileno()).st_size
+        _skip_snapshot_header(f)
+        header_line = f.readline()
+        if not header_line.strip():
+            return
+        header = next(csv.reader([header_line.decode()]))
+        number, rows = 0, 0
+        state = import_progress(path) if resume else None
+        if state:
+            number, rows = state["chunks"], state["rows"]
+            f.seek(state["offset"])
+            logging.info(f"Resuming import after chunk {number} ({rows} rows).")
+        if workers > 1:
+            yield from _iter_import_chunks_parallel(path, header, f.tell(), total, number, rows,
+                                                    workers, max(1, IMPORT_CHUNK_BYTES))
+            return
+        accounts, row_numbers, errors = [], [], []
+        for offset, raw in _iter_csv_records(f):
+            if not raw.strip():
+                continue
+            rows += 1
+            try:
+                accounts.append(_parse_record(header, raw))
+                row_numbers.append(rows)
+            except Exception as e:
+                errors.append((rows, _import_error(e)))
+            if len(accounts) + len(errors) >= chunk_size:
+                yield ImportChunk(number, accounts, row_numbers, errors, rows, offset + len(raw), total, path)
+                number += 1
+                accounts, row_numbers, errors = [], [], []
+        if accounts or errors:
+            yield ImportChunk(number, accounts, row_numbers, errors, rows, total, total, path)
+
+@metrics.timed("io")
+def import_accounts(path: str = EXPORT_FILE) -> List[Account]:
+    """
+    Import accounts from accounts_export.csv (or another account file, CSV
+    or binary) and return a list of Account objects.
+    """
+    accounts = []
+    for chunk in iter_import_chunks(path, resume=False):
+        accounts.extend(chunk.accounts)
+        for row, error in chunk.errors:
+            logging.error(f"Failed to import row {row}: {error}")
+    logging.info("Accounts imported successfully.")
     return accounts
 
+@metrics.timed("io")
 def write_transaction_log_file(account_number: int) -> bool:
     """
     Write all transactions for a given account number to a separate log file.
-    Returns True on success.
+    Only log segments containing the account are read, and the active
+    segment is read through its offset index. Returns True on success.
     """
     log_file = os.path.join(os.path.dirname(TRANSACTIONS_FILE), f"transactions_{account_number}.log")
-    try:
-        with open(TRANSACTIONS_FILE, "r") as src, open(log_file, "w") as dst:
-            for line in src:
-                if f"| {account_number} |" in line:
-                    dst.write(line)
-        logging.info(f"Transaction log file written for account {account_number}.")
-        return True
-    except FileNotFoundError:
+    _committer.flush()
+    if not os.path.exists(TRANSACTIONS_FILE) and not _tx_log.segments():
         logging.warning("Main transactions file not found.")
         return False
+    try:
+        with open(log_file, "w") as dst:
+            dst.writelines(_tx_log.iter_entries(account_number))
+        if metrics.log_sampled():
+            logging.info(f"Transaction log file written for account {account_number}.")
+        return True
     except Exception as e:
         logging.error(f"Failed to write transaction log file: {e}")
         return False
 
-def read_transaction_history(account_number: int) -> List[str]:
+def iter_transaction_history(account_number: int, start: Optional[str] = None,
+                             end: Optional[str] = None) -> Iterator[str]:
     """
-    Read all transactions for a given account number from the main log file.
-    Returns a list of transaction strings.
+    Stream the transactions of one account from the transaction log, oldest
+    first, optionally limited to timestamps between start and end
+    ("YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS").
+    """
+    _committer.flush()
+    for line in _tx_log.iter_entries(account_number, start, end):
+        yield line.strip()
+
+@metrics.timed("io")
+def read_transaction_history(account_number: int, start: Optional[str] = None,
+                             end: Optional[str] = None) -> List[str]:
+    """
+    Read all transactions for a given account number from the transaction
+    log, optionally limited to timestamps between start and end
+    ("YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS"). Returns a list of transaction strings.
     """
     history = []
-    try:
-        with open(TRANSACTIONS_FILE, "r") as f:
-            for line in f:
-                if f"| {account_number} |" in line:
-                    history.append(line.strip())
-        logging.info(f"Transaction history read for account {account_number}.")
-    except FileNotFoundError:
+    _committer.flush()
+    if not os.path.exists(TRANSACTIONS_FILE) and not _tx_log.segments():
         logging.warning("Main transactions file not found.")
+        return history
+    try:
+        history = list(iter_transaction_history(account_number, start, end))
+        metrics.rows_loaded("transactions", len(history))
+        if metrics.log_sampled():
+            logging.info(f"Transaction history read for account {account_number}.")
     except Exception as e:
         logging.error(f"Failed to read transaction history: {e}")
-    return history
\ No newline at end of file
+    return history
+
+@metrics.timed("io")
+def rebuild_transaction_index() -> None:
+    """
+    Rebuild the per-account index of the active log segment from a full scan.
+    """
+    _committer.flush()
+    _tx_log.rebuild_index()
+
+@metrics.timed("io")
+def compact_transaction_log() -> int:
+    """
+    Merge (and optionally compress) closed transaction log segments.
+    Returns the number of segments written.
+    """
+    return _tx_log.compact()
@@ -0,0 +1,198 @@
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from models.account import Account
+
+
+class LazyAccountMap(MutableMapping):
+    """
+    Dict-like account book that materializes Account objects on first access.
+
+    Startup only builds a compact account_number -> locator index (a file
+    offset or row id, whatever fetch() understands), held in flat arrays.
+    Materialized accounts live in a bounded LRU cache. Accounts marked
+    dirty are pinned in the cache until the store has written them back
+    (mark_clean()), so an eviction never loses an unsaved change.
+
+    All operations hold lock, which the store also takes while it swaps the
+    backing file, so a fetch never reads a stale locator.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, int]], fetch: Callable[[int], Account], capacity: int = 10000):
+        self._fetch = fetch
+        self.capacity = max(1, capacity)
+        self._cache: "OrderedDict[int, Account]" = OrderedDict()
+        self._dirty = set()
+        self.lock = threading.RLock()
+        self._reindex(entries)
+
+    def _reindex(self, entries: Iterable[Tuple[int, int]]) -> None:
+        # File order is kept for iteration; a sorted copy serves lookups.
+        self._order = array("q")
+        locators = array("q")
+        for account_number, locator in entries:
+            self._order.append(account_number)
+            locators.append(locator)
+        pairs = sorted(zip(self._order, locators))
+        self._sorted_keys = array("q", (k for k, _ in pairs))
+        self._sorted_locators = array("q", (loc for _, loc in pairs))
+        # Accounts added since the index was built, in insertion order,
+        # with their locator once the store has written them.
+        self._added: Dict[int, Optional[int]] = {}
+        self._removed = set()
+
+    def rebind(self, entries: Iterable[Tuple[int, int]]) -> None:
+        """
+        Replace the locator index, e.g. after the backing file was rewritten.
+        Cached accounts are kept, as are additions and removals the new
+        index does not reflect yet (made while the file was being written).
+        """
+        with self.lock:
+            added, removed = self._added, self._removed
+            self._reindex(entries)
+            for account_number in added:
+                if self.locator(account_number) is None:
+                    self._added[account_number] = None
+                    self._dirty.add(account_number)
+            self._removed = {k for k in removed if self.locator(k) is not None}
+
+    def fetches_with(self, fetch: Callable[[int], Account]) -> bool:
+        """
+        True if this map materializes accounts through fetch, i.e. its
+        locators belong to the store that fetch reads from.
+        """
+        return self._fetch == fetch
+
+    def locator(self, account_number: int) -> Optional[int]:
+        with self.lock:
+            if account_number in self._removed:
+                return None
+            keys = self._sorted_keys
+            i = bisect_left(keys, account_number)
+            if i < len(keys) and keys[i] == account_number:
+                return self._sorted_locators[i]
+            return None
+
+    def cached(self, account_number: int) -> Optional[Account]:
+        with self.lock:
+            return self._cache.get(account_number)
+
+    def __contains__(self, account_number) -> bool:
+        try:
+            account_number = int(account_number)
+        except (TypeError, ValueError):
+            return False
+        with self.lock:
+            return account_number in self._added or self.locator(account_number) is not None
+
+    def __getitem__(self, account_number: int) -> Account:
+        with self.lock:
+            acc = self._cache.get(account_number)
+            if acc is not None:
+                self._cache.move_to_end(account_number)
+                return acc
+            if account_number in self._added:
+                locator = self._added[account_number]
+            else:
+                locator = self.locator(account_number)
+            if locator is None:
+                raise KeyError(account_number)
+            acc = self._fetch(locator)
+            self._cache[account_number] = acc
+            self._evict()
+            return acc
+
+    def get(self, account_number, default=None):
+        try:
+            return self[account_number]
+        except KeyError:
+            return default
+
+    def __setitem__(self, account_number: int, acc: Account) -> None:
+        with self.lock:
+            if account_number in self._removed:
+                # Re-adding a deleted account: its old locator is stale.
+                self._removed.discard(account_number)
+                self._added[account_number] = None
+            elif self.locator(account_number) is None:
+                self._added[account_number] = None
+            self._cache[account_number] = acc
+            self._dirty.add(account_number)
+            self._evict()
+
+    def __delitem__(self, account_number: int) -> None:
+        with self.lock:
+            if account_number not in self:
+                raise KeyError(account_number)
+            if account_number in self._added:
+                del self._added[account_number]
+            else:
+                self._removed.add(account_number)
+            self._cache.pop(account_number, None)
+            self._dirty.discard(account_number)
+
+    def __iter__(self) -> Iterator[int]:
+        with self.lock:
+            order, removed, added = self._order, set(self._removed), list(self._added)
+        for account_number in order:
+            if account_number not in removed:
+                yield account_number
+        yield from added
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._order) - len(self._removed) + len(self._added)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._cache.clear()
+            self._dirty.clear()
+            self._reindex(())
+
+    def mark_dirty(self, acc: Account) -> None:
+        """
+        Pin a modified account in the cache until it is written back.
+        """
+        with self.lock:
+            self._cache[acc.account_number] = acc
+            self._cache.move_to_end(acc.account_number)
+            self._dirty.add(acc.account_number)
+
+    def mark_clean(self, account_number: Optional[int] = None, locator: Optional[int] = None) -> None:
+        """
+        Unpin one account, or all of them, after a write-back. An account
+        added since the index was built stays pinned unless its new locator
+        is given.
+        """
+        with self.lock:
+            if account_number is None:
+                self._dirty = {k for k in self._dirty if self._added.get(k, 0) is None}
+            elif account_number in self._added:
+                if locator is not None:
+                    self._added[account_number] = locator
+                if self._added[account_number] is not None:
+                    self._dirty.discard(account_number)
+            else:
+                self._dirty.discard(account_number)
+            self._evict()
+
+    def dirty_count(self) -> int:
+        with self.lock:
+            return len(self._dirty)
+
+    def _evict(self) -> None:
+        excess = len(self._cache) - self.capacity
+        if excess <= 0:
+            return
+        victims = []
+        for account_number in self._cache:
+            if len(victims) >= excess:
+                break
+            if account_number not in self._dirty:
+                victims.append(account_number)
+        for account_number in victims:
+            del self._cache[account_number]
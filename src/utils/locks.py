@@ -0,0 +1,87 @@
+import threading
+from contextlib import contextmanager
+from typing import List
+
+
+class StripedLock:
+    """
+    Fixed pool of re-entrant locks addressed by integer key (an account
+    number). Keys map onto stripes, so memory stays bounded however many
+    accounts exist, while operations on different accounts rarely contend.
+    """
+
+    def __init__(self, stripes: int = 1024):
+        self._locks: List[threading.RLock] = [threading.RLock() for _ in range(max(1, stripes))]
+
+    def _stripes(self, keys) -> List[int]:
+        # Deterministic order (and no duplicates), so two callers locking
+        # the same keys can never deadlock.
+        return sorted({int(key) % len(self._locks) for key in keys})
+
+    @contextmanager
+    def locked(self, *keys):
+        """
+        Hold the locks of every given key.
+        """
+        acquired = []
+        try:
+            for stripe in self._stripes(keys):
+                self._locks[stripe].acquire()
+                acquired.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._locks[stripe].release()
+
+    @contextmanager
+    def locked_all(self):
+        """
+        Hold every stripe, and so the lock of every key.
+        """
+        with self.locked(*range(len(self._locks))):
+            yield
+
+
+class ReadWriteLock:
+    """
+    Many shared holders or one exclusive holder. A waiting exclusive holder
+    blocks new shared holders, so a checkpoint cannot be starved by a steady
+    stream of writers.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._waiting = 0
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            while self._exclusive or self._waiting:
+                self._cond.wait()
+            self._shared += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._shared -= 1
+                if not self._shared:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._exclusive or self._shared:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive = False
+                self._cond.notify_all()
@@ -0,0 +1,328 @@
+"""
+In-process metrics: counters and latency histograms, rendered as
+Prometheus text or JSON.
+
+BankingService operations and file_manager I/O calls are timed by the
+instrument()/timed() decorators; file_manager also counts bytes written per
+file and rows loaded per source. Recording is a lock and a bisect per call,
+cheap enough to leave on. Only the outermost instrumented call of a kind is
+recorded, so an operation that calls other operations is counted once.
+
+Metrics families:
+    gdb_service_seconds{operation}          histogram of BankingService calls
+    gdb_service_failures_total{operation}   calls that returned a failure
+    gdb_service_errors_total{operation}     calls that raised
+    gdb_io_seconds{operation}               histogram of file_manager calls
+    gdb_io_failures_total{operation}, gdb_io_errors_total{operation}
+    gdb_bytes_written_total{file}
+    gdb_rows_loaded_total{source}
+"""
+import os
+import json
+import time
+import atexit
+import random
+import inspect
+import logging
+import threading
+import functools
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple
+
+# GDB_METRICS=0 leaves operations and I/O calls untimed (counters still count).
+# With GDB_METRICS_FILE set, the registry is dumped there at exit and every
+# GDB_METRICS_INTERVAL seconds (0: only at exit); a .json file gets JSON,
+# anything else Prometheus text.
+ENABLED = os.environ.get("GDB_METRICS", "1") != "0"
+METRICS_FILE = os.environ.get("GDB_METRICS_FILE")
+METRICS_INTERVAL = float(os.environ.get("GDB_METRICS_INTERVAL", "60"))
+
+# Fraction of per-operation INFO log lines ("Transaction logged for account
+# ...") that are emitted: 0 (default) drops them, 1 keeps them all.
+LOG_SAMPLE = float(os.environ.get("GDB_LOG_SAMPLE", "0"))
+
+# Latency bucket upper bounds in seconds.
+BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def log_sampled() -> bool:
+    """
+    Whether to emit the current hot-path INFO log line.
+    """
+    return LOG_SAMPLE >= 1 or (LOG_SAMPLE > 0 and random.random() < LOG_SAMPLE)
+
+
+class Counter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        # One count per bucket plus the +Inf overflow bucket.
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+
+    def cumulative(self) -> list:
+        with self._lock:
+            counts = list(self.counts)
+        total, result = 0, []
+        for n in counts:
+            total += n
+            result.append(total)
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding quantile q (None if empty, inf if
+        it lies beyond the last bucket).
+        """
+        cumulative = self.cumulative()
+        if not cumulative[-1]:
+            return None
+        rank = q * cumulative[-1]
+        for bound, total in zip(self.buckets + (float("inf"),), cumulative):
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class _Family:
+    def __init__(self, kind: str, help_text: str):
+        self.kind = kind
+        self.help = help_text
+        self.children: Dict[Tuple[Tuple[str, str], ...], object] = {}
+
+
+_families: Dict[str, _Family] = {}
+_registry_lock = threading.Lock()
+
+
+def _get(kind: str, name: str, help_text: str, labels: dict):
+    key = tuple(sorted(labels.items()))
+    with _registry_lock:
+        family = _families.get(name)
+        if family is None:
+            family = _families[name] = _Family(kind, help_text)
+        elif family.kind != kind:
+            raise ValueError(f"Metric {name} is a {family.kind}, not a {kind}")
+        metric = family.children.get(key)
+        if metric is None:
+            metric = family.children[key] = Counter() if kind == "counter" else Histogram()
+        return metric
+
+
+def counter(name: str, help_text: str = "", **labels) -> Counter:
+    """
+    The counter name{labels}, created on first use.
+    """
+    return _get("counter", name, help_text, labels)
+
+
+def histogram(name: str, help_text: str = "", **labels) -> Histogram:
+    """
+    The latency histogram name{labels}, created on first use.
+    """
+    return _get("histogram", name, help_text, labels)
+
+
+def bytes_written(path: str, size: int) -> None:
+    """
+    Count size bytes written to the data file path.
+    """
+    counter("gdb_bytes_written_total", "Bytes written per data file", file=os.path.basename(path)).inc(size)
+
+
+def rows_loaded(source: str, rows: int) -> None:
+    """
+    Count rows read from source ("accounts", "journal", "import", "transactions").
+    """
+    counter("gdb_rows_loaded_total", "Rows read per source", source=source).inc(rows)
+
+
+class _Active(threading.local):
+    # Kinds with an instrumented call running on this thread.
+    def __init__(self):
+        self.kinds = set()
+
+
+_active = _Active()
+
+
+def _failed(result) -> bool:
+    # Failures are reported as False, or as (False or None, message).
+    if type(result) is tuple and result:
+        return result[0] is False or result[0] is None
+    return result is False
+
+
+def timed(kind: str, operation: Optional[str] = None):
+    """
+    Decorator recording calls of a function in gdb_<kind>_seconds and its
+    failure/error counters. Calls made while another call of the same kind
+    is running on the thread are not recorded. Generator functions (and
+    context managers built from them) are returned unchanged.
+    """
+    def decorate(func):
+        if not ENABLED or inspect.isgeneratorfunction(inspect.unwrap(func)):
+            return func
+        name = operation or func.__name__
+        latency = histogram(f"gdb_{kind}_seconds", f"Latency of {kind} calls", operation=name)
+        failures = counter(f"gdb_{kind}_failures_total", f"{kind} calls that returned a failure", operation=name)
+        errors = counter(f"gdb_{kind}_errors_total", f"{kind} calls that raised", operation=name)
+
+        clock = time.perf_counter
+        observe = latency.observe
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            active = _active.kinds
+            if kind in active:
+                return func(*args, **kwargs)
+            active.add(kind)
+            started = clock()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                errors.inc()
+                raise
+            finally:
+                active.discard(kind)
+                observe(clock() - started)
+            if (result is False or type(result) is tuple) and _failed(result):
+                failures.inc()
+            return result
+        return wrapper
+    return decorate
+
+
+def instrument(kind: str):
+    """
+    Class decorator applying timed(kind) to every public method.
+    """
+    def decorate(cls):
+        for name, value in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.isfunction(value):
+                setattr(cls, name, timed(kind, name)(value))
+        return cls
+    return decorate
+
+
+# --- Rendering ---
+def _label_text(key, extra: str = "") -> str:
+    parts = ['%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+             for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _bounds(metric: Histogram) -> list:
+    return [repr(b) for b in metric.buckets] + ["+Inf"]
+
+
+def _bound(value: Optional[float]):
+    return "+Inf" if value == float("inf") else value
+
+
+def _families_snapshot():
+    with _registry_lock:
+        return [(name, family, list(family.children.items())) for name, family in sorted(_families.items())]
+
+
+def render_prometheus() -> str:
+    """
+    All metrics in the Prometheus text exposition format.
+    """
+    lines = []
+    for name, family, children in _families_snapshot():
+        if family.help:
+            lines.append(f"# HELP {name} {family.help}")
+        lines.append(f"# TYPE {name} {family.kind}")
+        for key, metric in children:
+            if family.kind == "counter":
+                lines.append(f"{name}{_label_text(key)} {metric.value}")
+                continue
+            for bound, total in zip(_bounds(metric), metric.cumulative()):
+                le = 'le="%s"' % bound
+                lines.append(f"{name}_bucket{_label_text(key, le)} {total}")
+            lines.append(f"{name}_sum{_label_text(key)} {metric.sum}")
+            lines.append(f"{name}_count{_label_text(key)} {metric.count}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot() -> dict:
+    """
+    All metrics as a JSON-serializable dict: counters with their value,
+    histograms with count, sum, estimated p50/p99 and cumulative buckets.
+    """
+    result = {"counters": {}, "histograms": {}}
+    for name, family, children in _families_snapshot():
+        for key, metric in children:
+            labels = dict(key)
+            if family.kind == "counter":
+                result["counters"].setdefault(name, []).append({"labels": labels, "value": metric.value})
+                continue
+            result["histograms"].setdefault(name, []).append({
+                "labels": labels,
+                "count": metric.count,
+                "sum": metric.sum,
+                "p50": _bound(metric.quantile(0.5)),
+                "p99": _bound(metric.quantile(0.99)),
+                "buckets": dict(zip(_bounds(metric), metric.cumulative())),
+            })
+    return result
+
+
+def dump(path: Optional[str] = None) -> bool:
+    """
+    Write all metrics to path (default GDB_METRICS_FILE), as JSON if it
+    ends in .json and Prometheus text otherwise. Returns True on success.
+    """
+    path = path or METRICS_FILE
+    if not path:
+        return False
+    try:
+        if path.endswith(".json"):
+            text = json.dumps(snapshot(), indent=2)
+        else:
+            text = render_prometheus()
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        logging.error(f"Failed to dump metrics: {e}")
+        return False
+
+
+def _dump_periodically(interval: float) -> None:
+    while not _stop.wait(interval):
+        dump()
+
+
+_stop = threading.Event()
+if METRICS_FILE:
+    atexit.register(dump)
+    if METRICS_INTERVAL > 0:
+        threading.Thread(target=_dump_periodically, args=(METRICS_INTERVAL,), name="gdb-metrics",
+                         daemon=True).start()
@@ -0,0 +1,65 @@
+"""
+Convert a data directory between storage backends.
+
+Usage (from src/):
+    GDB_DATA_DIR=/path/to/data python -m utils.migrate_store csv sqlite
+
+Accounts (with their history) and the full transaction log are copied from
+the source backend to the target backend in the same data directory. The
+target must be empty, so a migration that already ran is not copied twice.
+"""
+import sys
+import logging
+
+from utils.storage import AccountStore, open_store
+
+
+def migrate(source: AccountStore, target: AccountStore, batch_size: int = 10000) -> tuple[int, int]:
+    """
+    Copy all accounts and transaction log entries from source to target.
+    Returns (accounts copied, log entries copied). Raises RuntimeError,
+    copying nothing, if the target already holds accounts or log entries.
+    """
+    if not target.is_empty():
+        raise RuntimeError("The target store is not empty")
+    accounts = source.load_accounts()
+    if not target.save_accounts(accounts):
+        raise RuntimeError("Failed to write accounts to the target store")
+    copied = 0
+    batch = []
+    for line in source.iter_transaction_log():
+        batch.append(line)
+        if len(batch) >= batch_size:
+            target.append_transaction_lines(batch)
+            copied += len(batch)
+            batch = []
+    if batch:
+        target.append_transaction_lines(batch)
+        copied += len(batch)
+    target.sync()
+    return len(accounts), copied
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Usage: python -m utils.migrate_store <source: csv|sqlite> <target: csv|sqlite>")
+        return 2
+    if argv[0].lower() == argv[1].lower():
+        print("Source and target backends must differ.")
+        return 2
+    source, target = open_store(argv[0]), open_store(argv[1])
+    try:
+        accounts, entries = migrate(source, target)
+    except Exception as e:
+        logging.error(f"Migration failed: {e}")
+        return 1
+    finally:
+        source.close()
+        target.close()
+    print(f"Migrated {accounts} accounts and {entries} transaction log entries from {argv[0]} to {argv[1]}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Binary account snapshot format, used instead of accounts.csv when
+GDB_SNAPSHOT_FORMAT=binary.
+
+Layout (little-endian):
+    header   HEADER: magic, version, record size, CRC32 of everything after
+             the header, record count, string table offset and length
+    records  one fixed-width RECORD per account, in book order
+    strings  the string table: a u32 byte length plus the bytes of each
+             entry. Records refer to their name, PIN (UTF-8) and history
+             window by offset in the table. A history window is packed as
+             HISTORY_ENTRY structs, or stored as JSON if any entry does not
+             have the shape Account writes.
+
+Amounts are stored as integer cents and type and status as their codes, so
+loading a record is a struct unpack and needs no parsing. The file can be
+memory-mapped: records are located by index and columns can be viewed as
+NumPy arrays without copying.
+
+Usage (from src/), to convert an account file either way:
+    python -m utils.snapshot accounts_export.csv accounts_export.snap
+"""
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import logging
+import tempfile
+from datetime import date
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import numpy as np
+
+from models.account import Account
+
+MAGIC = b"GDBSNAP\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQQQ24x")
+RECORD = struct.Struct("<qqqQQQiiBBBx")
+LENGTH = struct.Struct("<I")
+NO_STRING = 0xFFFFFFFFFFFFFFFF
+
+# History entry: type code, amount and balance in cents, date ordinal.
+HISTORY_ENTRY = struct.Struct("<BqqI")
+HISTORY_TYPES = ("DEPOSIT", "WITHDRAW", "INTEREST")
+HISTORY_KEYS = ("type", "amount", "balance", "date")
+_PACKED, _JSON = b"\x01", b"\x00"
+
+# RECORD as a NumPy dtype, for column views over the mapped records.
+RECORD_DTYPE = np.dtype([
+    ("account_number", "<i8"), ("balance", "<i8"), ("daily_total", "<i8"),
+    ("name", "<u8"), ("pin", "<u8"), ("history", "<u8"),
+    ("age", "<i4"), ("last_date", "<i4"),
+    ("type", "u1"), ("status", "u1"), ("places", "u1"), ("pad", "V1"),
+])
+
+# Short strings (PINs, common names) are written to the table once; the
+# dedup map is capped so a huge snapshot cannot grow it without bound.
+SHARED_STRING_LENGTH = 32
+SHARED_STRING_LIMIT = 65536
+STRING_SPOOL_BYTES = 16 * 1024 * 1024
+
+
+def _encode_date(value) -> int:
+    # Date ordinals as they are; 0 for no date, -1 for an empty one.
+    if type(value) is int:
+        return value
+    return 0 if value is None else -1
+
+
+def _decode_date(value: int):
+    if value > 0:
+        return value
+    return None if value == 0 else ""
+
+
+def _pack_entry(entry) -> bytes:
+    if not isinstance(entry, dict) or tuple(entry) != HISTORY_KEYS or entry["type"] not in HISTORY_TYPES:
+        raise ValueError
+    amount, balance = entry["amount"], entry["balance"]
+    if type(amount) is not float or type(balance) is not float:
+        raise ValueError
+    amount_cents, balance_cents = round(amount * 100), round(balance * 100)
+    day = date.fromisoformat(entry["date"])
+    if amount_cents / 100 != amount or balance_cents / 100 != balance or day.isoformat() != entry["date"]:
+        raise ValueError
+    return HISTORY_ENTRY.pack(HISTORY_TYPES.index(entry["type"]), amount_cents, balance_cents, day.toordinal())
+
+
+def _encode_history(history) -> bytes:
+    try:
+        return _PACKED + b"".join(_pack_entry(entry) for entry in history)
+    except (ValueError, TypeError, KeyError):
+        return _JSON + json.dumps(list(history)).encode()
+
+
+@lru_cache(maxsize=4096)
+def _iso_date(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+
+def _decode_history(data: bytes) -> list:
+    if data[:1] == _JSON:
+        return json.loads(data[1:])
+    return [
+        {"type": HISTORY_TYPES[code], "amount": amount / 100, "balance": balance / 100, "date": _iso_date(day)}
+        for code, amount, balance, day in HISTORY_ENTRY.iter_unpack(data[1:])
+    ]
+
+
+def is_snapshot(path: str) -> bool:
+    """
+    Whether path holds a binary snapshot (as opposed to CSV).
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class SnapshotWriter:
+    """
+    Streams accounts into a binary snapshot. Records go straight to out (a
+    seekable binary file positioned at 0); strings are collected in a
+    spooled temporary file and appended by finish(), which then fills in
+    the header.
+    """
+
+    def __init__(self, out):
+        self._out = out
+        out.write(bytes(HEADER.size))
+        self._strings = tempfile.SpooledTemporaryFile(max_size=STRING_SPOOL_BYTES)
+        self._strings_length = 0
+        self._shared = {}
+        self._crc = 0
+        self.count = 0
+
+    def _bytes(self, data: bytes) -> int:
+        ref = self._strings_length
+        self._strings.write(LENGTH.pack(len(data)))
+        self._strings.write(data)
+        self._strings_length += LENGTH.size + len(data)
+        return ref
+
+    def _string(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        shared = len(value) <= SHARED_STRING_LENGTH
+        if shared:
+            ref = self._shared.get(value)
+            if ref is not None:
+                return ref
+        ref = self._bytes(value.encode())
+        if shared and len(self._shared) < SHARED_STRING_LIMIT:
+            self._shared[value] = ref
+        return ref
+
+    def add(self, acc: Account) -> None:
+        number, name, age, pin, history, type_code, status_code, balance, places, daily, last_date = acc.fields()
+        record = RECORD.pack(
+            number, balance, daily,
+            self._string(name),
+            self._string(None if pin is None else str(pin)),
+            self._bytes(_encode_history(history)) if history else NO_STRING,
+            age, _encode_date(last_date), type_code, status_code, places,
+        )
+        self._crc = zlib.crc32(record, self._crc)
+        self._out.write(record)
+        self.count += 1
+
+    def finish(self) -> None:
+        self._strings.seek(0)
+        for block in iter(lambda: self._strings.read(1024 * 1024), b""):
+            self._crc = zlib.crc32(block, self._crc)
+            self._out.write(block)
+        self._strings.close()
+        end = self._out.tell()
+        self._out.seek(0)
+        self._out.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self._crc, self.count,
+                                    HEADER.size + self.count * RECORD.size, self._strings_length))
+        self._out.seek(end)
+
+
+class SnapshotReader:
+    """
+    Read access to a binary snapshot through a read-only memory map. The
+    mapping keeps the file it was opened on, so a reader stays valid after
+    a newer snapshot has been renamed over the path.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = None
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError("Truncated account snapshot")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, version, record_size, self.crc, self.count,
+             self._strings_at, self._strings_length) = HEADER.unpack_from(self._map)
+            if magic != MAGIC:
+                raise ValueError("Not a binary account snapshot")
+            if version != VERSION or record_size != RECORD.size:
+                raise ValueError(f"Unsupported account snapshot version {version}")
+            self._end = self._strings_at + self._strings_length
+            if self._end > size:
+                raise ValueError("Truncated account snapshot")
+        except Exception:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.count
+
+    def verify(self) -> bool:
+        """
+        Check the records and string table against the header checksum.
+        """
+        crc = 0
+        for start in range(HEADER.size, self._end, 1024 * 1024):
+            crc = zlib.crc32(self._map[start:min(start + 1024 * 1024, self._end)], crc)
+        return crc == self.crc and self._end == len(self._map)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Read-only view of one RECORD_DTYPE field across all records.
+        """
+        records = np.frombuffer(self._map, dtype=RECORD_DTYPE, count=self.count, offset=HEADER.size)
+        return records[name]
+
+    def _bytes(self, ref: int) -> bytes:
+        at = self._strings_at + ref
+        (length,) = LENGTH.unpack_from(self._map, at)
+        return self._map[at + LENGTH.size:at + LENGTH.size + length]
+
+    def _string(self, ref: int) -> Optional[str]:
+        if ref == NO_STRING:
+            return None
+        return self._bytes(ref).decode()
+
+    def _account(self, values) -> Account:
+        number, balance, daily, name, pin, history, age, last_date, type_code, status_code, places = values
+        history = () if history == NO_STRING else _decode_history(self._bytes(history))
+        return Account.from_fields(number, self._string(name), age, self._string(pin), history, type_code,
+                                   status_code, balance, places, daily, _decode_date(last_date))
+
+    def account(self, index: int) -> Account:
+        """
+        The account stored in record index.
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self._account(RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size))
+
+    def name(self, index: int) -> str:
+        """
+        The account holder name of record index, without building the account.
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self._string(RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)[3])
+
+    def __iter__(self) -> Iterator[Account]:
+        with memoryview(self._map) as view:
+            for values in RECORD.iter_unpack(view[HEADER.size:self._strings_at]):
+                yield self._account(values)
+
+    def close(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Column views still point into the map; it is released
+                # once they are garbage collected.
+                pass
+            self._map = None
+        self._file.close()
+
+
+def main(argv=None) -> int:
+    from utils import file_manager
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("Usage: python -m utils.snapshot <source file> <target file (.snap for binary, else CSV)>")
+        return 2
+    fmt = "binary" if argv[1].endswith(".snap") else "csv"
+    try:
+        count = file_manager.convert_accounts_file(argv[0], argv[1], fmt)
+    except Exception as e:
+        logging.error(f"Conversion failed: {e}")
+        return 1
+    print(f"Converted {count} accounts from {argv[0]} to {argv[1]} ({fmt}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+import os
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+from models.account import Account
+from utils import file_manager, metrics
+from utils.storage import AccountStore
+from utils.lazy_accounts import LazyAccountMap
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    account_number INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    balance TEXT NOT NULL,
+    account_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pin TEXT,
+    daily_total TEXT NOT NULL,
+    last_transaction_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_name ON accounts (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_accounts_status ON accounts (status);
+
+CREATE TABLE IF NOT EXISTS account_history (
+    account_number INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    amount REAL,
+    balance REAL,
+    date TEXT,
+    PRIMARY KEY (account_number, position)
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    account_number INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    amount TEXT,
+    balance_after TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions (account_number, timestamp);
+-- Ordered by id within an account, for paging through its history.
+CREATE INDEX IF NOT EXISTS idx_transactions_account_id ON transactions (account_number, id);
+
+-- State of an unfinished chunked posting run, as JSON.
+CREATE TABLE IF NOT EXISTS posting_runs (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+"""
+
+# GDB_DURABILITY mapped onto SQLite's synchronous setting.
+SYNCHRONOUS = {"none": "OFF", "flush": "NORMAL", "fsync": "FULL"}
+
+HISTORY_PAGE = 1000
+
+ACCOUNT_COLUMNS = ("account_number, name, age, balance, account_type, status, pin, "
+                   "daily_total, last_transaction_date")
+
+
+@metrics.instrument("io")
+class SqliteAccountStore(AccountStore):
+    """
+    SQLite backend. Accounts, their history entries and the transaction log
+    are stored as rows; save_account() updates a single row in place and
+    transaction() wraps a group of changes in one SQL transaction.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._accounts = {}
+        # Accounts saved in the open transaction, unpinned once it commits.
+        self._written = []
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS.get(file_manager.DURABILITY, 'NORMAL')}")
+        self._conn.executescript(SCHEMA)
+        # Lazy fetches use their own connection: they run under the lazy
+        # map's lock, and must not wait for a writer holding _lock (which
+        # may itself be waiting for the map).
+        self._reader = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._read_lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            outer = self._depth == 0
+            if outer:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outer:
+                    self._conn.execute("ROLLBACK")
+                    self._written = []
+                raise
+            self._depth -= 1
+            if not outer:
+                return
+            self._conn.execute("COMMIT")
+            written, self._written = self._written, []
+        # Committed rows may now be evicted from a lazy map.
+        if isinstance(self._accounts, LazyAccountMap):
+            for account_number in written:
+                self._accounts.mark_clean(account_number, account_number)
+
+    def load_accounts(self) -> Dict[int, Account]:
+        """
+        Load every account, or with GDB_LAZY_LOAD=1 return a LazyAccountMap
+        that fetches single rows by account number on first access.
+        """
+        accounts = {}
+        try:
+            if file_manager.LAZY_LOAD:
+                with self._lock:
+                    keys = [row[0] for row in self._conn.execute(
+                        "SELECT account_number FROM accounts ORDER BY account_number")]
+                accounts = LazyAccountMap(((k, k) for k in keys), self._fetch, file_manager.CACHE_SIZE)
+                self._accounts = accounts
+                logging.info(f"Indexed {len(accounts)} accounts for lazy loading.")
+                return accounts
+            with self._lock:
+                rows = self._conn.execute(f"SELECT {ACCOUNT_COLUMNS} FROM accounts ORDER BY account_number").fetchall()
+                history = {}
+                for acc_no, _, type_, amount, balance, date in self._conn.execute(
+                        "SELECT * FROM account_history ORDER BY account_number, position"):
+                    history.setdefault(acc_no, []).append(
+                        {"type": type_, "amount": amount, "balance": balance, "date": date})
+            for row in rows:
+                acc = self._row_to_account(row, history.get(row[0], []))
+                accounts[acc.account_number] = acc
+            metrics.rows_loaded("accounts", len(accounts))
+            logging.info("Accounts loaded successfully.")
+        except Exception as e:
+            logging.error(f"Failed to load accounts: {e}")
+        self._accounts = accounts
+        return accounts
+
+    @staticmethod
+    def _row_to_account(row, history) -> Account:
+        return Account(
+            account_number=row[0],
+            name=row[1],
+            age=row[2],
+            balance=row[3],
+            account_type=row[4],
+            status=row[5],
+            pin=row[6] if row[6] else None,
+            transaction_history=history,
+            daily_total=row[7],
+            last_transaction_date=row[8],
+        )
+
+    def _fetch(self, account_number: int) -> Account:
+        with self._read_lock:
+            row = self._reader.execute(f"SELECT {ACCOUNT_COLUMNS} FROM accounts WHERE account_number = ?",
+                                       (account_number,)).fetchone()
+            history = [{"type": t, "amount": a, "balance": b, "date": d} for t, a, b, d in self._reader.execute(
+                "SELECT type, amount, balance, date FROM account_history WHERE account_number = ? ORDER BY position",
+                (account_number,))]
+        if row is None:
+            raise KeyError(account_number)
+        metrics.rows_loaded("accounts", 1)
+        return self._row_to_account(row, history)
+
+    def _upsert(self, acc: Account) -> None:
+        self._conn.execute(
+            f"INSERT INTO accounts ({ACCOUNT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(account_number) DO UPDATE SET name=excluded.name, age=excluded.age, "
+            "balance=excluded.balance, account_type=excluded.account_type, status=excluded.status, "
+            "pin=excluded.pin, daily_total=excluded.daily_total, "
+            "last_transaction_date=excluded.last_transaction_date",
+            (acc.account_number, acc.name, acc.age, str(acc.balance), acc.account_type, acc.status,
+             acc.pin if acc.pin else None, str(acc.daily_total), acc.last_transaction_date),
+        )
+
+    def _write_history(self, acc: Account) -> None:
+        # account_history holds the account's recent window only; the full
+        # history is in the transactions table.
+        self._conn.execute("DELETE FROM account_history WHERE account_number = ?", (acc.account_number,))
+        self._conn.executemany(
+            "INSERT INTO account_history VALUES (?, ?, ?, ?, ?, ?)",
+            [(acc.account_number, i, e.get("type"), e.get("amount"), e.get("balance"), e.get("date"))
+             for i, e in enumerate(acc.transaction_history)],
+        )
+
+    def save_accounts(self, accounts: Dict[int, Account]) -> bool:
+        try:
+            # Only a map built by this store can skip its uncached rows; any
+            # other map (e.g. during a migration) is written out in full.
+            lazy = isinstance(accounts, LazyAccountMap) and accounts.fetches_with(self._fetch)
+            if lazy:
+                # Rows of accounts that were never loaded are unchanged.
+                with self._lock:
+                    stored = [row[0] for row in self._conn.execute("SELECT account_number FROM accounts")]
+                gone = [(k,) for k in stored if k not in accounts]
+                changed = [acc for acc in map(accounts.cached, accounts) if acc is not None]
+            with self.transaction():
+                if lazy:
+                    self._conn.executemany("DELETE FROM accounts WHERE account_number = ?", gone)
+                    self._conn.executemany("DELETE FROM account_history WHERE account_number = ?", gone)
+                else:
+                    self._conn.execute("DELETE FROM accounts")
+                    self._conn.execute("DELETE FROM account_history")
+                    changed = accounts.values() if isinstance(accounts, LazyAccountMap) else list(accounts.values())
+                for acc in changed:
+                    self._upsert(acc)
+                    self._write_history(acc)
+            if lazy:
+                for acc in changed:
+                    accounts.mark_clean(acc.account_number, acc.account_number)
+            if lazy or not isinstance(accounts, LazyAccountMap):
+                # Another store's map keeps its own pins.
+                self._accounts = accounts
+            logging.info("Accounts saved successfully.")
+            return True
+        except Exception as e:
+            logging.error(f"Failed to save accounts: {e}")
+            return False
+
+    def save_account(self, acc: Account, history: bool = False) -> None:
+        if isinstance(self._accounts, LazyAccountMap):
+            # Pinned until committed, so no stale row is fetched meanwhile.
+            self._accounts.mark_dirty(acc)
+        with self.transaction():
+            self._upsert(acc)
+            if history:
+                self._write_history(acc)
+            self._written.append(acc.account_number)
+
+    def log_transaction(self, account_number: int, operation: str, amount, balance_after) -> None:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO transactions (timestamp, account_number, operation, amount, balance_after) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (timestamp, int(account_number), operation, None if amount is None else str(amount), str(balance_after)),
+            )
+
+    @staticmethod
+    def _format(row) -> str:
+        timestamp, account_number, operation, amount, balance_after = row
+        return f"{timestamp} | {account_number} | {operation} | {amount} | {balance_after}"
+
+    def _iter_pages(self, where: str, params: list) -> Iterator[str]:
+        # Fetched in pages keyed on id, so a long log is never held in
+        # memory at once and each page is an index seek, not a rescan.
+        query = ("SELECT id, timestamp, account_number, operation, amount, balance_after FROM transactions "
+                 f"WHERE id > ?{where} ORDER BY id LIMIT ?")
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, [last] + params + [HISTORY_PAGE]).fetchall()
+            for row in rows:
+                yield self._format(row[1:])
+            if len(rows) < HISTORY_PAGE:
+                return
+            last = rows[-1][0]
+
+    def iter_transaction_history(self, account_number: int, start: Optional[str] = None,
+                                 end: Optional[str] = None) -> Iterator[str]:
+        where = " AND account_number = ?"
+        params = [int(account_number)]
+        if start is not None:
+            where += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            # A bare date as end covers the whole day.
+            where += " AND timestamp <= ?"
+            params.append(end if len(end) > 10 else end + " 99")
+        return self._iter_pages(where, params)
+
+    def iter_transaction_log(self) -> Iterator[str]:
+        return self._iter_pages("", [])
+
+    def posting_run(self) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM posting_runs LIMIT 1").fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def update_posting_run(self, run: dict) -> None:
+        # Inside save_posting() this joins the posting's transaction.
+        with self.transaction():
+            self._conn.execute(
+                "INSERT INTO posting_runs VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET state=excluded.state",
+                (run["id"], json.dumps(run)))
+
+    def finish_posting_run(self) -> None:
+        with self.transaction():
+            self._conn.execute("DELETE FROM posting_runs")
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not any(self._conn.execute(
+                f"SELECT 1 FROM {table} LIMIT 1").fetchone() for table in ("accounts", "transactions"))
+
+    def append_transaction_lines(self, lines: Iterable[str]) -> None:
+        rows = []
+        for line in lines:
+            parts = line.rstrip("\n").split(" | ")
+            if len(parts) < 5:
+                continue
+            amount = None if parts[3] == "None" else parts[3]
+            rows.append((parts[0], int(parts[1]), parts[2], amount, parts[4]))
+        with self.transaction():
+            self._conn.executemany(
+                "INSERT INTO transactions (timestamp, account_number, operation, amount, balance_after) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def close(self) -> None:
+        with self._lock, self._read_lock:
+            self._conn.close()
+            self._reader.close()
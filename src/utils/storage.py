@@ -0,0 +1,325 @@
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.account import Account
+from utils import file_manager
+from utils.lazy_accounts import LazyAccountMap
+from utils.locks import ReadWriteLock
+
+# Storage backend used by BankingService when none is passed in: "csv" (the
+# legacy CSV + journal files) or "sqlite" (DATA_DIR/bank.db).
+STORE_KIND = os.environ.get("GDB_STORE", "csv")
+SQLITE_FILE = os.path.join(file_manager.DATA_DIR, "bank.db")
+
+
+class AccountStore:
+    """
+    Persistence interface used by BankingService.
+
+    Mutations are reported per account through save_account(); they only
+    have to be durable once sync() returns. Changes made inside a
+    transaction() block are applied atomically where the backend supports it.
+    Backends must accept save_account() calls from several threads at once.
+    """
+
+    def load_accounts(self) -> Dict[int, Account]:
+        raise NotImplementedError
+
+    def save_accounts(self, accounts: Dict[int, Account]) -> bool:
+        """
+        Replace the stored account book with accounts.
+        """
+        raise NotImplementedError
+
+    def save_account(self, acc: Account, history: bool = False) -> None:
+        """
+        Store the current state of one account. history says whether its
+        recent history window changed.
+        """
+        raise NotImplementedError
+
+    def log_transaction(self, account_number: int, operation: str, amount, balance_after) -> None:
+        raise NotImplementedError
+
+    def save_transfer(self, txid: str, from_acc: Account, to_acc: Account, amount) -> None:
+        """
+        Record a completed transfer, both account states and its two log
+        entries, as one atomic unit.
+        """
+        with self.transaction():
+            self.log_transaction(from_acc.account_number, "TRANSFER_OUT", amount, from_acc.balance)
+            self.log_transaction(to_acc.account_number, "TRANSFER_IN", amount, to_acc.balance)
+            self.save_account(from_acc, history=True)
+            self.save_account(to_acc, history=True)
+
+    def save_posting(self, txid: str, operation: str, entries: List[Tuple[Account, object]],
+                     run: Optional[dict] = None) -> None:
+        """
+        Record a bulk posting of (account, amount) entries, such as an
+        interest run, as one atomic unit: every account state and one log
+        entry per account. A chunk of a longer run passes the run's new
+        state (see update_posting_run), recorded in the same unit.
+        """
+        with self.transaction():
+            for acc, amount in entries:
+                self.log_transaction(acc.account_number, operation, amount, acc.balance)
+            for acc, _ in entries:
+                self.save_account(acc, history=True)
+            if run is not None:
+                self.update_posting_run(run)
+
+    def posting_run(self) -> Optional[dict]:
+        """
+        State of the chunked posting run that has not finished, or None.
+        """
+        return file_manager.posting_run()
+
+    def update_posting_run(self, run: dict) -> None:
+        """
+        Record the state of a chunked posting run: its id, parameters and
+        the last account number posted ("through").
+        """
+        file_manager.save_posting_run(run)
+
+    def finish_posting_run(self) -> None:
+        file_manager.clear_posting_run()
+
+    def sync(self) -> bool:
+        return True
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def iter_transaction_history(self, account_number: int, start: Optional[str] = None,
+                                 end: Optional[str] = None) -> Iterator[str]:
+        """
+        Stream the transaction log lines of one account, oldest first.
+        """
+        raise NotImplementedError
+
+    def read_transaction_history(self, account_number: int, start: Optional[str] = None,
+                                 end: Optional[str] = None) -> List[str]:
+        return list(self.iter_transaction_history(account_number, start, end))
+
+    def write_transaction_log_file(self, account_number: int) -> bool:
+        log_file = os.path.join(file_manager.DATA_DIR, f"transactions_{account_number}.log")
+        try:
+            with open(log_file, "w") as dst:
+                for line in self.read_transaction_history(account_number):
+                    dst.write(line + "\n")
+            return True
+        except OSError:
+            return False
+
+    def iter_transaction_log(self) -> Iterator[str]:
+        """
+        Yield every transaction log line ("ts | account | op | amount | balance"), oldest first.
+        """
+        raise NotImplementedError
+
+    def append_transaction_lines(self, lines: Iterable[str]) -> None:
+        """
+        Store pre-formatted transaction log lines, keeping their timestamps.
+        """
+        raise NotImplementedError
+
+    def is_empty(self) -> bool:
+        """
+        True if the store holds no accounts and no transaction log entries.
+        Answered from storage, without loading the book into the store.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def bulk_load(self):
+        """
+        Bracket a long run of save_account() calls, such as an import.
+        Backends may space out expensive maintenance until it ends.
+        """
+        yield
+
+    @contextmanager
+    def deferred_durability(self):
+        """
+        Bracket a run of mutations (such as a batch script) that only has
+        to be durable once it ends. Backends may skip per-change syncs
+        meanwhile; on exit everything done so far is durable.
+        """
+        try:
+            with self.bulk_load():
+                yield
+        finally:
+            self.sync()
+
+    # Export and import always use the CSV interchange file.
+    def export_accounts(self, accounts: Dict[int, Account], progress=None, fmt: str = "csv") -> bool:
+        return file_manager.export_accounts(accounts, progress, fmt)
+
+    def import_accounts(self, fmt: str = "csv") -> List[Account]:
+        return file_manager.import_accounts(file_manager.export_path(fmt))
+
+    def iter_import_chunks(self, chunk_size: Optional[int] = None, workers: Optional[int] = None,
+                           fmt: str = "csv") -> Iterator[file_manager.ImportChunk]:
+        """
+        Stream the interchange file of format fmt in validated chunks,
+        resuming after the last chunk an interrupted import committed.
+        """
+        return file_manager.iter_import_chunks(file_manager.export_path(fmt), chunk_size=chunk_size,
+                                               workers=workers)
+
+    def commit_import_chunk(self, chunk: file_manager.ImportChunk) -> None:
+        """
+        Record that chunk has been merged and is durable.
+        """
+        file_manager.save_import_progress(chunk)
+
+    def finish_import(self) -> None:
+        file_manager.clear_import_progress()
+
+    def close(self) -> None:
+        pass
+
+
+class CsvAccountStore(AccountStore):
+    """
+    Legacy backend: accounts.csv checkpoints plus the write-ahead journal,
+    and the segmented transactions.log.
+    """
+
+    def __init__(self):
+        self._accounts = {}
+        # Journal appends hold this shared; a checkpoint holds it exclusively
+        # from writing accounts.csv until the journal is truncated, so no
+        # record can land in between and be truncated away.
+        self._checkpoint_lock = ReadWriteLock()
+        self._bulk = 0
+
+    def load_accounts(self) -> Dict[int, Account]:
+        self._accounts = file_manager.load_accounts()
+        return self._accounts
+
+    def save_accounts(self, accounts: Dict[int, Account]) -> bool:
+        with self._checkpoint_lock.exclusive():
+            self._accounts = accounts
+            return file_manager.save_accounts(accounts)
+
+    def save_account(self, acc: Account, history: bool = False) -> None:
+        with self._checkpoint_lock.shared():
+            if isinstance(self._accounts, LazyAccountMap):
+                # Written back to accounts.csv at the next checkpoint.
+                self._accounts.mark_dirty(acc)
+            if file_manager.JOURNAL_ENABLED:
+                file_manager.journal_account(acc, history)
+        self._maybe_checkpoint()
+
+    def save_transfer(self, txid: str, from_acc: Account, to_acc: Account, amount) -> None:
+        if not file_manager.JOURNAL_ENABLED:
+            super().save_transfer(txid, from_acc, to_acc, amount)
+            return
+        with self._checkpoint_lock.shared():
+            if isinstance(self._accounts, LazyAccountMap):
+                self._accounts.mark_dirty(from_acc)
+                self._accounts.mark_dirty(to_acc)
+            # One journal record for both legs; waits until it is durable.
+            file_manager.journal_transfer(txid, from_acc, to_acc, amount)
+        self._maybe_checkpoint()
+
+    def save_posting(self, txid: str, operation: str, entries: List[Tuple[Account, object]],
+                     run: Optional[dict] = None) -> None:
+        if not file_manager.JOURNAL_ENABLED:
+            super().save_posting(txid, operation, entries, run)
+            return
+        with self._checkpoint_lock.shared():
+            if isinstance(self._accounts, LazyAccountMap):
+                for acc, _ in entries:
+                    self._accounts.mark_dirty(acc)
+            # One journal record for the whole posting; waits until it is
+            # durable. The run state is in the record as well, and is saved
+            # before a checkpoint can truncate the record away.
+            file_manager.journal_posting(txid, operation, entries, run)
+            if run is not None:
+                self.update_posting_run(run)
+        self._maybe_checkpoint()
+
+    @contextmanager
+    def bulk_load(self):
+        self._bulk += 1
+        try:
+            yield
+        finally:
+            self._bulk -= 1
+
+    @contextmanager
+    def deferred_durability(self):
+        # Group commits stop waiting for the disk (process-wide) and one
+        # checkpoint at the end makes the whole run durable.
+        previous = file_manager.group_commit_durability()
+        file_manager.configure_group_commit(durability="none")
+        try:
+            with self.bulk_load():
+                yield
+        finally:
+            file_manager.configure_group_commit(durability=previous)
+            self.save_accounts(self._accounts)
+            file_manager.sync()
+
+    def _checkpoint_due(self) -> bool:
+        if not file_manager.JOURNAL_ENABLED:
+            return True
+        interval = file_manager.CHECKPOINT_INTERVAL
+        if self._bulk:
+            # Let the journal grow to the size of the book before rewriting
+            # it, so a bulk load costs O(n) checkpoint I/O, not O(n^2).
+            interval = max(interval, len(self._accounts))
+        return file_manager.journal_records() >= interval
+
+    def _maybe_checkpoint(self) -> None:
+        if self._checkpoint_due():
+            with self._checkpoint_lock.exclusive():
+                # Another writer may have checkpointed while we waited.
+                if self._checkpoint_due():
+                    file_manager.save_accounts(self._accounts)
+
+    def log_transaction(self, account_number: int, operation: str, amount, balance_after) -> None:
+        file_manager.log_transaction(account_number, operation, amount, balance_after)
+
+    def is_empty(self) -> bool:
+        return file_manager.is_empty()
+
+    def sync(self) -> bool:
+        return file_manager.sync()
+
+    def read_transaction_history(self, account_number: int, start: Optional[str] = None,
+                                 end: Optional[str] = None) -> List[str]:
+        return file_manager.read_transaction_history(account_number, start, end)
+
+    def iter_transaction_history(self, account_number: int, start: Optional[str] = None,
+                                 end: Optional[str] = None) -> Iterator[str]:
+        return file_manager.iter_transaction_history(account_number, start, end)
+
+    def write_transaction_log_file(self, account_number: int) -> bool:
+        return file_manager.write_transaction_log_file(account_number)
+
+    def iter_transaction_log(self) -> Iterator[str]:
+        return file_manager.iter_transaction_log()
+
+    def append_transaction_lines(self, lines: Iterable[str]) -> None:
+        file_manager.append_transaction_lines(lines)
+
+    def close(self) -> None:
+        file_manager.sync()
+
+
+def open_store(kind: Optional[str] = None) -> AccountStore:
+    """
+    Create the storage backend named by kind, defaulting to GDB_STORE.
+    """
+    kind = (kind or STORE_KIND).lower()
+    if kind == "csv":
+        return CsvAccountStore()
+    if kind == "sqlite":
+        from utils.sqlite_store import SqliteAccountStore
+        return SqliteAccountStore(SQLITE_FILE)
+    raise ValueError(f"Unknown storage backend: {kind}")
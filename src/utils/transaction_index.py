@@ -0,0 +1,188 @@
+import os
+import logging
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def parse_account_number(line: str) -> Optional[int]:
+    """
+    Return the account number field of a transaction log line, or None if
+    the line is malformed. Only the second " | " field is considered, so
+    amounts or balances that happen to equal an account number never match.
+    """
+    parts = line.split(" | ", 2)
+    if len(parts) < 3:
+        return None
+    try:
+        return int(parts[1])
+    except ValueError:
+        return None
+
+
+class TransactionIndex:
+    """
+    Per-account byte-offset index over the transaction log.
+
+    The index is kept in memory and persisted next to the log as an
+    append-only "<log>.idx" file with one "account offset length" line per
+    log entry. On first use the index file is loaded and any log tail that
+    is not yet covered is indexed; if the log is shorter than the index
+    claims (log truncated or replaced) the index is rebuilt from scratch.
+    """
+
+    def __init__(self, log_path: str, index_path: Optional[str] = None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".idx"
+        self._offsets: Dict[int, List[int]] = {}
+        self._covered = 0
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._index_handle = None
+
+    def ensure_loaded(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._load_index_file()
+            try:
+                log_size = os.path.getsize(self.log_path)
+            except FileNotFoundError:
+                log_size = 0
+            if log_size < self._covered:
+                logging.warning("Transaction index is ahead of the log. Rebuilding.")
+                self.rebuild()
+            elif log_size > self._covered:
+                self._index_tail()
+            self._loaded = True
+
+    def _load_index_file(self) -> None:
+        self._offsets = {}
+        self._covered = 0
+        try:
+            with open(self.index_path, "r") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 3 or not line.endswith("\n"):
+                        break
+                    account_number, offset, length = (int(p) for p in parts)
+                    if offset != self._covered:
+                        # Gap or overlap: entries after this point cannot be trusted.
+                        break
+                    self._offsets.setdefault(account_number, []).append(offset)
+                    self._covered = offset + length
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.error(f"Failed to load transaction index: {e}")
+            self._offsets = {}
+            self._covered = 0
+
+    def _scan_log(self, start: int) -> Iterator[Tuple[int, bytes]]:
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(start)
+                offset = start
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    yield offset, raw
+                    offset += len(raw)
+        except FileNotFoundError:
+            return
+
+    def _index_tail(self) -> None:
+        entries = [(offset, raw.decode()) for offset, raw in self._scan_log(self._covered)]
+        self._add(entries)
+
+    def rebuild(self) -> None:
+        """
+        Discard the index and rebuild it from a full scan of the log.
+        """
+        with self._lock:
+            self._close_handle()
+            self._offsets = {}
+            self._covered = 0
+            open(self.index_path, "w").close()
+            self._index_tail()
+            self._loaded = True
+            logging.info("Transaction index rebuilt.")
+
+    def reset(self) -> None:
+        """
+        Start an empty index, for when the log has been rotated away.
+        """
+        with self._lock:
+            self._close_handle()
+            self._offsets = {}
+            self._covered = 0
+            open(self.index_path, "w").close()
+            self._loaded = True
+
+    def accounts(self) -> List[int]:
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._offsets)
+
+    def record(self, entries: List[Tuple[int, str]]) -> None:
+        """
+        Index log lines that were just appended at the given byte offsets.
+        """
+        with self._lock:
+            if not self._loaded:
+                # Loading catches up with the log, which already contains entries.
+                self.ensure_loaded()
+                return
+            self._add([(offset, line) for offset, line in entries if offset >= self._covered])
+
+    def _add(self, entries: List[Tuple[int, str]]) -> None:
+        if not entries:
+            return
+        if self._index_handle is None:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            self._index_handle = open(self.index_path, "a")
+        out = []
+        for offset, line in entries:
+            length = len(line.encode())
+            account_number = parse_account_number(line)
+            if account_number is None:
+                account_number = -1
+            else:
+                self._offsets.setdefault(account_number, []).append(offset)
+            out.append(f"{account_number} {offset} {length}\n")
+            self._covered = offset + length
+        self._index_handle.write("".join(out))
+        self._index_handle.flush()
+
+    def _close_handle(self) -> None:
+        if self._index_handle is not None:
+            self._index_handle.close()
+            self._index_handle = None
+
+    def offsets(self, account_number: int) -> List[int]:
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._offsets.get(int(account_number), ()))
+
+    def read(self, account_number: int) -> List[str]:
+        """
+        Return the log lines of one account by seeking straight to them.
+        """
+        account_number = int(account_number)
+        offsets = self.offsets(account_number)
+        lines = []
+        if not offsets:
+            return lines
+        with open(self.log_path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                line = f.readline().decode()
+                if parse_account_number(line) != account_number:
+                    logging.warning("Transaction index is stale. Rebuilding.")
+                    self.rebuild()
+                    return self.read(account_number)
+                lines.append(line)
+        return lines
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_handle()
@@ -0,0 +1,387 @@
+import os
+import re
+import gzip
+import json
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from utils.transaction_index import TransactionIndex, parse_account_number
+
+SEGMENT_NAME = re.compile(r"^transactions-(\d{6})-(\d{6})\.log(\.gz)?$")
+
+
+def _timestamp(line: str) -> str:
+    return line.split(" | ", 1)[0]
+
+
+def _in_range(timestamp: str, start: Optional[str], end: Optional[str]) -> bool:
+    # Timestamps are "YYYY-MM-DD HH:MM:SS", so string order is time order.
+    # A bare date as end covers the whole day.
+    if start is not None and timestamp < start:
+        return False
+    if end is not None and timestamp > end and not timestamp.startswith(end):
+        return False
+    return True
+
+
+class SegmentedTransactionLog:
+    """
+    Transaction log split into an active segment and closed segments.
+
+    New entries go to the active segment (the classic transactions.log),
+    which is covered by a TransactionIndex. When it reaches max_bytes, or
+    the day changes if daily is set, it is moved into segment_dir as a
+    closed segment. Every closed segment has a header in
+    segment_dir/manifest.json with its min/max timestamp, entry count and
+    the account numbers it contains, so account and time-range queries only
+    open segments that can match.
+
+    Closed segments are compacted in a background thread: adjacent small
+    segments are merged up to max_bytes and, if compress is set, written
+    gzip-compressed. Compaction never touches the active segment, so
+    appends are not blocked. Queries read the segments of the manifest as
+    it was when they started; segments compacted away meanwhile are only
+    deleted once no such query is left.
+    """
+
+    def __init__(self, active_path: str, segment_dir: str, max_bytes: int = 64 * 1024 * 1024,
+                 daily: bool = False, compress: bool = False):
+        self.active_path = active_path
+        self.segment_dir = segment_dir
+        self.manifest_path = os.path.join(segment_dir, "manifest.json")
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.compress = compress
+        self.index = TransactionIndex(active_path)
+        self._lock = threading.Lock()
+        self._segments = None
+        self._active_min_ts = None
+        self._active_max_ts = None
+        self._active_bytes = None
+        self._compactor = None
+        # Bumped by every compaction; queries in progress per generation,
+        # and the (generation, file) compaction inputs they may still read.
+        self._generation = 0
+        self._readers = {}
+        self._retired = []
+
+    # --- Manifest ---
+    def _load_manifest(self) -> None:
+        if self._segments is not None:
+            return
+        segments = []
+        try:
+            with open(self.manifest_path, "r") as f:
+                segments = json.load(f)["segments"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.error(f"Failed to load segment manifest: {e}")
+        known = {seg["file"] for seg in segments}
+        present = set(os.listdir(self.segment_dir)) if os.path.isdir(self.segment_dir) else set()
+        segments = [seg for seg in segments if seg["file"] in present]
+        for name in present:
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(self.segment_dir, name))
+        for name in sorted(present - known):
+            # Rotated or compacted just before a crash, before the manifest was written.
+            if SEGMENT_NAME.match(name):
+                segments.append(self._scan_header(name))
+        covered = set()
+        kept = []
+        for seg in sorted(segments, key=lambda seg: (seg["first"], -seg["last"])):
+            if seg["first"] in covered:
+                # Input of a compaction that finished but was not yet deleted.
+                os.remove(os.path.join(self.segment_dir, seg["file"]))
+                continue
+            covered.update(range(seg["first"], seg["last"] + 1))
+            kept.append(seg)
+        self._segments = kept
+        if len(kept) != len(segments) or known != {seg["file"] for seg in kept}:
+            self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        os.makedirs(self.segment_dir, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"segments": self._segments}, f)
+        os.replace(tmp, self.manifest_path)
+
+    def _open_segment(self, name: str):
+        path = os.path.join(self.segment_dir, name)
+        if name.endswith(".gz"):
+            return gzip.open(path, "rt")
+        return open(path, "r")
+
+    def _scan_header(self, name: str) -> dict:
+        first, last, _ = SEGMENT_NAME.match(name).groups()
+        header = {"file": name, "first": int(first), "last": int(last),
+                  "min_ts": None, "max_ts": None, "entries": 0, "bytes": 0, "accounts": []}
+        accounts = set()
+        with self._open_segment(name) as f:
+            for line in f:
+                self._extend_header(header, accounts, line)
+        header["accounts"] = sorted(accounts)
+        return header
+
+    @staticmethod
+    def _extend_header(header: dict, accounts: set, line: str) -> None:
+        account_number = parse_account_number(line)
+        if account_number is not None:
+            accounts.add(account_number)
+        ts = _timestamp(line)
+        if header["min_ts"] is None or ts < header["min_ts"]:
+            header["min_ts"] = ts
+        if header["max_ts"] is None or ts > header["max_ts"]:
+            header["max_ts"] = ts
+        header["entries"] += 1
+        header["bytes"] += len(line.encode())
+
+    def segments(self) -> List[dict]:
+        """
+        Return the headers of all closed segments, oldest first.
+        """
+        with self._lock:
+            self._load_manifest()
+            return list(self._segments)
+
+    # --- Appending and rotation ---
+    def _load_active_bounds(self) -> None:
+        self._active_bytes = 0
+        self._active_min_ts = self._active_max_ts = None
+        try:
+            self._active_bytes = os.path.getsize(self.active_path)
+            with open(self.active_path, "rb") as f:
+                first = f.readline().decode()
+                f.seek(max(0, self._active_bytes - 4096))
+                tail = f.read().decode(errors="replace").splitlines()
+            if first:
+                self._active_min_ts = _timestamp(first)
+                self._active_max_ts = _timestamp(tail[-1]) if tail else self._active_min_ts
+        except FileNotFoundError:
+            pass
+
+    def on_append(self, entries: List[Tuple[int, str]]) -> bool:
+        """
+        Write hook for the group committer. Indexes the appended entries and
+        rotates the active segment if it is full. Returns True when the
+        active file was rotated, so the writer reopens it.
+        """
+        self.index.record(entries)
+        with self._lock:
+            if self._active_bytes is None:
+                self._load_active_bounds()
+            for offset, line in entries:
+                self._active_bytes = max(self._active_bytes, offset + len(line.encode()))
+                ts = _timestamp(line)
+                if self._active_min_ts is None:
+                    self._active_min_ts = ts
+                self._active_max_ts = ts
+            if not self._should_rotate():
+                return False
+            self._rotate()
+        self._start_compaction()
+        return True
+
+    def _should_rotate(self) -> bool:
+        if self._active_bytes >= self.max_bytes:
+            return True
+        if self.daily and self._active_min_ts and self._active_max_ts:
+            return self._active_min_ts[:10] != self._active_max_ts[:10]
+        return False
+
+    def _rotate(self) -> None:
+        self._load_manifest()
+        seq = self._segments[-1]["last"] + 1 if self._segments else 1
+        name = f"transactions-{seq:06d}-{seq:06d}.log"
+        header = {"file": name, "first": seq, "last": seq,
+                  "min_ts": self._active_min_ts, "max_ts": self._active_max_ts,
+                  "entries": 0, "bytes": self._active_bytes,
+                  "accounts": sorted(self.index.accounts())}
+        header["entries"] = sum(len(self.index.offsets(acc)) for acc in header["accounts"])
+        os.makedirs(self.segment_dir, exist_ok=True)
+        os.replace(self.active_path, os.path.join(self.segment_dir, name))
+        self.index.reset()
+        self._segments.append(header)
+        self._write_manifest()
+        self._active_bytes = 0
+        self._active_min_ts = self._active_max_ts = None
+        logging.info(f"Transaction log rotated into segment {name}.")
+
+    # --- Compaction ---
+    def _start_compaction(self) -> None:
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self.compact, name="gdb-log-compactor", daemon=True)
+        self._compactor.start()
+
+    def _compaction_runs(self) -> List[List[dict]]:
+        runs, run, run_bytes = [], [], 0
+        for seg in self._segments:
+            if run and run_bytes + seg["bytes"] > self.max_bytes:
+                runs.append(run)
+                run, run_bytes = [], 0
+            run.append(seg)
+            run_bytes += seg["bytes"]
+        if run:
+            runs.append(run)
+        return [run for run in runs
+                if len(run) > 1 or (self.compress and not run[0]["file"].endswith(".gz"))]
+
+    def compact(self) -> int:
+        """
+        Merge adjacent closed segments and compress them if configured.
+        Safe to run while entries are being appended. Returns the number of
+        segments written.
+        """
+        with self._lock:
+            self._load_manifest()
+            runs = self._compaction_runs()
+        written = 0
+        for run in runs:
+            try:
+                self._merge(run)
+                written += 1
+            except Exception as e:
+                logging.error(f"Failed to compact transaction log segments: {e}")
+        return written
+
+    def _merge(self, run: List[dict]) -> None:
+        first, last = run[0]["first"], run[-1]["last"]
+        name = f"transactions-{first:06d}-{last:06d}.log" + (".gz" if self.compress else "")
+        path = os.path.join(self.segment_dir, name)
+        tmp = path + ".tmp"
+        opener = gzip.open if self.compress else open
+        header = {"file": name, "first": first, "last": last,
+                  "min_ts": None, "max_ts": None, "entries": 0, "bytes": 0, "accounts": []}
+        accounts = set()
+        with opener(tmp, "wt") as dst:
+            for seg in run:
+                with self._open_segment(seg["file"]) as src:
+                    for line in src:
+                        dst.write(line)
+                        self._extend_header(header, accounts, line)
+        header["accounts"] = sorted(accounts)
+        with self._lock:
+            files = [seg["file"] for seg in run]
+            names = [seg["file"] for seg in self._segments]
+            if names[names.index(files[0]):names.index(files[0]) + len(files)] != files:
+                os.remove(tmp)
+                return
+            os.replace(tmp, path)
+            pos = names.index(files[0])
+            self._segments[pos:pos + len(files)] = [header]
+            self._write_manifest()
+            old = [f for f in files if f != name]
+            if self._readers:
+                # Queries started on this or an earlier manifest may still open them.
+                self._retired.extend((self._generation, f) for f in old)
+                old = []
+            self._generation += 1
+        self._remove(old)
+        logging.info(f"Compacted {len(files)} transaction log segment(s) into {name}.")
+
+    def _remove(self, files: List[str]) -> None:
+        for name in files:
+            try:
+                os.remove(os.path.join(self.segment_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def wait_for_compaction(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    # --- Queries ---
+    @contextmanager
+    def _pinned(self, account_number: Optional[int] = None):
+        """
+        Yield (closed segments, active part) as of now. The segments stay on
+        disk until the block ends, even if compacted meanwhile. The active
+        part is the lines of account_number, or with no account an open
+        handle on the active file, which follows it if it is rotated.
+        """
+        with self._lock:
+            self._load_manifest()
+            generation = self._generation
+            self._readers[generation] = self._readers.get(generation, 0) + 1
+            segments = list(self._segments)
+            try:
+                if account_number is not None:
+                    active = self.index.read(account_number)
+                else:
+                    active = open(self.active_path, "r")
+            except FileNotFoundError:
+                active = []
+            except BaseException:
+                self._release(generation)
+                raise
+        try:
+            yield segments, active
+        finally:
+            if not isinstance(active, list):
+                active.close()
+            with self._lock:
+                expired = self._release(generation)
+            self._remove(expired)
+
+    def _release(self, generation: int) -> List[str]:
+        # Returns the retired segments no query can read any more.
+        self._readers[generation] -= 1
+        if not self._readers[generation]:
+            del self._readers[generation]
+        oldest = min(self._readers, default=self._generation)
+        expired = [name for g, name in self._retired if g < oldest]
+        self._retired = [(g, name) for g, name in self._retired if g >= oldest]
+        return expired
+
+    def iter_entries(self, account_number: int, start: Optional[str] = None,
+                     end: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the log lines of one account, oldest first, optionally limited
+        to timestamps between start and end ("YYYY-MM-DD[ HH:MM:SS]").
+        Only segments whose header matches are opened; the active segment
+        is read through its offset index.
+        """
+        account_number = int(account_number)
+        with self._pinned(account_number) as (segments, active):
+            for seg in segments:
+                if start is not None and seg["max_ts"] is not None and seg["max_ts"] < start:
+                    continue
+                if end is not None and seg["min_ts"] is not None and not _in_range(seg["min_ts"], None, end):
+                    continue
+                if not _contains(seg["accounts"], account_number):
+                    continue
+                with self._open_segment(seg["file"]) as f:
+                    for line in f:
+                        if parse_account_number(line) == account_number and _in_range(_timestamp(line), start, end):
+                            yield line
+            for line in active:
+                if _in_range(_timestamp(line), start, end):
+                    yield line
+
+    def iter_all(self) -> Iterator[str]:
+        """
+        Yield every log line, oldest segment first, ending with the active segment.
+        """
+        with self._pinned() as (segments, active):
+            for seg in segments:
+                with self._open_segment(seg["file"]) as f:
+                    yield from f
+            yield from active
+
+    def rebuild_index(self) -> None:
+        self.index.rebuild()
+
+    def close(self) -> None:
+        self.wait_for_compaction()
+        self.index.close()
+
+
+def _contains(sorted_accounts: List[int], account_number: int) -> bool:
+    i = bisect_left(sorted_accounts, account_number)
+    return i < len(sorted_accounts) and sorted_accounts[i] == account_number
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+# Set before file_manager is imported, so nothing touches src/data.
+os.environ.setdefault("GDB_DATA_DIR", tempfile.mkdtemp(prefix="gdb-tests-"))
+
+from utils import file_manager  # noqa: E402
+from utils.transaction_log import SegmentedTransactionLog  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """
+    Point file_manager at an empty data directory for one test, with its
+    own group committer and transaction log.
+    """
+    paths = {
+        "DATA_DIR": tmp_path,
+        "ACCOUNT_FILE": tmp_path / "accounts.csv",
+        "TRANSACTIONS_FILE": tmp_path / "transactions.log",
+        "EXPORT_FILE": tmp_path / "accounts_export.csv",
+        "JOURNAL_FILE": tmp_path / "accounts.journal",
+        "SNAPSHOT_FILE": tmp_path / "accounts.snap",
+        "EXPORT_SNAPSHOT_FILE": tmp_path / "accounts_export.snap",
+        "SEGMENT_DIR": tmp_path / "transactions",
+        "IMPORT_PROGRESS_FILE": tmp_path / "accounts_export.csv.progress",
+        "POSTING_RUN_FILE": tmp_path / "posting_run.json",
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(file_manager, name, str(path))
+    committer = file_manager.GroupCommitter(durability="flush")
+    tx_log = SegmentedTransactionLog(str(paths["TRANSACTIONS_FILE"]), str(paths["SEGMENT_DIR"]))
+    committer.add_write_hook(str(paths["TRANSACTIONS_FILE"]), tx_log.on_append)
+    row_reader = file_manager._CsvRowReader(str(paths["ACCOUNT_FILE"]))
+    monkeypatch.setattr(file_manager, "_committer", committer)
+    monkeypatch.setattr(file_manager, "_tx_log", tx_log)
+    monkeypatch.setattr(file_manager, "_row_reader", row_reader)
+    monkeypatch.setattr(file_manager, "_snapshot_reader", file_manager._SnapshotRowReader(str(paths["SNAPSHOT_FILE"])))
+    monkeypatch.setattr(file_manager, "_active_reader", row_reader)
+    monkeypatch.setattr(file_manager, "_journal_records", 0)
+    yield tmp_path
+    committer.close()
+    tx_log.close()
+
+
+@pytest.fixture
+def make_bank():
+    """
+    Open a BankingService over the test data directory, as a restarted
+    process would.
+    """
+    from services.banking_services import BankingService
+    from utils.storage import CsvAccountStore
+
+    def make():
+        return BankingService(CsvAccountStore())
+    return make
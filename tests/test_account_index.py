@@ -0,0 +1,42 @@
+import random
+
+from services.account_index import name_key
+
+NAMES = ["Alice", "alice ", "Bob", "Alicia", "Carol", "Bobby"]
+
+
+def _numbers(accounts):
+    return [acc.account_number for acc in accounts]
+
+
+def test_index_answers_match_a_scan_of_the_book(make_bank):
+    rng = random.Random(7)
+    bank = make_bank()
+    for _ in range(30):
+        bank.create_account(rng.choice(NAMES), 30, rng.choice(["Savings", "Current"]), 5000, pin="1234")
+    # Warm the index so every change below goes through AccountIndex.update().
+    bank.list_active_accounts()
+    for _ in range(200):
+        number = rng.choice(list(bank.accounts))
+        action = rng.randrange(5)
+        if action == 0:
+            bank.close_account(number, "1234")
+        elif action == 1:
+            bank.reopen_closed_account(number)
+        elif action == 2:
+            bank.rename_account_holder(number, rng.choice(NAMES))
+        elif action == 3:
+            bank.upgrade_account_type(number, rng.choice(["Savings", "Current"]))
+        else:
+            bank.create_account(rng.choice(NAMES), 30, "Savings", 5000, pin="1234")
+
+    book = list(bank.accounts.values())
+    assert _numbers(bank.list_active_accounts()) == _numbers(a for a in book if a.status == "Active")
+    assert _numbers(bank.list_closed_accounts()) == _numbers(a for a in book if a.status == "Inactive")
+    for name in set(map(name_key, NAMES)):
+        assert _numbers(bank.search_by_name(name)) == _numbers(a for a in book if name_key(a.name) == name)
+    # Name queries are ordered by name; sorted() keeps book order within one.
+    by_name = sorted(book, key=lambda a: name_key(a.name))
+    assert _numbers(bank.search_by_name_prefix("ali")) == _numbers(
+        a for a in by_name if name_key(a.name).startswith("ali"))
+    assert _numbers(bank.search_by_name_substring("ob")) == _numbers(a for a in by_name if "ob" in name_key(a.name))
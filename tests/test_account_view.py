@@ -0,0 +1,53 @@
+import os
+import shutil
+
+import pytest
+
+from services.account_view import AccountView
+from utils import file_manager
+
+
+@pytest.fixture
+def bank(make_bank, monkeypatch):
+    monkeypatch.setattr(file_manager, "SNAPSHOT_FORMAT", "binary")
+    bank = make_bank()
+    bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    bank.save_to_disk()
+    return bank
+
+
+def _install_corrupt_copy():
+    # A damaged snapshot renamed over the path, as a writer would install it.
+    path = file_manager.SNAPSHOT_FILE
+    shutil.copyfile(path, path + ".bad")
+    with open(path + ".bad", "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    os.replace(path + ".bad", path)
+
+
+def test_refresh_maps_new_snapshot(bank):
+    view = AccountView(check_interval=0)
+    assert len(view) == 1
+    bank.create_account("Bob", 40, "Current", 20000, pin="2222")
+    bank.save_to_disk()
+    assert len(view) == 2
+
+
+def test_refresh_keeps_previous_snapshot_on_checksum_mismatch(bank):
+    view = AccountView(check_interval=0)
+    bank.create_account("Bob", 40, "Current", 20000, pin="2222")
+    bank.save_to_disk()
+    assert len(view) == 2
+    _install_corrupt_copy()
+    assert not view.refresh()
+    assert len(view) == 2
+    assert view.get_account(1002).name == "Bob"
+
+
+def test_first_map_rejects_checksum_mismatch(bank):
+    _install_corrupt_copy()
+    with pytest.raises(ValueError):
+        AccountView()
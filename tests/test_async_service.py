@@ -0,0 +1,55 @@
+import asyncio
+
+from services.async_banking_service import AsyncBankingService
+
+
+def _run(bank, body):
+    async def main():
+        service = AsyncBankingService(bank, workers=2)
+        try:
+            return await body(service)
+        finally:
+            service._executor.shutdown()
+    return asyncio.run(main())
+
+
+def test_apply_batch(make_bank):
+    bank = make_bank()
+    a, _ = bank.create_account("Alice", 30, "Savings", 1000, pin="1234")
+    b, _ = bank.create_account("Bob", 30, "Savings", 1000, pin="4321")
+    operations = [
+        {"op": "deposit", "account": a.account_number, "amount": "50", "pin": "1234"},
+        {"op": "transfer", "account": a.account_number, "to": b.account_number, "amount": "100", "pin": "1234"},
+        {"op": "withdraw", "account": b.account_number, "amount": "1000000", "pin": "4321"},
+    ]
+
+    results = _run(bank, lambda service: service.apply_batch(operations))
+    assert [ok for ok, _ in results] == [True, True, False]
+    assert (bank.accounts[a.account_number].balance, bank.accounts[b.account_number].balance) == (950, 1100)
+
+    results = _run(bank, lambda service: service.apply_batch(operations, atomic=True))
+    assert not any(ok for ok, _ in results)
+    assert bank.accounts[a.account_number].balance == 950
+
+
+def test_iter_transaction_history_pages_through_the_log(make_bank):
+    bank = make_bank()
+    acc, _ = bank.create_account("Alice", 30, "Savings", 1000, pin="1234")
+    for _ in range(6):
+        bank.deposit(acc.account_number, 10, pin="1234")
+    expected = list(bank.iter_transaction_history(acc.account_number))
+    assert len(expected) == 7
+
+    async def collect(service, limit=None):
+        entries = []
+        async for entry in service.iter_transaction_history(acc.account_number, page_size=3):
+            entries.append(entry)
+            if len(entries) == limit:
+                break
+        return entries
+    assert _run(bank, collect) == expected
+    assert _run(bank, lambda service: collect(service, limit=4)) == expected[:4]
+
+    async def collect_missing(service):
+        return [entry async for entry in service.iter_transaction_history(999999)]
+    assert _run(bank, collect_missing) == []
@@ -0,0 +1,50 @@
+import io
+import json
+
+from services.batch_runner import read_commands, run_batch
+
+
+def _run(bank, lines):
+    out = io.StringIO()
+    count, failed = run_batch(bank, read_commands(io.StringIO("\n".join(lines) + "\n")), out)
+    return count, failed, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_bad_lines_fail_alone_and_the_batch_goes_on(make_bank):
+    bank = make_bank()
+    acc, _ = bank.create_account("Alice", 30, "Savings", 500, pin="1234")
+    good = json.dumps({"op": "deposit", "account": acc.account_number, "amount": "10", "pin": "1234"})
+    bad = [
+        {"op": "create", "name": 42, "age": 30, "type": "Savings", "pin": "1234"},
+        {"op": "search", "name": 42},
+        {"op": "search", "name": None},
+        {"op": "deposit", "account": [acc.account_number], "amount": "10", "pin": "1234"},
+        {"op": "deposit", "account": acc.account_number, "amount": {"value": 10}, "pin": "1234"},
+        {"op": "withdraw", "account": acc.account_number, "pin": "1234"},
+        {"op": "history", "account": {}},
+        {"op": "frobnicate"},
+    ]
+    lines = [line for command in bad for line in (json.dumps(command), good)]
+    lines += ["not json", good, "[1, 2]", good]
+
+    count, failed, results = _run(bank, lines)
+    assert count == len(lines)
+    assert failed == len(lines) // 2
+    assert [r["ok"] for r in results] == [False, True] * (len(lines) // 2)
+    assert bank.accounts[acc.account_number].balance == 500 + 10 * (len(lines) // 2)
+
+
+def test_unexpected_errors_fail_the_command_only(make_bank, monkeypatch):
+    bank = make_bank()
+    acc, _ = bank.create_account("Alice", 30, "Savings", 500, pin="1234")
+
+    def broken(*args):
+        raise AttributeError("boom")
+    monkeypatch.setattr(bank, "balance_inquiry", broken)
+    lines = [json.dumps({"op": "balance", "account": acc.account_number, "pin": "1234"}),
+             json.dumps({"op": "search", "name": "Alice"})]
+
+    count, failed, results = _run(bank, lines)
+    assert (count, failed) == (2, 1)
+    assert results[0]["ok"] is False and "boom" in results[0]["message"]
+    assert results[1]["ok"] is True and results[1]["accounts"] == [acc.account_number]
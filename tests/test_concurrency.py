@@ -0,0 +1,85 @@
+import random
+import threading
+
+
+def _total(bank):
+    return sum(acc.balance for acc in bank.accounts.values())
+
+
+def test_concurrent_transfers_conserve_money(make_bank):
+    bank = make_bank()
+    numbers = [bank.create_account(f"Holder {i}", 30, "Savings", 10000, pin="1234")[0].account_number
+               for i in range(8)]
+    total = _total(bank)
+    errors = []
+
+    def teller(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(200):
+                # Random pairs, so opposite transfers on the same two
+                # accounts run at the same time.
+                src, dst = rng.sample(numbers, 2)
+                bank.transfer_funds(src, dst, rng.randint(1, 50), pin="1234")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=teller, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    assert not any(thread.is_alive() for thread in threads)
+    assert not errors
+    assert _total(bank) == total
+    assert _total(make_bank()) == total
+
+
+def test_concurrent_deposits_are_not_lost(make_bank):
+    bank = make_bank()
+    acc, _ = bank.create_account("Ann", 30, "Current", 10000, pin="1234")
+
+    def teller():
+        for _ in range(100):
+            assert bank.deposit(acc.account_number, 10, pin="1234")[0]
+
+    threads = [threading.Thread(target=teller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    assert acc.balance == 10000 + 8 * 100 * 10
+    assert make_bank().get_account(acc.account_number).balance == acc.balance
+
+
+def test_account_lock_is_released_before_waiting_for_sync(make_bank, monkeypatch):
+    bank = make_bank()
+    acc, _ = bank.create_account("Ann", 30, "Current", 10000, pin="1234")
+    number = acc.account_number
+    free = []
+    sync = bank.store.sync
+
+    def take_lock():
+        with bank._locks.locked(number):
+            pass
+
+    def checked_sync():
+        # Another thread must be able to take the account's lock meanwhile.
+        probe = threading.Thread(target=take_lock, daemon=True)
+        probe.start()
+        probe.join(timeout=5)
+        free.append(not probe.is_alive())
+        return sync()
+    monkeypatch.setattr(bank.store, "sync", checked_sync)
+    operations = [
+        lambda: bank.deposit(number, 10, "1234"),
+        lambda: bank.withdraw(number, 10, "1234"),
+        lambda: bank.rename_account_holder(number, "Anne"),
+        lambda: bank.upgrade_account_type(number, "Savings"),
+        lambda: bank.close_account(number, "1234"),
+        lambda: bank.reopen_closed_account(number),
+    ]
+    for operation in operations:
+        ok, msg = operation()
+        assert ok, msg
+    assert free == [True] * len(operations)
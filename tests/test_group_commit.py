@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from services.banking_services import BankingService
+from utils import file_manager
+
+
+@pytest.fixture
+def failing_fsync(monkeypatch):
+    """
+    Make the next n group-commit fsyncs fail: failing_fsync(n).
+    """
+    real_fsync = os.fsync
+    failures = [0]
+
+    def fsync(fd):
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError("disk full")
+        real_fsync(fd)
+
+    monkeypatch.setattr(file_manager._committer, "durability", "fsync")
+    monkeypatch.setattr(file_manager.os, "fsync", fsync)
+
+    def fail(n=1):
+        failures[0] = n
+    return fail
+
+
+def _lines(path, text):
+    with open(path) as f:
+        return [line for line in f if text in line]
+
+
+def test_unconfirmed_deposit_is_written_once_by_the_retry(make_bank, failing_fsync):
+    bank = make_bank()
+    acc, _ = bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    journal_before = len(_lines(file_manager.JOURNAL_FILE, ""))
+
+    failing_fsync(1)
+    assert bank.deposit(acc.account_number, 100, pin="1111") == (None, BankingService.PERSIST_UNCONFIRMED)
+    # The failed batch was cut back out of both files.
+    assert len(_lines(file_manager.JOURNAL_FILE, "")) == journal_before
+    assert not _lines(file_manager.TRANSACTIONS_FILE, "DEPOSIT")
+
+    assert file_manager.sync()
+    assert len(_lines(file_manager.JOURNAL_FILE, "")) == journal_before + 1
+    assert len(_lines(file_manager.TRANSACTIONS_FILE, "DEPOSIT")) == 1
+    assert make_bank().get_account(acc.account_number).balance == 5100
+
+
+def test_transfer_log_lines_wait_for_their_journal_record(make_bank, failing_fsync):
+    bank = make_bank()
+    ann, _ = bank.create_account("Ann", 30, "Current", 50000, pin="1111")
+    bob, _ = bank.create_account("Bob", 40, "Savings", 5000, pin="2222")
+
+    # Fails the journal record's own wait and the service's sync.
+    failing_fsync(2)
+    result = bank.transfer_funds(ann.account_number, bob.account_number, 100, pin="1111")
+    assert result == (None, BankingService.PERSIST_UNCONFIRMED)
+    assert not _lines(file_manager.JOURNAL_FILE, '"op":"transfer"')
+    assert not _lines(file_manager.TRANSACTIONS_FILE, "TRANSFER")
+
+    assert file_manager.sync()
+    assert len(_lines(file_manager.JOURNAL_FILE, '"op":"transfer"')) == 1
+    entries = [line for line in file_manager.iter_transaction_log() if "TRANSFER" in line]
+    assert len(entries) == 2
@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from services.banking_services import BankingService
+from utils import file_manager
+from utils.sqlite_store import SqliteAccountStore
+
+
+def _postings():
+    with open(file_manager.JOURNAL_FILE) as f:
+        return [record for record in map(json.loads, f) if record["op"] == "post"]
+
+
+def test_interest_is_posted_in_chunks(make_bank, monkeypatch):
+    monkeypatch.setattr(file_manager, "POSTING_CHUNK_SIZE", 4)
+    bank = make_bank()
+    for i in range(10):
+        bank.create_account(f"Holder {i}", 30, "Savings", 10000 + i, pin="1234")
+    bank.save_to_disk()
+
+    ok, msg = bank.accrue_interest(365)
+    assert ok, msg
+    postings = _postings()
+    assert [len(record["accounts"]) for record in postings] == [4, 4, 2]
+    assert len({record["txid"] for record in postings}) == 3
+    balances = {k: acc.balance for k, acc in bank.accounts.items()}
+    assert all(balance > 10000 for balance in balances.values())
+    assert {k: acc.balance for k, acc in make_bank().accounts.items()} == balances
+
+
+def test_checkpoint_runs_between_chunks(make_bank, monkeypatch):
+    monkeypatch.setattr(file_manager, "POSTING_CHUNK_SIZE", 4)
+    monkeypatch.setattr(file_manager, "CHECKPOINT_INTERVAL", 4)
+    monkeypatch.setattr(file_manager, "LAZY_LOAD", True)
+    bank = make_bank()
+    for i in range(10):
+        bank.create_account(f"Holder {i}", 30, "Savings", 10000 + i, pin="1234")
+    bank.save_to_disk()
+    bank = make_bank()
+
+    ok, msg = bank.accrue_interest(365)
+    assert ok, msg
+    # The first two chunks were checkpointed; only the last is journaled.
+    assert [len(record["accounts"]) for record in _postings()] == [2]
+    expected = {k: bank.accounts[k].balance for k in bank.accounts}
+    restarted = make_bank()
+    assert {k: restarted.accounts[k].balance for k in expected} == expected
+
+
+def _open_book(bank, count=5):
+    for i in range(count):
+        bank.create_account(f"Holder {i}", 30, "Savings", 10000, pin="1234")
+    bank.save_to_disk()
+
+
+def _crash_on_posting(monkeypatch, store, after):
+    real = store.save_posting
+    calls = []
+
+    def save_posting(*args):
+        if len(calls) == after:
+            raise RuntimeError("crash")
+        calls.append(args)
+        real(*args)
+    monkeypatch.setattr(store, "save_posting", save_posting)
+
+
+def _assert_credited_once(bank):
+    # 4% for a year on 10000, exactly once per account.
+    assert {acc.balance for acc in bank.accounts.values()} == {10400}
+    assert sum(" | INTEREST | " in line for line in bank.store.iter_transaction_log()) == len(bank.accounts)
+    assert bank.store.posting_run() is None
+
+
+def test_interrupted_run_resumes_after_the_last_posted_chunk(make_bank, monkeypatch):
+    monkeypatch.setattr(file_manager, "POSTING_CHUNK_SIZE", 2)
+    bank = make_bank()
+    _open_book(bank)
+    with monkeypatch.context() as m:
+        _crash_on_posting(m, bank.store, after=2)
+        with pytest.raises(RuntimeError):
+            bank.accrue_interest(365)
+
+    restarted = make_bank()
+    numbers = sorted(restarted.accounts)
+    assert restarted.store.posting_run()["through"] == numbers[3]
+    ok, msg = restarted.accrue_interest(365)
+    assert ok, msg
+    assert msg.startswith("Interest posted to 1 of 5 accounts")
+    _assert_credited_once(restarted)
+    _assert_credited_once(make_bank())
+
+
+def test_replay_restores_progress_lost_after_a_posting(make_bank, monkeypatch):
+    monkeypatch.setattr(file_manager, "POSTING_CHUNK_SIZE", 2)
+    bank = make_bank()
+    _open_book(bank)
+    real = file_manager.save_posting_run
+    calls = []
+
+    def save_posting_run(run):
+        # The start of the run and the first chunk are recorded; the crash
+        # hits after the second chunk's journal record.
+        if len(calls) == 2:
+            raise RuntimeError("crash")
+        calls.append(run)
+        real(run)
+    with monkeypatch.context() as m:
+        m.setattr(file_manager, "save_posting_run", save_posting_run)
+        with pytest.raises(RuntimeError):
+            bank.accrue_interest(365)
+    assert file_manager.posting_run()["through"] == sorted(bank.accounts)[1]
+
+    restarted = make_bank()
+    assert restarted.store.posting_run()["through"] == sorted(restarted.accounts)[3]
+    ok, msg = restarted.accrue_interest(365)
+    assert ok, msg
+    _assert_credited_once(restarted)
+
+
+def test_other_runs_are_refused_until_the_interrupted_one_finishes(make_bank, monkeypatch):
+    monkeypatch.setattr(file_manager, "POSTING_CHUNK_SIZE", 2)
+    bank = make_bank()
+    _open_book(bank)
+    with monkeypatch.context() as m:
+        _crash_on_posting(m, bank.store, after=1)
+        with pytest.raises(RuntimeError):
+            bank.accrue_interest(365)
+
+    restarted = make_bank()
+    ok, msg = restarted.accrue_interest(30)
+    assert ok is False and "interrupted" in msg
+    ok, msg = restarted.accrue_interest(365, method="daily")
+    assert ok is False
+    assert restarted.accrue_interest(30, post=False)[0]
+    ok, msg = restarted.accrue_interest(365)
+    assert ok, msg
+    _assert_credited_once(restarted)
+
+
+def test_interrupted_run_resumes_on_sqlite(data_dir, monkeypatch):
+    monkeypatch.setattr(file_manager, "POSTING_CHUNK_SIZE", 2)
+    path = str(data_dir / "bank.db")
+    bank = BankingService(SqliteAccountStore(path))
+    _open_book(bank)
+    with monkeypatch.context() as m:
+        _crash_on_posting(m, bank.store, after=2)
+        with pytest.raises(RuntimeError):
+            bank.accrue_interest(365)
+    bank.store.close()
+
+    restarted = BankingService(SqliteAccountStore(path))
+    ok, msg = restarted.accrue_interest(365)
+    assert ok, msg
+    _assert_credited_once(restarted)
+    restarted.store.close()
@@ -0,0 +1,60 @@
+from utils import file_manager
+
+
+def _book(bank):
+    return {k: (acc.balance, acc.status) for k, acc in bank.accounts.items()}
+
+
+def test_replay_restores_changes_since_checkpoint(make_bank):
+    bank = make_bank()
+    acc, _ = bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    bank.save_to_disk()
+    assert bank.deposit(acc.account_number, 250, pin="1111")[0]
+    assert bank.withdraw(acc.account_number, 100, pin="1111")[0]
+    assert file_manager.journal_records() == 2
+
+    restarted = make_bank()
+    assert _book(restarted) == _book(bank)
+    assert restarted.get_account(acc.account_number).transaction_history == acc.transaction_history
+
+
+def test_crash_between_snapshot_rename_and_journal_truncate(make_bank, monkeypatch):
+    bank = make_bank()
+    ann, _ = bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    bob, _ = bank.create_account("Bob", 40, "Current", 20000, pin="2222")
+    assert bank.deposit(ann.account_number, 250, pin="1111")[0]
+    assert bank.transfer_funds(bob.account_number, ann.account_number, 1000, pin="2222")[0]
+    log_lines = list(file_manager.iter_transaction_log())
+
+    def crash(path):
+        raise RuntimeError("crashed after the snapshot rename")
+    # close_path() runs right after the new snapshot is renamed into place
+    # and before the journal is truncated.
+    with monkeypatch.context() as m:
+        m.setattr(file_manager._committer, "close_path", crash)
+        assert not file_manager.save_accounts(bank.accounts)
+    assert file_manager.verify_snapshot(file_manager.ACCOUNT_FILE) is True
+    with open(file_manager.JOURNAL_FILE) as f:
+        assert len(f.readlines()) == 4
+
+    restarted = make_bank()
+    # Replaying records already in the snapshot changes nothing, and the
+    # transfer's log entries are not appended a second time.
+    assert _book(restarted) == _book(bank)
+    assert restarted.get_account(ann.account_number).transaction_history == ann.transaction_history
+    assert list(file_manager.iter_transaction_log()) == log_lines
+
+
+def test_torn_final_record_is_ignored(make_bank):
+    bank = make_bank()
+    acc, _ = bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    assert bank.deposit(acc.account_number, 250, pin="1111")[0]
+    expected = _book(bank)
+    assert bank.deposit(acc.account_number, 100, pin="1111")[0]
+    with open(file_manager.JOURNAL_FILE, "r+") as f:
+        data = f.read()
+        f.seek(0)
+        f.truncate()
+        f.write(data[:-20])
+
+    assert _book(make_bank()) == expected
@@ -0,0 +1,77 @@
+import pytest
+
+from services.banking_services import BankingService
+from utils import file_manager
+from utils.lazy_accounts import LazyAccountMap
+from utils.migrate_store import migrate
+from utils.sqlite_store import SqliteAccountStore
+from utils.storage import CsvAccountStore
+
+ACCOUNTS = 20
+
+
+@pytest.fixture(autouse=True)
+def lazy(monkeypatch):
+    monkeypatch.setattr(file_manager, "LAZY_LOAD", True)
+    monkeypatch.setattr(file_manager, "CACHE_SIZE", 4)
+
+
+@pytest.fixture(params=["csv", "binary"])
+def snapshot_format(request, monkeypatch):
+    monkeypatch.setattr(file_manager, "SNAPSHOT_FORMAT", request.param)
+    return request.param
+
+
+def _fill(bank):
+    for i in range(ACCOUNTS):
+        bank.create_account(f"Holder {i}", 30 + i, "Savings", 1000 + i, pin="1234")
+    bank.save_to_disk()
+    return {k: bank.accounts[k].balance for k in list(bank.accounts)}
+
+
+def _balances(accounts):
+    return {k: accounts[k].balance for k in list(accounts)}
+
+
+def test_lazy_checkpoint_keeps_uncached_accounts(make_bank, snapshot_format):
+    expected = _fill(make_bank())
+    bank = make_bank()
+    assert isinstance(bank.accounts, LazyAccountMap)
+    for number in list(expected)[::3]:
+        assert bank.deposit(number, 10, pin="1234")[0]
+        expected[number] += 10
+    bank.save_to_disk()
+    assert bank.accounts.dirty_count() == 0
+
+    assert _balances(make_bank().accounts) == expected
+
+
+def test_lazy_journal_replay_after_restart(make_bank, snapshot_format):
+    expected = _fill(make_bank())
+    bank = make_bank()
+    for number in list(expected)[:6]:
+        assert bank.deposit(number, 10, pin="1234")[0]
+        expected[number] += 10
+
+    assert _balances(make_bank().accounts) == expected
+
+
+def test_migrate_lazy_csv_book_to_sqlite(make_bank, data_dir):
+    expected = _fill(make_bank())
+    source, target = CsvAccountStore(), SqliteAccountStore(str(data_dir / "bank.db"))
+    try:
+        assert migrate(source, target) == (ACCOUNTS, ACCOUNTS)
+        assert target._conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0] == ACCOUNTS
+        assert _balances(target.load_accounts()) == expected
+    finally:
+        target.close()
+
+
+def test_migrate_lazy_sqlite_book_to_csv(data_dir):
+    source = SqliteAccountStore(str(data_dir / "bank.db"))
+    expected = _fill(BankingService(source))
+    try:
+        assert migrate(source, CsvAccountStore()) == (ACCOUNTS, ACCOUNTS)
+    finally:
+        source.close()
+    assert _balances(CsvAccountStore().load_accounts()) == expected
@@ -0,0 +1,86 @@
+import pytest
+
+from services.banking_services import BankingService
+from utils import file_manager
+from utils.migrate_store import migrate
+from utils.sqlite_store import SqliteAccountStore
+from utils.storage import CsvAccountStore
+
+LINE = "2024-01-01 10:00:00 | 1001 | DEPOSIT | 5 | 105"
+
+
+@pytest.fixture
+def sqlite_store(data_dir):
+    stores = []
+
+    def make():
+        stores.append(SqliteAccountStore(str(data_dir / "bank.db")))
+        return stores[-1]
+    yield make
+    for store in stores:
+        store.close()
+
+
+def _fill(bank):
+    for i in range(5):
+        acc, _ = bank.create_account(f"Holder {i}", 30, "Savings", 1000 + i, pin="1234")
+        bank.deposit(acc.account_number, 10, pin="1234")
+    return {k: acc.balance for k, acc in bank.accounts.items()}
+
+
+def test_csv_is_empty_leaves_the_loaded_book_alone(make_bank):
+    assert CsvAccountStore().is_empty()
+    bank = make_bank()
+    acc, _ = bank.create_account("Alice", 30, "Savings", 500, pin="1234")
+    book = bank.store._accounts
+    # The account only exists as a journal record so far.
+    assert not bank.store.is_empty()
+    assert bank.store._accounts is book and bank.accounts[acc.account_number] is acc
+    bank.save_to_disk()
+    assert not CsvAccountStore().is_empty()
+
+
+def test_csv_store_with_only_log_entries_is_not_empty():
+    store = CsvAccountStore()
+    store.append_transaction_lines([LINE])
+    store.sync()
+    assert not store.is_empty()
+
+
+def test_sqlite_is_empty(sqlite_store):
+    store = sqlite_store()
+    assert store.is_empty()
+    store.append_transaction_lines([LINE])
+    assert not store.is_empty()
+
+    with store.transaction():
+        store._conn.execute("DELETE FROM transactions")
+    assert store.is_empty()
+    BankingService(store).create_account("Alice", 30, "Savings", 500, pin="1234")
+    assert not store.is_empty()
+
+
+def test_migrate_csv_to_sqlite_once(make_bank, sqlite_store):
+    expected = _fill(make_bank())
+    entries = len(list(CsvAccountStore().iter_transaction_log()))
+    target = sqlite_store()
+    assert migrate(CsvAccountStore(), target) == (5, entries)
+    assert {k: acc.balance for k, acc in target.load_accounts().items()} == expected
+    assert len(list(target.iter_transaction_log())) == entries
+
+    with pytest.raises(RuntimeError):
+        migrate(CsvAccountStore(), target)
+    assert len(list(target.iter_transaction_log())) == entries
+
+
+def test_migrate_sqlite_to_csv_refuses_a_non_empty_target(make_bank, sqlite_store):
+    source = sqlite_store()
+    expected = _fill(BankingService(source))
+    assert migrate(source, CsvAccountStore()) == (5, 10)
+    assert {k: acc.balance for k, acc in CsvAccountStore().load_accounts().items()} == expected
+
+    make_bank().create_account("Late", 30, "Savings", 500, pin="1234")
+    with pytest.raises(RuntimeError):
+        migrate(source, CsvAccountStore())
+    assert len(CsvAccountStore().load_accounts()) == 6
+    assert file_manager.is_empty() is False
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from utils import file_manager
+
+
+def _corrupt(path):
+    # Flip one byte near the end of the body, leaving the header intact.
+    with open(path, "r+b") as f:
+        f.seek(-5, os.SEEK_END)
+        byte = f.read(1)
+        f.seek(-5, os.SEEK_END)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+
+@pytest.fixture(params=["csv", "binary"])
+def snapshot_file(request, monkeypatch):
+    monkeypatch.setattr(file_manager, "SNAPSHOT_FORMAT", request.param)
+    return file_manager.ACCOUNT_FILE if request.param == "csv" else file_manager.SNAPSHOT_FILE
+
+
+def test_checkpoint_keeps_previous_snapshot(make_bank, snapshot_file):
+    bank = make_bank()
+    acc, _ = bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    bank.save_to_disk()
+    assert not os.path.exists(snapshot_file + ".prev")
+    assert bank.deposit(acc.account_number, 250, pin="1111")[0]
+    bank.save_to_disk()
+    assert file_manager.verify_snapshot(snapshot_file) is True
+    assert file_manager.verify_snapshot(snapshot_file + ".prev") is True
+    assert not os.path.exists(snapshot_file + ".tmp")
+
+
+def test_crc_mismatch_restores_previous_snapshot(make_bank, snapshot_file):
+    bank = make_bank()
+    acc, _ = bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    bank.save_to_disk()
+    assert bank.deposit(acc.account_number, 250, pin="1111")[0]
+    bank.save_to_disk()
+    _corrupt(snapshot_file)
+    assert file_manager.verify_snapshot(snapshot_file) is False
+
+    restarted = make_bank()
+    # Back to the previous checkpoint; the damaged file is kept aside.
+    assert restarted.get_account(acc.account_number).balance == 5000
+    assert file_manager.verify_snapshot(snapshot_file) is True
+    assert os.path.exists(snapshot_file + ".corrupt")
+
+
+def test_crc_mismatch_without_previous_snapshot_is_left_alone(make_bank, snapshot_file):
+    bank = make_bank()
+    bank.create_account("Ann", 30, "Savings", 5000, pin="1111")
+    bank.save_to_disk()
+    _corrupt(snapshot_file)
+
+    make_bank()
+    assert not os.path.exists(snapshot_file + ".corrupt")
@@ -0,0 +1,81 @@
+from utils import file_manager
+
+
+def _state(acc):
+    return acc.balance, acc.daily_total, acc.transaction_history
+
+
+def _accounts(bank):
+    ann, _ = bank.create_account("Ann", 30, "Current", 50000, pin="1111")
+    bob, _ = bank.create_account("Bob", 40, "Savings", 5000, pin="2222")
+    return ann, bob
+
+
+def test_failed_deposit_leg_undoes_the_withdrawal(make_bank):
+    bank = make_bank()
+    ann, bob = _accounts(bank)
+    # Take Bob up to the daily limit, so the deposit leg must fail.
+    assert bank.deposit(bob.account_number, 100000, pin="2222")[0]
+    assert bank.deposit(bob.account_number, 100000, pin="2222")[0]
+    before = {acc.account_number: _state(acc) for acc in (ann, bob)}
+    log_lines = list(file_manager.iter_transaction_log())
+
+    ok, msg = bank.transfer_funds(ann.account_number, bob.account_number, 100, pin="1111")
+    assert not ok
+    assert "Daily transaction limit" in msg
+    assert {acc.account_number: _state(acc) for acc in (ann, bob)} == before
+    assert list(file_manager.iter_transaction_log()) == log_lines
+
+
+def test_transfer_is_one_journal_record(make_bank):
+    bank = make_bank()
+    ann, bob = _accounts(bank)
+    records = file_manager.journal_records()
+    assert bank.transfer_funds(ann.account_number, bob.account_number, 100, pin="1111")[0]
+    assert file_manager.journal_records() == records + 1
+    entries = [line for line in file_manager.iter_transaction_log() if "TRANSFER" in line]
+    assert len(entries) == 2
+    # Both legs carry the same transfer id.
+    assert entries[0].rsplit(" | ", 1)[1] == entries[1].rsplit(" | ", 1)[1]
+
+
+def test_atomic_batch_rolls_back_every_operation(make_bank):
+    bank = make_bank()
+    ann, bob = _accounts(bank)
+    before = {acc.account_number: _state(acc) for acc in (ann, bob)}
+    records = file_manager.journal_records()
+    log_lines = list(file_manager.iter_transaction_log())
+
+    results = bank.apply_batch([
+        {"op": "deposit", "account": ann.account_number, "amount": 500, "pin": "1111"},
+        {"op": "transfer", "account": ann.account_number, "to": bob.account_number, "amount": 1000, "pin": "1111"},
+        {"op": "withdraw", "account": bob.account_number, "amount": 100000, "pin": "2222"},
+        {"op": "deposit", "account": bob.account_number, "amount": 10, "pin": "2222"},
+    ], atomic=True)
+
+    assert [ok for ok, _ in results] == [False] * 4
+    assert results[2][1].startswith("Insufficient funds")
+    assert {msg for i, (_, msg) in enumerate(results) if i != 2} == {"Batch rolled back"}
+    assert {acc.account_number: _state(acc) for acc in (ann, bob)} == before
+    assert file_manager.journal_records() == records
+    assert list(file_manager.iter_transaction_log()) == log_lines
+    restarted = make_bank()
+    assert {k: _state(restarted.get_account(k)) for k in before} == before
+
+
+def test_non_atomic_batch_keeps_successful_operations(make_bank):
+    bank = make_bank()
+    ann, bob = _accounts(bank)
+
+    results = bank.apply_batch([
+        {"op": "deposit", "account": ann.account_number, "amount": 500, "pin": "1111"},
+        {"op": "withdraw", "account": bob.account_number, "amount": 100000, "pin": "2222"},
+        {"op": "transfer", "account": ann.account_number, "to": bob.account_number, "amount": 1000, "pin": "1111"},
+    ])
+
+    assert [ok for ok, _ in results] == [True, False, True]
+    assert ann.balance == 49500
+    assert bob.balance == 6000
+    restarted = make_bank()
+    assert restarted.get_account(ann.account_number).balance == 49500
+    assert restarted.get_account(bob.account_number).balance == 6000